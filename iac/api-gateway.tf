@@ -112,6 +112,14 @@ resource "aws_apigatewayv2_route" "get_claim" {
   target    = "integrations/${aws_apigatewayv2_integration.get_claim[0].id}"
 }
 
+resource "aws_apigatewayv2_route" "get_claims_batch" {
+  count = local.enable_backend_integration ? 1 : 0
+
+  api_id    = aws_apigatewayv2_api.claims.id
+  route_key = "GET /claims"
+  target    = "integrations/${aws_apigatewayv2_integration.get_claim[0].id}"
+}
+
 resource "aws_apigatewayv2_route" "post_summarize" {
   count = local.enable_backend_integration ? 1 : 0
 
@@ -120,6 +128,17 @@ resource "aws_apigatewayv2_route" "post_summarize" {
   target    = "integrations/${aws_apigatewayv2_integration.post_summarize[0].id}"
 }
 
+# HTTP APIs buffer the integration response, so this route delivers the
+# server-sent events in one piece when the stream ends (see src/README.md,
+# Streaming Summaries).
+resource "aws_apigatewayv2_route" "post_summarize_stream" {
+  count = local.enable_backend_integration ? 1 : 0
+
+  api_id    = aws_apigatewayv2_api.claims.id
+  route_key = "POST /claims/{id}/summarize/stream"
+  target    = "integrations/${aws_apigatewayv2_integration.post_summarize[0].id}"
+}
+
 resource "aws_apigatewayv2_route" "post_claim" {
   count = local.enable_backend_integration ? 1 : 0
 
@@ -160,6 +179,46 @@ resource "aws_apigatewayv2_route" "delete_note" {
   target    = "integrations/${aws_apigatewayv2_integration.delete_note[0].id}"
 }
 
+resource "aws_apigatewayv2_route" "post_claims_bulk" {
+  count = local.enable_backend_integration ? 1 : 0
+
+  api_id    = aws_apigatewayv2_api.claims.id
+  route_key = "POST /claims:bulk"
+  target    = "integrations/${aws_apigatewayv2_integration.post_summarize[0].id}"
+}
+
+resource "aws_apigatewayv2_route" "get_claims_export" {
+  count = local.enable_backend_integration ? 1 : 0
+
+  api_id    = aws_apigatewayv2_api.claims.id
+  route_key = "GET /claims:export"
+  target    = "integrations/${aws_apigatewayv2_integration.get_claim[0].id}"
+}
+
+resource "aws_apigatewayv2_route" "get_notes_search" {
+  count = local.enable_backend_integration ? 1 : 0
+
+  api_id    = aws_apigatewayv2_api.claims.id
+  route_key = "GET /notes/search"
+  target    = "integrations/${aws_apigatewayv2_integration.get_claim[0].id}"
+}
+
+resource "aws_apigatewayv2_route" "post_summaries_batch" {
+  count = local.enable_backend_integration ? 1 : 0
+
+  api_id    = aws_apigatewayv2_api.claims.id
+  route_key = "POST /summaries:batch"
+  target    = "integrations/${aws_apigatewayv2_integration.post_summarize[0].id}"
+}
+
+resource "aws_apigatewayv2_route" "get_summary_job" {
+  count = local.enable_backend_integration ? 1 : 0
+
+  api_id    = aws_apigatewayv2_api.claims.id
+  route_key = "GET /summaries/jobs/{jobId}"
+  target    = "integrations/${aws_apigatewayv2_integration.get_claim[0].id}"
+}
+
 resource "aws_apigatewayv2_stage" "default" {
   api_id      = aws_apigatewayv2_api.claims.id
   name        = "$default"
@@ -23,6 +23,44 @@ resource "aws_dynamodb_table" "claims" {
     type = "S"
   }
 
+  attribute {
+    name = "status"
+    type = "S"
+  }
+
+  attribute {
+    name = "updatedAt"
+    type = "S"
+  }
+
+  global_secondary_index {
+    name            = "status-updatedAt-index"
+    hash_key        = "status"
+    range_key       = "updatedAt"
+    projection_type = "ALL"
+  }
+
+  point_in_time_recovery {
+    enabled = true
+  }
+}
+
+resource "aws_dynamodb_table" "claim_notes" {
+  name         = "${local.name_prefix}-claim-notes"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "claimId"
+  range_key    = "noteId"
+
+  attribute {
+    name = "claimId"
+    type = "S"
+  }
+
+  attribute {
+    name = "noteId"
+    type = "S"
+  }
+
   point_in_time_recovery {
     enabled = true
   }
@@ -12,6 +12,22 @@ module "eks" {
   cluster_addons = var.enable_container_insights ? {
     amazon-cloudwatch-observability = {
       most_recent = true
+      # Keep enhanced Container Insights and add the EMF listener (port 25888)
+      # that receives the API's per-request latency metrics.
+      configuration_values = jsonencode({
+        agent = {
+          config = {
+            logs = {
+              metrics_collected = {
+                kubernetes = {
+                  enhanced_container_insights = true
+                }
+                emf = {}
+              }
+            }
+          }
+        }
+      })
     }
   } : {}
 
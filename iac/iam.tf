@@ -31,10 +31,14 @@ data "aws_iam_policy_document" "backend_workload_permissions" {
     sid = "DynamoDbReadClaims"
     actions = [
       "dynamodb:GetItem",
+      "dynamodb:BatchGetItem",
       "dynamodb:Query",
       "dynamodb:Scan"
     ]
-    resources = [aws_dynamodb_table.claims.arn]
+    resources = [
+      aws_dynamodb_table.claims.arn,
+      "${aws_dynamodb_table.claims.arn}/index/*"
+    ]
   }
 
   statement {
@@ -46,6 +50,19 @@ data "aws_iam_policy_document" "backend_workload_permissions" {
     resources = [aws_dynamodb_table.claims.arn]
   }
 
+  statement {
+    sid = "DynamoDbClaimNotes"
+    actions = [
+      "dynamodb:Query",
+      "dynamodb:GetItem",
+      "dynamodb:PutItem",
+      "dynamodb:UpdateItem",
+      "dynamodb:DeleteItem",
+      "dynamodb:Scan"
+    ]
+    resources = [aws_dynamodb_table.claim_notes.arn]
+  }
+
   statement {
     sid = "S3ReadClaimNotes"
     actions = [
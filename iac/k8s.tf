@@ -73,6 +73,11 @@ resource "kubernetes_deployment_v1" "backend" {
             value = aws_dynamodb_table.claims.name
           }
 
+          env {
+            name  = "NOTES_DYNAMODB_TABLE_NAME"
+            value = var.notes_storage_backend == "dynamodb" ? aws_dynamodb_table.claim_notes.name : ""
+          }
+
           env {
             name  = "NOTES_S3_BUCKET_NAME"
             value = aws_s3_bucket.claim_notes.bucket
@@ -83,11 +88,26 @@ resource "kubernetes_deployment_v1" "backend" {
             value = "notes.json"
           }
 
+          env {
+            name  = "NOTES_S3_LAYOUT"
+            value = var.notes_s3_layout
+          }
+
+          env {
+            name  = "NOTES_S3_PREFIX"
+            value = var.notes_s3_prefix
+          }
+
           env {
             name  = "AWS_REGION"
             value = var.aws_region
           }
 
+          env {
+            name  = "METRICS_EMF_DESTINATION"
+            value = var.enable_container_insights ? var.metrics_emf_destination : ""
+          }
+
           env {
             name  = "BEDROCK_MODEL_ID"
             value = var.bedrock_model_id
@@ -108,6 +128,57 @@ resource "kubernetes_deployment_v1" "backend" {
   }
 }
 
+# Scales on how long summarize requests wait for a worker thread rather than on
+# CPU: summarize pods are mostly idle while they wait on Bedrock. Between
+# applies the HPA owns the replica count; an apply resets it to
+# k8s_deployment_replicas until the next HPA sync.
+resource "kubernetes_horizontal_pod_autoscaler_v2" "backend" {
+  count = var.enable_k8s_resources && var.enable_queue_wait_autoscaling ? 1 : 0
+
+  metadata {
+    name      = var.k8s_deployment_name
+    namespace = kubernetes_namespace_v1.backend[0].metadata[0].name
+  }
+
+  spec {
+    min_replicas = var.k8s_deployment_replicas
+    max_replicas = var.hpa_max_replicas
+
+    scale_target_ref {
+      api_version = "apps/v1"
+      kind        = "Deployment"
+      name        = kubernetes_deployment_v1.backend[0].metadata[0].name
+    }
+
+    metric {
+      type = "External"
+
+      external {
+        metric {
+          name = var.hpa_queue_wait_metric_name
+        }
+
+        target {
+          type  = "Value"
+          value = tostring(var.hpa_queue_wait_target_ms)
+        }
+      }
+    }
+
+    behavior {
+      scale_down {
+        stabilization_window_seconds = 300
+
+        policy {
+          type           = "Pods"
+          value          = 1
+          period_seconds = 60
+        }
+      }
+    }
+  }
+}
+
 resource "kubernetes_service_v1" "backend" {
   count = var.enable_k8s_resources ? 1 : 0
 
@@ -179,6 +179,64 @@ variable "bedrock_model_id" {
   default     = ""
 }
 
+variable "notes_storage_backend" {
+  description = "Notes storage used by the backend: 's3' (notes objects in the claim notes bucket) or 'dynamodb' (the claim notes table)."
+  type        = string
+  default     = "s3"
+
+  validation {
+    condition     = contains(["s3", "dynamodb"], var.notes_storage_backend)
+    error_message = "notes_storage_backend must be 's3' or 'dynamodb'."
+  }
+}
+
+variable "notes_s3_layout" {
+  description = "Notes storage layout in S3: 'single' (one notes.json object) or 'per-claim' (one object per claim under notes_s3_prefix)."
+  type        = string
+  default     = "single"
+
+  validation {
+    condition     = contains(["single", "per-claim"], var.notes_s3_layout)
+    error_message = "notes_s3_layout must be 'single' or 'per-claim'."
+  }
+}
+
+variable "notes_s3_prefix" {
+  description = "Key prefix for per-claim notes objects when notes_s3_layout is 'per-claim'."
+  type        = string
+  default     = "notes/"
+}
+
+variable "metrics_emf_destination" {
+  description = "Where the API sends CloudWatch EMF latency metrics: 'udp://host:port' of the CloudWatch agent, 'stdout', or empty to disable."
+  type        = string
+  default     = "udp://cloudwatch-agent.amazon-cloudwatch:25888"
+}
+
+variable "enable_queue_wait_autoscaling" {
+  description = "Create a HorizontalPodAutoscaler that scales the backend on summarize queue wait. Requires an external metrics provider serving hpa_queue_wait_metric_name."
+  type        = bool
+  default     = false
+}
+
+variable "hpa_queue_wait_metric_name" {
+  description = "External metric the HPA reads: p95 summarize queue wait in milliseconds, published from the CloudWatch EMF metric queue-wait (Route 'POST /claims/{claim_id}/summarize')."
+  type        = string
+  default     = "claim-status-api-summarize-queue-wait-p95"
+}
+
+variable "hpa_queue_wait_target_ms" {
+  description = "Queue wait in milliseconds the HPA keeps the summarize lane under."
+  type        = number
+  default     = 250
+}
+
+variable "hpa_max_replicas" {
+  description = "Upper bound for the backend HPA; k8s_deployment_replicas is the lower bound."
+  type        = number
+  default     = 10
+}
+
 variable "enable_github_actions_role" {
   description = "Create IAM role/policy for GitHub Actions to push images to ECR"
   type        = bool
@@ -1,15 +1,46 @@
+import asyncio
+import functools
+import hashlib
+import itertools
+import json
+import os
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
 
-from fastapi import FastAPI
-from pydantic import BaseModel, ConfigDict, Field
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
-from src.services.claims_service import ClaimsService
+from src.services.admission import AdmissionLane
+from src.services.claims_service import (
+    CLAIMS_PAGE_MAX_LIMIT,
+    ClaimsService,
+    SummaryStreamCancellation,
+    SummaryStreamEvent,
+)
+from src.services.json_codec import dumps
+from src.services.notes_search import NOTES_SEARCH_MAX_LIMIT
 from src.services.notes_service import NotesService
+from src.services.request_scope import request_read_counters, request_scope
+from src.services.summary_jobs import SummaryJobRunner
+from src.services.timing import EmfEmitter, server_timing_header, timing_scope
 
 BASE_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = BASE_DIR.parent
 
+T = TypeVar("T")
+
+# Valid rows of a bulk import are written this many at a time; the upload is
+# parsed as it arrives, so only one chunk is held in memory.
+CLAIMS_IMPORT_CHUNK_SIZE = int(os.getenv("CLAIMS_IMPORT_CHUNK_SIZE", "500"))
+
+# How long clients and shared caches may reuse a claim or notes response without
+# asking again. With 0 they revalidate every time, which is answered with 304.
+CLAIM_READ_MAX_AGE_SECONDS = int(os.getenv("CLAIM_READ_MAX_AGE_SECONDS", "0"))
+
 
 class SummaryObject(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
@@ -41,49 +72,473 @@ class NoteUpdateRequest(BaseModel):
     content: str
 
 
-app = FastAPI(title="Claim Status API", version="0.1.0")
+class SummaryBatchRequest(BaseModel):
+    claimIds: list[str] | None = None
+    status: str | None = None
+    force: bool = False
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+async def format_sse_events(
+    events: AsyncIterator[SummaryStreamEvent],
+) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    except HTTPException as error:
+        # Headers are already sent, so failures after the first event are
+        # reported in-band instead of through the status code.
+        payload = {"status": error.status_code, "detail": error.detail}
+        yield f"event: error\ndata: {json.dumps(payload)}\n\n"
+
+
+def format_claims_page(page: dict[str, Any]) -> Iterator[bytes]:
+    # Serialises one claim at a time instead of building the whole body.
+    yield b'{"claims":['
+    for index, claim in enumerate(page["claims"]):
+        yield (b"," if index else b"") + dumps(claim)
+    yield b'],"nextCursor":' + dumps(page["nextCursor"]) + b"}"
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+def validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        (
+            ".".join(str(part) for part in item["loc"]) + f": {item['msg']}"
+            if item["loc"]
+            else item["msg"]
+        )
+        for item in error.errors()
+    )
+
+
+def resource_etag(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+
+
+def claim_etag(claim: dict[str, Any], notes_version: str) -> str:
+    # updatedAt changes on every claim write; older records without it fall
+    # back to their full content. A summary queued by the write-behind writer
+    # is shown before its write bumps updatedAt, so the summary is hashed too.
+    return resource_etag(
+        "claim",
+        claim.get("id"),
+        claim.get("updatedAt") or claim,
+        claim.get("summary"),
+        notes_version,
+    )
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, and proxies may weaken our ETags.
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    cache_control = (
+        f"max-age={CLAIM_READ_MAX_AGE_SECONDS}, must-revalidate"
+        if CLAIM_READ_MAX_AGE_SECONDS > 0
+        else "no-cache"
+    )
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
 notes_service = NotesService(project_root=PROJECT_ROOT)
 claims_service = ClaimsService(project_root=PROJECT_ROOT, notes_service=notes_service)
+emf_emitter = EmfEmitter.from_env()
+summary_jobs = SummaryJobRunner.from_env(claims_service)
+
+# Blocking work runs on one lane per kind of route instead of the default
+# threadpool, so slow summarize requests cannot hold the threads that reads and
+# writes need, and overload is rejected instead of queuing without bound.
+read_lane = AdmissionLane.from_env(
+    "reads", concurrency=32, max_queue=256, max_queue_wait_ms=2000
+)
+write_lane = AdmissionLane.from_env(
+    "writes", concurrency=16, max_queue=64, max_queue_wait_ms=5000
+)
+summarize_lane = AdmissionLane.from_env(
+    "summarize", concurrency=8, max_queue=16, max_queue_wait_ms=10000
+)
+# Exports read the whole table; a lane of their own keeps them from taking the
+# threads of interactive reads.
+export_lane = AdmissionLane.from_env(
+    "exports", concurrency=2, max_queue=8, max_queue_wait_ms=5000
+)
+admission_lanes = (read_lane, write_lane, summarize_lane, export_lane)
+
+
+async def run_read(function: Callable[..., T], *args: Any) -> T:
+    return await read_lane.run(function, *args)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    claims_service.warm_up()
+    summary_jobs.start()
+    yield
+    summary_jobs.stop()
+    # Summaries still queued for write-behind are stored before exiting.
+    claims_service.summary_writer.stop()
+    for lane in admission_lanes:
+        lane.shutdown()
+
+
+app = FastAPI(
+    title="Claim Status API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+
+
+@app.middleware("http")
+async def deduplicate_request_reads(request: Request, call_next):
+    with request_scope():
+        return await call_next(request)
+
+
+@app.middleware("http")
+async def record_dependency_timings(request: Request, call_next):
+    started = time.perf_counter()
+    with timing_scope() as timings:
+        response = await call_next(request)
+    # Covers the work done before the first byte; a streamed body is still
+    # being produced when the headers go out.
+    response.headers["Server-Timing"] = server_timing_header(
+        timings, time.perf_counter() - started
+    )
+    if not emf_emitter.enabled:
+        return response
 
+    route = request.scope.get("route")
+    route_name = f"{request.method} {route.path}" if route else "unmatched"
+    body = response.body_iterator
 
-@app.get("/claims/{claim_id}")
-def get_claim(claim_id: str) -> dict[str, Any]:
-    return claims_service.get_claim_with_notes_or_404(claim_id)
+    async def emit_after_body():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            emf_emitter.emit(
+                route_name,
+                response.status_code,
+                time.perf_counter() - started,
+                timings,
+            )
+
+    response.body_iterator = emit_after_body()
+    return response
+
+
+@app.get("/claims", response_model=None)
+async def get_claims(
+    ids: str | None = None,
+    include_notes: bool = Query(False, alias="includeNotes"),
+    status: str | None = None,
+    limit: int = Query(50, ge=1, le=CLAIMS_PAGE_MAX_LIMIT),
+    cursor: str | None = None,
+) -> Response:
+    # The read routes return their response directly, so FastAPI neither
+    # validates nor re-encodes the body with jsonable_encoder.
+    if ids is not None:
+        claim_ids = [claim_id.strip() for claim_id in ids.split(",")]
+        return FastJSONResponse(
+            await run_read(claims_service.get_claims_batch, claim_ids, include_notes)
+        )
+
+    if not status:
+        raise HTTPException(
+            status_code=400, detail="Either ids or status must be provided"
+        )
+    page = await run_read(claims_service.list_claims_by_status, status, limit, cursor)
+    return StreamingResponse(format_claims_page(page), media_type="application/json")
+
+
+@app.post("/claims:bulk")
+async def import_claims(request: Request) -> Response:
+    # Rows that were not created are reported back in upload order, followed by
+    # one line of totals.
+    report: list[dict[str, Any]] = []
+    totals = {"created": 0, "duplicate": 0, "invalid": 0, "failed": 0}
+    pending: list[tuple[int, dict[str, Any]]] = []
+    failure: HTTPException | None = None
+
+    async def write_pending() -> None:
+        nonlocal failure
+        if failure is None:
+            try:
+                # Chunks of an admitted upload are never shed halfway.
+                outcomes = await write_lane.submit(
+                    claims_service.import_claims,
+                    [claim for _, claim in pending],
+                    shed=False,
+                )
+            except HTTPException as error:
+                # Keep the report of the chunks already written; this chunk
+                # and the rest of the upload are reported as failed.
+                failure = error
+        if failure is not None:
+            outcomes = [("failed", str(failure.detail))] * len(pending)
+        for (line, claim), (outcome, detail) in zip(pending, outcomes):
+            totals[outcome] += 1
+            if detail is not None:
+                report.append(
+                    {
+                        "line": line,
+                        "id": claim["id"],
+                        "outcome": outcome,
+                        "detail": detail,
+                    }
+                )
+        pending.clear()
+
+    def reject(line: int, detail: str) -> None:
+        totals["invalid"] += 1
+        report.append({"line": line, "outcome": "invalid", "detail": detail})
+
+    # Admitted once, before the upload is read.
+    with write_lane.slot():
+        line_number = 0
+        async for line in iter_ndjson_lines(request.stream()):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                payload = ClaimCreateRequest.model_validate_json(line)
+            except ValidationError as error:
+                reject(line_number, validation_detail(error))
+                continue
+            if not payload.id.strip():
+                reject(line_number, "id: must not be blank")
+                continue
+            pending.append((line_number, payload.model_dump(exclude_none=True)))
+            if len(pending) >= CLAIMS_IMPORT_CHUNK_SIZE:
+                await write_pending()
+        if pending:
+            await write_pending()
+
+    report.sort(key=lambda row: row["line"])
+    body = b"".join(dumps(row) + b"\n" for row in [*report, {"totals": totals}])
+    if failure is not None:
+        return Response(
+            body,
+            status_code=failure.status_code,
+            headers=failure.headers,
+            media_type="application/x-ndjson",
+        )
+    return Response(body, media_type="application/x-ndjson")
+
+
+def export_chunks(claims: Iterator[dict[str, Any]]) -> Iterator[bytes]:
+    # Encodes a page of claims per chunk, so the lane is entered once per page
+    # rather than once per claim.
+    while page := list(itertools.islice(claims, CLAIMS_PAGE_MAX_LIMIT)):
+        yield b"".join(dumps(claim) + b"\n" for claim in page)
+
+
+@app.get("/claims:export")
+async def export_claims(
+    include_notes: bool = Query(False, alias="includeNotes"),
+) -> StreamingResponse:
+    chunks = export_chunks(claims_service.export_claims(include_notes=include_notes))
+    # Admission covers the first page, so overload and a failing backend are
+    # reported with a status code; the rest is pulled on the same lane.
+    first_chunk = await export_lane.run(next, chunks, b"")
+
+    async def body() -> AsyncIterator[bytes]:
+        yield first_chunk
+        async for chunk in export_lane.iterate(chunks):
+            yield chunk
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@app.get("/claims/{claim_id}", response_model=None)
+async def get_claim(claim_id: str, request: Request) -> Response:
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        # Revalidation only needs the claim and the notes version.
+        claim, notes_version = await asyncio.gather(
+            run_read(claims_service.get_claim_or_404, claim_id),
+            run_read(notes_service.notes_version_for_claim, claim_id),
+        )
+        etag = claim_etag(claim, notes_version)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=cache_headers(etag))
+
+    claim, (notes, notes_version) = await asyncio.gather(
+        run_read(claims_service.get_claim_or_404, claim_id),
+        run_read(notes_service.list_notes_for_claim_with_version, claim_id),
+    )
+    return FastJSONResponse(
+        {**claim, "notes": notes},
+        headers=cache_headers(claim_etag(claim, notes_version)),
+    )
 
 
 @app.post("/claims")
-def create_claim(payload: ClaimCreateRequest) -> dict[str, Any]:
-    return claims_service.create_claim(payload.model_dump(exclude_none=True))
+async def create_claim(payload: ClaimCreateRequest) -> dict[str, Any]:
+    return await write_lane.run(
+        claims_service.create_claim, payload.model_dump(exclude_none=True)
+    )
+
+
+@app.get("/notes/search", response_model=None)
+async def search_notes(
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(20, ge=1, le=NOTES_SEARCH_MAX_LIMIT),
+) -> Response:
+    results = await run_read(notes_service.search_notes, q, limit)
+    return FastJSONResponse({"query": q, "results": results})
 
 
-@app.get("/claims/{claim_id}/notes")
-def get_claim_notes(claim_id: str) -> list[dict[str, Any]]:
-    claims_service.get_claim_or_404(claim_id)
-    return notes_service.list_notes_for_claim(claim_id)
+@app.get("/claims/{claim_id}/notes", response_model=None)
+async def get_claim_notes(claim_id: str, request: Request) -> Response:
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        _, notes_version = await asyncio.gather(
+            run_read(claims_service.ensure_claim_exists_or_404, claim_id),
+            run_read(notes_service.notes_version_for_claim, claim_id),
+        )
+        etag = resource_etag("notes", claim_id, notes_version)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=cache_headers(etag))
+
+    _, (notes, notes_version) = await asyncio.gather(
+        run_read(claims_service.ensure_claim_exists_or_404, claim_id),
+        run_read(notes_service.list_notes_for_claim_with_version, claim_id),
+    )
+    return FastJSONResponse(
+        notes, headers=cache_headers(resource_etag("notes", claim_id, notes_version))
+    )
 
 
 @app.post("/claims/{claim_id}/notes")
-def create_claim_note(claim_id: str, payload: NoteCreateRequest) -> dict[str, Any]:
-    claims_service.get_claim_or_404(claim_id)
-    return notes_service.add_note_to_claim(claim_id, payload.content)
+async def create_claim_note(
+    claim_id: str, payload: NoteCreateRequest
+) -> dict[str, Any]:
+    def create() -> dict[str, Any]:
+        claims_service.ensure_claim_exists_or_404(claim_id)
+        return notes_service.add_note_to_claim(claim_id, payload.content)
+
+    return await write_lane.run(create)
 
 
 @app.put("/claims/{claim_id}/notes/{note_id}")
-def update_claim_note(
+async def update_claim_note(
     claim_id: str, note_id: str, payload: NoteUpdateRequest
 ) -> dict[str, Any]:
-    claims_service.get_claim_or_404(claim_id)
-    return notes_service.update_note_for_claim(claim_id, note_id, payload.content)
+    def update() -> dict[str, Any]:
+        claims_service.ensure_claim_exists_or_404(claim_id)
+        return notes_service.update_note_for_claim(claim_id, note_id, payload.content)
+
+    return await write_lane.run(update)
 
 
 @app.delete("/claims/{claim_id}/notes/{note_id}")
-def delete_claim_note(claim_id: str, note_id: str) -> dict[str, Any]:
-    claims_service.get_claim_or_404(claim_id)
-    return notes_service.delete_note_for_claim(claim_id, note_id)
+async def delete_claim_note(claim_id: str, note_id: str) -> dict[str, Any]:
+    def delete() -> dict[str, Any]:
+        claims_service.ensure_claim_exists_or_404(claim_id)
+        return notes_service.delete_note_for_claim(claim_id, note_id)
+
+    return await write_lane.run(delete)
+
+
+@app.get("/metrics")
+def get_metrics() -> dict[str, Any]:
+    return {
+        "dataCache": {
+            "claims": claims_service.data_cache.stats(),
+            "notes": notes_service.data_cache.stats(),
+        },
+        "notesWriteCoalescer": notes_service.s3_write_coalescer.stats(),
+        "notesSearch": notes_service.search_index.stats(),
+        "claimExistenceCache": claims_service.claim_existence_cache.stats(),
+        "requestReads": request_read_counters.snapshot(),
+        "summaryCache": claims_service.summary_cache_stats(),
+        "summaryPrompts": claims_service.summary_prompt_stats(),
+        "bedrock": claims_service.bedrock_stats(),
+        "summaryJobs": summary_jobs.stats(),
+        "summaryWriteBehind": claims_service.summary_writer.stats(),
+        "emf": emf_emitter.stats(),
+        "admission": {lane.name: lane.stats() for lane in admission_lanes},
+    }
 
 
 @app.post("/claims/{claim_id}/summarize", response_model=ClaimSummaryResponse)
-def summarize_claim(claim_id: str) -> ClaimSummaryResponse:
-    summary = claims_service.summarize_claim_or_404(claim_id)
+async def summarize_claim(claim_id: str, force: bool = False) -> Response:
+    summary = await summarize_lane.run(
+        functools.partial(claims_service.summarize_claim_or_404, claim_id, force=force)
+    )
+
+    # Validated once here; returning a Response skips the second validation
+    # against response_model, which is kept for the OpenAPI schema.
+    body = ClaimSummaryResponse(claimId=claim_id, summary=summary)
+    return Response(body.model_dump_json(by_alias=True), media_type="application/json")
+
+
+@app.post("/claims/{claim_id}/summarize/stream")
+async def stream_claim_summary(claim_id: str, force: bool = False) -> StreamingResponse:
+    # Admission covers the eager checks, so overload is reported with a status
+    # code; the admitted stream is then pulled on the same lane.
+    cancellation = SummaryStreamCancellation()
+    events = await summarize_lane.run(
+        functools.partial(
+            claims_service.stream_claim_summary_or_404,
+            claim_id,
+            force=force,
+            cancellation=cancellation,
+        )
+    )
+
+    return StreamingResponse(
+        format_sse_events(summarize_lane.iterate(events)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Runs once the response ends, also when the client disconnects, so
+        # the Bedrock streams are closed now instead of at their next token.
+        background=BackgroundTask(cancellation.cancel),
+    )
+
+
+@app.post("/summaries:batch", status_code=202)
+async def submit_summary_job(payload: SummaryBatchRequest) -> Response:
+    job = await write_lane.run(
+        functools.partial(
+            summary_jobs.submit,
+            claim_ids=payload.claimIds,
+            status=payload.status,
+            force=payload.force,
+        )
+    )
+    return FastJSONResponse(
+        job,
+        status_code=202,
+        headers={"Location": f"/summaries/jobs/{job['jobId']}"},
+    )
+
 
-    return ClaimSummaryResponse(claimId=claim_id, summary=summary)
+@app.get("/summaries/jobs/{job_id}")
+def get_summary_job(job_id: str) -> Response:
+    return FastJSONResponse(summary_jobs.get_job_or_404(job_id))
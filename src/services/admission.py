@@ -0,0 +1,174 @@
+import asyncio
+import contextvars
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
+
+from fastapi import HTTPException
+
+from src.services.metrics import CounterSet, LatencyWindow
+from src.services.timing import record_timing
+
+T = TypeVar("T")
+
+_EXHAUSTED = object()
+
+
+class AdmissionLane:
+    """A bounded worker pool with admission control for one group of routes.
+
+    Each lane runs its blocking work on its own ``concurrency`` threads, so a
+    burst on one lane (summarize waiting on Bedrock) cannot take the threads
+    of another (claim reads). At most ``max_queue`` admitted calls wait for a
+    thread; further requests are rejected at once with ``429``. A call that
+    still waited longer than ``max_queue_wait_seconds`` when its thread frees
+    up is shed with ``503`` instead of starting work its client has likely
+    given up on. Both responses carry ``Retry-After``. The time each call
+    waited for a thread is recorded as ``queue-wait`` in the request timings.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        max_queue: int,
+        max_queue_wait_seconds: float,
+    ) -> None:
+        self.name = name
+        self.concurrency = max(concurrency, 1)
+        self.max_queue = max(max_queue, 0)
+        self.max_queue_wait_seconds = max(max_queue_wait_seconds, 0.0)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix=f"lane-{name}"
+        )
+        self.counters = CounterSet("admitted", "rejected", "shed")
+        self.latency = LatencyWindow()
+        self._admitted = 0
+        self._max_admitted = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(
+        cls,
+        name: str,
+        concurrency: int,
+        max_queue: int,
+        max_queue_wait_ms: int,
+    ) -> "AdmissionLane":
+        prefix = f"ADMISSION_{name.upper()}"
+        return cls(
+            name,
+            concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+            max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", str(max_queue))),
+            max_queue_wait_seconds=float(
+                os.getenv(f"{prefix}_MAX_QUEUE_WAIT_MS", str(max_queue_wait_ms))
+            )
+            / 1000,
+        )
+
+    @contextmanager
+    def slot(self, reject: bool = True) -> Iterator[None]:
+        """Hold one admission for the duration of the block.
+
+        Raises ``429`` when the lane is full, unless ``reject`` is False: work
+        that continues an already admitted request is never turned away.
+        """
+        with self._lock:
+            if reject and self._admitted >= self.concurrency + self.max_queue:
+                full = True
+            else:
+                full = False
+                self._admitted += 1
+                self._max_admitted = max(self._max_admitted, self._admitted)
+        if full:
+            self.counters.increment("rejected")
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many concurrent {self.name} requests",
+                headers={"Retry-After": self._retry_after()},
+            )
+        if reject:
+            self.counters.increment("admitted")
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._admitted -= 1
+
+    async def run(self, function: Callable[..., T], *args: Any) -> T:
+        """Admit the call, then run ``function(*args)`` on the lane's threads."""
+        with self.slot():
+            return await self.submit(function, *args)
+
+    async def submit(
+        self, function: Callable[..., T], *args: Any, shed: bool = True
+    ) -> T:
+        """Run ``function(*args)`` for a caller that already holds a slot."""
+        # run_in_executor does not carry context variables, so pass the request
+        # scope and timings along explicitly.
+        context = contextvars.copy_context()
+        enqueued = time.monotonic()
+
+        def call() -> T:
+            started = time.monotonic()
+            waited = started - enqueued
+            record_timing("queue-wait", waited)
+            self.latency.record("queueWait", waited)
+            if shed and waited > self.max_queue_wait_seconds > 0:
+                self.counters.increment("shed")
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"The {self.name} queue is overloaded",
+                    headers={"Retry-After": self._retry_after()},
+                )
+            try:
+                return function(*args)
+            finally:
+                self.latency.record("service", time.monotonic() - started)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, context.run, call
+        )
+
+    async def iterate(self, items: Iterator[T]) -> AsyncIterator[T]:
+        """Pull a blocking iterator on the lane's threads, one item at a time.
+
+        Each pull holds a slot but is never rejected or shed, so an admitted
+        stream is not cut off halfway.
+        """
+        while True:
+            with self.slot(reject=False):
+                item = await self.submit(next, items, _EXHAUSTED, shed=False)
+            if item is _EXHAUSTED:
+                return
+            yield item
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            admitted, max_admitted = self._admitted, self._max_admitted
+        latency = self.latency.stats()
+        return {
+            **self.counters.snapshot(),
+            "inFlight": min(admitted, self.concurrency),
+            "queued": max(admitted - self.concurrency, 0),
+            "maxAdmitted": max_admitted,
+            "concurrency": self.concurrency,
+            "maxQueue": self.max_queue,
+            "maxQueueWaitMs": self.max_queue_wait_seconds * 1000,
+            "queueWait": latency.get("queueWait"),
+            "service": latency.get("service"),
+        }
+
+    def _retry_after(self) -> str:
+        # Roughly how long until the current queue drains, in whole seconds.
+        service = self.latency.percentile("service", 50, 1) or 1.0
+        with self._lock:
+            backlog = max(self._admitted - self.concurrency, 0) + 1
+        return str(min(max(math.ceil(backlog / self.concurrency * service), 1), 60))
@@ -0,0 +1,118 @@
+import os
+import threading
+from typing import Any
+
+import boto3
+from botocore.config import Config
+
+from src.services.timing import instrument_boto3_client
+
+
+class AwsClientRegistry:
+    """Process-wide cache of boto3 clients and DynamoDB table resources.
+
+    Building a client resolves endpoints and credentials and starts with a cold
+    connection pool, so each (service, region) pair is created once and shared.
+    boto3 sessions are not thread-safe, so creation is serialised behind a lock;
+    the resulting clients are safe to use from any worker thread.
+    """
+
+    def __init__(
+        self,
+        max_pool_connections: int | None = None,
+        retry_mode: str | None = None,
+        max_attempts: int | None = None,
+    ) -> None:
+        self.max_pool_connections = max_pool_connections or int(
+            os.getenv("AWS_MAX_POOL_CONNECTIONS", "40")
+        )
+        self.retry_mode = retry_mode or os.getenv("AWS_RETRY_MODE", "adaptive")
+        self.max_attempts = max_attempts or int(os.getenv("AWS_MAX_ATTEMPTS", "3"))
+        # botocore waits 60s per read by default. A Bedrock call abandoned at
+        # the summarize deadline keeps its executor thread until it returns,
+        # so its reads get a tighter bound.
+        self.read_timeouts = {
+            "bedrock-runtime": float(os.getenv("BEDROCK_READ_TIMEOUT_SECONDS", "20"))
+        }
+        self._session = boto3.session.Session()
+        self._clients: dict[tuple[str, str], Any] = {}
+        self._resources: dict[tuple[str, str], Any] = {}
+        self._tables: dict[tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> Config:
+        return Config(
+            max_pool_connections=self.max_pool_connections,
+            retries={
+                "mode": self.retry_mode,
+                "total_max_attempts": self.max_attempts,
+            },
+        )
+
+    def service_config(self, service_name: str) -> Config:
+        read_timeout = self.read_timeouts.get(service_name)
+        if read_timeout is None:
+            return self.config
+        return self.config.merge(Config(read_timeout=read_timeout))
+
+    def client(self, service_name: str, region_name: str) -> Any:
+        key = (service_name, region_name)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._session.client(
+                    service_name,
+                    region_name=region_name,
+                    config=self.service_config(service_name),
+                )
+                instrument_boto3_client(client)
+                self._clients[key] = client
+            return client
+
+    def resource(self, service_name: str, region_name: str) -> Any:
+        key = (service_name, region_name)
+        resource = self._resources.get(key)
+        if resource is not None:
+            return resource
+
+        with self._lock:
+            resource = self._resources.get(key)
+            if resource is None:
+                resource = self._session.resource(
+                    service_name, region_name=region_name, config=self.config
+                )
+                instrument_boto3_client(resource.meta.client)
+                self._resources[key] = resource
+            return resource
+
+    def dynamodb_table(self, table_name: str, region_name: str) -> Any:
+        key = (table_name, region_name)
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+
+        dynamodb = self.resource("dynamodb", region_name)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                table = dynamodb.Table(table_name)
+                self._tables[key] = table
+            return table
+
+
+_default_registry: AwsClientRegistry | None = None
+_default_registry_lock = threading.Lock()
+
+
+def get_aws_client_registry() -> AwsClientRegistry:
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = AwsClientRegistry()
+    return _default_registry
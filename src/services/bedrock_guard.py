@@ -0,0 +1,287 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from src.services.metrics import CounterSet, LatencyWindow
+from src.services.request_scope import submit_in_context
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half-open"
+
+# Errors that mean Bedrock itself is unhealthy (throttling, 5xx, timeouts).
+BEDROCK_SERVICE_ERRORS = (ClientError, BotoCoreError)
+# A reply the model formatted badly falls back too, but still proves the
+# service is up. Any other error is a bug and is raised to the caller.
+BEDROCK_REPLY_ERRORS = (ValueError, KeyError)
+
+
+class CircuitBreaker:
+    """Stops calling Bedrock after ``failure_threshold`` consecutive failures.
+
+    While open, callers go straight to their fallback. After ``reset_seconds``
+    one caller is let through as a probe (half-open): its success closes the
+    breaker, its failure opens it for another ``reset_seconds``. A probe that
+    has not reported back within ``reset_seconds`` is replaced by a new one. A
+    threshold of 0 disables the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = max(failure_threshold, 0)
+        self.reset_seconds = max(reset_seconds, 0.0)
+        self.counters = CounterSet("opened", "halfOpened", "closed", "shortCircuited")
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._changed_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        if self.failure_threshold == 0:
+            return True
+        with self._lock:
+            if self._state == BREAKER_CLOSED:
+                return True
+            now = time.monotonic()
+            if now >= self._changed_at + self.reset_seconds:
+                if self._state == BREAKER_OPEN:
+                    self.counters.increment("halfOpened")
+                self._state = BREAKER_HALF_OPEN
+                self._changed_at = now
+                return True
+        self.counters.increment("shortCircuited")
+        return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            # Stragglers admitted before the breaker opened do not close it;
+            # only the half-open probe does.
+            if self._state == BREAKER_HALF_OPEN:
+                self._state = BREAKER_CLOSED
+                self._changed_at = time.monotonic()
+                self.counters.increment("closed")
+
+    def record_failure(self) -> None:
+        if self.failure_threshold == 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._state == BREAKER_HALF_OPEN or (
+                self._state == BREAKER_CLOSED
+                and self._failures >= self.failure_threshold
+            ):
+                self._state = BREAKER_OPEN
+                self._changed_at = time.monotonic()
+                self.counters.increment("opened")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            state, failures = self._state, self._failures
+        return {
+            **self.counters.snapshot(),
+            "state": state,
+            "consecutiveFailures": failures,
+            "failureThreshold": self.failure_threshold,
+            "resetSeconds": self.reset_seconds,
+        }
+
+
+class BedrockGuard:
+    """Deadline, hedging and circuit breaking for Bedrock calls.
+
+    ``run`` submits one call per name to the executor and waits for them until
+    the deadline. A call still running after the recent ``hedge_percentile``
+    latency of its name gets one duplicate (a hedge) and whichever attempt
+    succeeds first wins. Calls that miss the deadline are abandoned; their
+    results are left to the caller's fallback, as are calls that failed with
+    a service or reply error. Other errors are raised.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        hedge_percentile: float,
+        hedge_min_samples: int,
+    ) -> None:
+        self.breaker = breaker
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = max(hedge_min_samples, 1)
+        self.latency = LatencyWindow()
+        self.counters = CounterSet(
+            "calls", "hedged", "hedgeWins", "failed", "badReplies", "deadlineExceeded"
+        )
+
+    @classmethod
+    def from_env(cls) -> "BedrockGuard":
+        return cls(
+            CircuitBreaker(
+                failure_threshold=int(
+                    os.getenv("BEDROCK_BREAKER_FAILURE_THRESHOLD", "5")
+                ),
+                reset_seconds=float(os.getenv("BEDROCK_BREAKER_RESET_SECONDS", "30")),
+            ),
+            hedge_percentile=float(os.getenv("BEDROCK_HEDGE_PERCENTILE", "95")),
+            hedge_min_samples=int(os.getenv("BEDROCK_HEDGE_MIN_SAMPLES", "20")),
+        )
+
+    def allow(self) -> bool:
+        return self.breaker.allow()
+
+    def run(
+        self,
+        executor: ThreadPoolExecutor,
+        calls: dict[str, Callable[[], Any]],
+        deadline: float,
+    ) -> dict[str, Any]:
+        """Return the result of every call that succeeded before ``deadline``."""
+        attempts: dict[str, list[Future]] = {name: [] for name in calls}
+        hedge_at: dict[str, float] = {}
+
+        def start(name: str) -> None:
+            started = time.monotonic()
+            future = submit_in_context(executor, calls[name])
+            future.add_done_callback(
+                lambda done: self._observe_latency(name, done, started)
+            )
+            attempts[name].append(future)
+
+        for name in calls:
+            self.counters.increment("calls")
+            start(name)
+            threshold = self._hedge_threshold(name)
+            if threshold is not None:
+                hedge_at[name] = time.monotonic() + threshold
+
+        results: dict[str, Any] = {}
+        pending = set(calls)
+        while pending:
+            for name in list(pending):
+                try:
+                    outcome = self._settle(attempts[name])
+                except BaseException:
+                    for futures in attempts.values():
+                        for future in futures:
+                            future.cancel()
+                    raise
+                if outcome is None:
+                    continue
+                pending.discard(name)
+                succeeded, value = outcome
+                if succeeded:
+                    results[name] = value
+
+            now = time.monotonic()
+            if not pending or now >= deadline:
+                break
+
+            for name in list(pending):
+                if name in hedge_at and now >= hedge_at[name]:
+                    del hedge_at[name]
+                    if self.breaker.state == BREAKER_CLOSED:
+                        self.counters.increment("hedged")
+                        start(name)
+
+            wake_at = min(
+                [deadline, *(hedge_at[name] for name in pending if name in hedge_at)]
+            )
+            running = [
+                future
+                for name in pending
+                for future in attempts[name]
+                if not future.done()
+            ]
+            if not running:
+                # Finished since the settle pass above; settle it next round.
+                continue
+            wait(
+                running,
+                timeout=max(wake_at - time.monotonic(), 0),
+                return_when=FIRST_COMPLETED,
+            )
+
+        for name in pending:
+            self.counters.increment("deadlineExceeded")
+            self.breaker.record_failure()
+            for future in attempts[name]:
+                future.cancel()
+        return results
+
+    def record_result(self, error: BaseException | None) -> None:
+        """Report the outcome of a Bedrock call made outside ``run``."""
+        self.counters.increment("calls")
+        self._record_outcome(error)
+
+    def record_deadline_exceeded(self) -> None:
+        self.counters.increment("calls")
+        self.counters.increment("deadlineExceeded")
+        self.breaker.record_failure()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.counters.snapshot(),
+            "breaker": self.breaker.stats(),
+            "hedgePercentile": self.hedge_percentile,
+            "latency": self.latency.stats(),
+        }
+
+    def _settle(self, futures: list[Future]) -> tuple[bool, Any] | None:
+        """(True, result) once any attempt succeeded, (False, None) once all
+        failed, otherwise None while an attempt is still running. Raises the
+        first error that is neither a service nor a reply error."""
+        errors: list[BaseException] = []
+        for index, future in enumerate(futures):
+            if not future.done():
+                continue
+            error = future.exception()
+            if error is None:
+                for other in futures:
+                    other.cancel()
+                if index > 0:
+                    self.counters.increment("hedgeWins")
+                self.breaker.record_success()
+                return True, future.result()
+            errors.append(error)
+
+        if len(errors) < len(futures):
+            return None
+        for error in errors:
+            if not isinstance(error, (*BEDROCK_SERVICE_ERRORS, *BEDROCK_REPLY_ERRORS)):
+                raise error
+        self._record_outcome(
+            next(
+                (e for e in errors if isinstance(e, BEDROCK_SERVICE_ERRORS)),
+                errors[0],
+            )
+        )
+        return False, None
+
+    def _record_outcome(self, error: BaseException | None) -> None:
+        if error is None:
+            self.breaker.record_success()
+        elif isinstance(error, BEDROCK_SERVICE_ERRORS):
+            self.counters.increment("failed")
+            self.breaker.record_failure()
+        else:
+            self.counters.increment("badReplies")
+            self.breaker.record_success()
+
+    def _hedge_threshold(self, name: str) -> float | None:
+        if self.hedge_percentile <= 0:
+            return None
+        return self.latency.percentile(
+            name, self.hedge_percentile, self.hedge_min_samples
+        )
+
+    def _observe_latency(self, name: str, future: Future, started: float) -> None:
+        # Attempts that finish after the deadline still count, so a slow
+        # Bedrock raises the hedge threshold instead of hiding from it.
+        if not future.cancelled() and future.exception() is None:
+            self.latency.record(name, time.monotonic() - started)
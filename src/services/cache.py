@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+# A fetch callback receives the version tag of the cached entry (an S3 ETag or a
+# file mtime/size token, or None when nothing is cached) and returns either
+# ``(value, tag)`` for fresh data or ``None`` when the source reports the cached
+# version is still current.
+FetchResult = tuple[Any, str | None] | None
+Fetch = Callable[[str | None], FetchResult]
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    tag: str | None
+    validated_at: float
+
+
+class ReadThroughCache:
+    """Size-bounded LRU cache that revalidates entries against their source.
+
+    Entries younger than ``ttl_seconds`` are served without touching the source.
+    Older entries are revalidated through the fetch callback, which is expected
+    to use a cheap conditional read (``If-None-Match``, ``stat``) and only
+    download and parse the data when it has changed. Cached values are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = max(ttl_seconds, 0.0)
+        self.max_entries = max(max_entries, 0)
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "revalidations": 0,
+            "evictions": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "ReadThroughCache":
+        return cls(
+            ttl_seconds=float(os.getenv("DATA_CACHE_TTL_SECONDS", "0")),
+            max_entries=int(os.getenv("DATA_CACHE_MAX_ENTRIES", "1024")),
+        )
+
+    def get(self, key: str, fetch: Fetch) -> Any:
+        return self.get_with_tag(key, fetch)[0]
+
+    def get_with_tag(self, key: str, fetch: Fetch) -> tuple[Any, str | None]:
+        """Like ``get`` but also return the version tag of the value."""
+        if self.max_entries == 0:
+            result = fetch(None)
+            with self._lock:
+                self._counters["misses"] += 1
+            return result if result is not None else (None, None)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.validated_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry.value, entry.tag
+
+        result = fetch(entry.tag if entry is not None else None)
+
+        with self._lock:
+            if result is None and entry is not None:
+                entry.validated_at = time.monotonic()
+                self._counters["revalidations"] += 1
+                self._store(key, entry)
+                return entry.value, entry.tag
+
+            value, tag = result if result is not None else (None, None)
+            self._counters["misses"] += 1
+            self._store(key, _CacheEntry(value, tag, time.monotonic()))
+            return value, tag
+
+    def put(self, key: str, value: Any, tag: str | None) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._store(key, _CacheEntry(value, tag, time.monotonic()))
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+            }
+
+    def _store(self, key: str, entry: _CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+
+def file_version_tag(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
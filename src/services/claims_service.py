@@ -1,45 +1,247 @@
+import base64
+import binascii
+import bisect
+import hashlib
 import json
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import HTTPException
 
+from src.services.aws_clients import AwsClientRegistry, get_aws_client_registry
+from src.services.bedrock_guard import (
+    BEDROCK_REPLY_ERRORS,
+    BEDROCK_SERVICE_ERRORS,
+    BedrockGuard,
+)
+from src.services.cache import FetchResult, ReadThroughCache
+from src.services.local_store import open_local_store
+from src.services.metrics import CounterSet
 from src.services.notes_service import NotesService
+from src.services.request_scope import (
+    forget_read,
+    map_in_context,
+    memoized_read,
+    submit_in_context,
+)
+from src.services.summary_writer import SummaryWrite, SummaryWriteBehind
+from src.services.timing import timed
+
+BEDROCK_FIELD_PROMPTS = {
+    "summary": (
+        "Provide an overall one-to-three sentence claim summary for internal reference."
+    ),
+    "customer-facing-summary": (
+        "Provide a customer-facing one-to-three sentence update in empathetic and plain language."
+    ),
+    "adjuster-focused-summary": (
+        "Provide an adjuster-focused one-to-three sentence operational summary highlighting important claim handling details."
+    ),
+    "recommended-next-step": (
+        "Provide exactly one concise recommended next action for the adjuster."
+    ),
+}
+
+BEDROCK_FIELD_KEY_ALIASES = {
+    "summary": ["summary", "overall_summary", "overall-summary"],
+    "customer-facing-summary": [
+        "customer-facing-summary",
+        "customer_facing_summary",
+        "customerFacingSummary",
+    ],
+    "adjuster-focused-summary": [
+        "adjuster-focused-summary",
+        "adjuster_focused_summary",
+        "adjusterFocusedSummary",
+    ],
+    "recommended-next-step": [
+        "recommended-next-step",
+        "recommended_next_step",
+        "recommendedNextStep",
+    ],
+}
+
+# Bump whenever prompts or summary post-processing change so that summaries
+# generated by the previous version are no longer served from the cache.
+SUMMARY_PROMPT_VERSION = "2"
+
+SUMMARY_CLAIM_FIELDS = ("id", "status", "policyNumber", "customer")
+# Stored with the summary to decide when and how to regenerate it; never part
+# of a claim returned by the API.
+SUMMARY_METADATA_FIELDS = ("summaryInputHash", "summaryNoteDigests")
+
+# BatchGetItem accepts at most 100 keys per request.
+DYNAMODB_BATCH_GET_LIMIT = 100
+DYNAMODB_BATCH_GET_MAX_ATTEMPTS = 5
+CLAIMS_BATCH_MAX_IDS = 200
+
+CLAIM_IMPORT_CREATED = "created"
+CLAIM_IMPORT_DUPLICATE = "duplicate"
+CLAIM_IMPORT_FAILED = "failed"
+
+CLAIMS_STATUS_INDEX_NAME = "status-updatedAt-index"
+CLAIMS_PAGE_MAX_LIMIT = 200
+
+# Rough characters-per-token ratio used to size incremental prompts without
+# calling a tokenizer.
+APPROX_CHARS_PER_TOKEN = 4
+
+BEDROCK_SUMMARY_MODE_PER_FIELD = "per-field"
+BEDROCK_SUMMARY_MODE_SINGLE_CALL = "single-call"
+
+# (event name, payload) pairs produced by the streaming summarize endpoint.
+SummaryStreamEvent = tuple[str, dict[str, Any]]
+
+SummaryPersister = Callable[[str, dict[str, str], dict[str, Any]], None]
+
+# TransactWriteItems accepts up to 100 actions; smaller transactions are
+# cheaper to redo one by one when one of them is cancelled.
+DYNAMODB_SUMMARY_TRANSACTION_SIZE = 25
+
+# Bedrock failures that fall back to the template text; see bedrock_guard.
+BEDROCK_ERRORS = (*BEDROCK_SERVICE_ERRORS, *BEDROCK_REPLY_ERRORS)
+
+
+class SummaryStreamCancellation:
+    """Stops a streaming summary from any thread.
+
+    ``cancel`` ends the relay of tokens and closes every Bedrock stream still
+    open, so field threads blocked on a read stop at once instead of at their
+    next token. It is called when the deadline passes, when the relay
+    finishes, and by the route when the client disconnects.
+    """
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self._streams: set[Any] = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def opened(self, stream: Any) -> Iterator[Any]:
+        """Close ``stream`` when the block exits or the summary is cancelled."""
+        with self._lock:
+            cancelled = self.event.is_set()
+            if not cancelled:
+                self._streams.add(stream)
+        try:
+            if cancelled:
+                raise ValueError("The summary stream was cancelled")
+            yield stream
+        finally:
+            with self._lock:
+                self._streams.discard(stream)
+            stream.close()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.event.set()
+            streams, self._streams = self._streams, set()
+        for stream in streams:
+            stream.close()
 
 
 class ClaimsService:
     def __init__(
-        self, project_root: Path, notes_service: NotesService | None = None
+        self,
+        project_root: Path,
+        notes_service: NotesService | None = None,
+        aws_clients: AwsClientRegistry | None = None,
     ) -> None:
         self.mocks_dir = project_root / "mocks"
         self.claims_file = self.mocks_dir / "claims.json"
         self.aws_region = os.getenv("AWS_REGION", "us-east-1")
         self.claims_table_name = os.getenv("DYNAMODB_TABLE_NAME", "")
-        self.notes_service = notes_service or NotesService(project_root=project_root)
+        self.aws_clients = aws_clients or get_aws_client_registry()
+        self.notes_service = notes_service or NotesService(
+            project_root=project_root, aws_clients=self.aws_clients
+        )
+        self.data_cache = ReadThroughCache.from_env()
+        self.local_claims = open_local_store(self.claims_file, ("id",), self.data_cache)
+        # Claims are never deleted, so a claim seen recently can be assumed to
+        # still exist; only positive lookups are cached.
+        self.claim_existence_cache = ReadThroughCache(
+            ttl_seconds=float(os.getenv("CLAIM_EXISTENCE_TTL_SECONDS", "30")),
+            max_entries=int(os.getenv("CLAIM_EXISTENCE_MAX_ENTRIES", "10000")),
+        )
+        self.bedrock_summary_mode = (
+            os.getenv("BEDROCK_SUMMARY_MODE", BEDROCK_SUMMARY_MODE_PER_FIELD)
+            .strip()
+            .lower()
+        )
+        if self.bedrock_summary_mode not in {
+            BEDROCK_SUMMARY_MODE_PER_FIELD,
+            BEDROCK_SUMMARY_MODE_SINGLE_CALL,
+        }:
+            raise ValueError(
+                f"Unsupported BEDROCK_SUMMARY_MODE: {self.bedrock_summary_mode}. "
+                f"Expected '{BEDROCK_SUMMARY_MODE_PER_FIELD}' or "
+                f"'{BEDROCK_SUMMARY_MODE_SINGLE_CALL}'."
+            )
+        self.summary_cache_counters = CounterSet(
+            "hits", "misses", "forced", "uncacheable"
+        )
+        self.summary_prompt_counters = CounterSet("full", "incremental")
+        self.summary_writer = SummaryWriteBehind.from_env(self.persist_summaries)
+        # Largest estimated note delta sent on top of the previous summary;
+        # bigger deltas, and 0, re-summarize from all notes.
+        self.bedrock_incremental_token_budget = int(
+            os.getenv("BEDROCK_INCREMENTAL_TOKEN_BUDGET", "1000")
+        )
+        # End-to-end budget of a summarize request, counted from its start;
+        # Bedrock fields still missing when it runs out fall back.
+        self.bedrock_summary_timeout_seconds = float(
+            os.getenv("BEDROCK_SUMMARY_TIMEOUT_SECONDS", "20")
+        )
+        self.bedrock_guard = BedrockGuard.from_env()
+        # Shared by every summarize request, so max_workers caps the number of
+        # in-flight Bedrock calls for the whole pod.
+        self.bedrock_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("BEDROCK_MAX_CONCURRENCY", "16")),
+            thread_name_prefix="bedrock",
+        )
+        # Local mode: per status, (updatedAt, id) pairs in ascending order, and
+        # each indexed claim by id. Writes through this service update both in
+        # place; only changes made elsewhere make the next listing rebuild them.
+        self._local_status_index: dict[str, list[tuple[str, str]]] = {}
+        self._local_status_records: dict[str, dict[str, Any]] = {}
+        self._local_status_index_version: str | None = None
+        self._local_status_index_lock = threading.Lock()
+        self.batch_get_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("DYNAMODB_BATCH_GET_CONCURRENCY", "4")),
+            thread_name_prefix="batch-get",
+        )
+        self.import_write_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("CLAIMS_IMPORT_WRITE_CONCURRENCY", "16")),
+            thread_name_prefix="import-write",
+        )
 
-    def create_claim(self, claim: dict[str, Any]) -> dict[str, Any]:
-        claim_id = str(claim.get("id", "")).strip()
-        if not claim_id:
-            raise HTTPException(status_code=400, detail="Claim id is required")
+    def warm_up(self) -> None:
+        if self.claims_table_name:
+            self._dynamodb_table()
+        if os.getenv("BEDROCK_MODEL_ID"):
+            self.aws_clients.client(
+                "bedrock-runtime", os.getenv("AWS_REGION", "us-east-1")
+            )
+        self.notes_service.warm_up()
 
-        claim_to_store = {
-            "id": claim_id,
-            "status": str(claim.get("status", "")).strip(),
-            "policyNumber": str(claim.get("policyNumber", "")).strip(),
-            "customer": str(claim.get("customer", "")).strip(),
-            "updatedAt": str(
-                claim.get("updatedAt")
-                or datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-            ),
-        }
+    def create_claim(self, claim: dict[str, Any]) -> dict[str, Any]:
+        claim_to_store = self._claim_record(claim)
+        claim_id = claim_to_store["id"]
 
+        forget_read(("claim", claim_id))
         if self.claims_table_name:
             try:
                 self._put_claim_to_dynamodb(claim_to_store)
+                self.claim_existence_cache.put(claim_id, True, None)
                 return claim_to_store
             except HTTPException:
                 raise
@@ -50,22 +252,210 @@ class ClaimsService:
                 ) from error
 
         self._put_claim_to_local_file(claim_to_store)
+        self.claim_existence_cache.put(claim_id, True, None)
         return claim_to_store
 
+    def import_claims(
+        self, claims: list[dict[str, Any]]
+    ) -> list[tuple[str, str | None]]:
+        """Create many claims at once, never overwriting an existing one.
+
+        Returns, in input order, ``(outcome, detail)`` per claim where outcome is
+        ``created``, ``duplicate`` (the ID already exists, or appeared earlier
+        in ``claims``) or ``failed``. Claims without an ID raise 400.
+        """
+        records = [self._claim_record(claim) for claim in claims]
+        outcomes: list[tuple[str, str | None]] = []
+        new_records: dict[str, dict[str, Any]] = {}
+        for record in records:
+            if record["id"] in new_records:
+                outcomes.append((CLAIM_IMPORT_DUPLICATE, "Repeated in this import"))
+            else:
+                new_records[record["id"]] = record
+                outcomes.append((CLAIM_IMPORT_CREATED, None))
+
+        if self.claims_table_name:
+            results = dict(
+                zip(
+                    new_records,
+                    map_in_context(
+                        self.import_write_executor,
+                        self._import_claim_to_dynamodb,
+                        list(new_records.values()),
+                    ),
+                )
+            )
+        else:
+            with self.local_claims.locked():
+                existing = {
+                    key[0]
+                    for key in self.local_claims.get_many(
+                        [(claim_id,) for claim_id in new_records]
+                    )
+                }
+                self._put_local_claims(
+                    [
+                        record
+                        for claim_id, record in new_records.items()
+                        if claim_id not in existing
+                    ]
+                )
+            results = {
+                claim_id: (
+                    (CLAIM_IMPORT_DUPLICATE, "Claim already exists")
+                    if claim_id in existing
+                    else (CLAIM_IMPORT_CREATED, None)
+                )
+                for claim_id in new_records
+            }
+
+        for index, record in enumerate(records):
+            if outcomes[index][0] != CLAIM_IMPORT_CREATED:
+                continue
+            claim_id = record["id"]
+            outcomes[index] = results[claim_id]
+            if outcomes[index][0] == CLAIM_IMPORT_CREATED:
+                forget_read(("claim", claim_id))
+                self.claim_existence_cache.put(claim_id, True, None)
+        return outcomes
+
+    def export_claims(self, include_notes: bool = False) -> Iterator[dict[str, Any]]:
+        """Yield every stored claim, one backend page at a time."""
+        if self.claims_table_name:
+            pages = self._scan_claims_from_dynamodb()
+        else:
+            claims = self.local_claims.values()
+            pages = (
+                claims[start : start + CLAIMS_PAGE_MAX_LIMIT]
+                for start in range(0, len(claims), CLAIMS_PAGE_MAX_LIMIT)
+            )
+
+        for page in pages:
+            if include_notes:
+                notes_by_claim = self.notes_service.list_notes_for_claims(
+                    [claim["id"] for claim in page]
+                )
+                page = [
+                    {**claim, "notes": notes_by_claim[claim["id"]]} for claim in page
+                ]
+                # Keep the request memo from growing with the whole export.
+                for claim in page:
+                    forget_read(("notes", claim["id"]))
+            yield from map(self._public_claim, page)
+
     def get_claim_or_404(self, claim_id: str) -> dict[str, Any]:
+        return self._public_claim(self._get_stored_claim_or_404(claim_id))
+
+    def _get_stored_claim_or_404(self, claim_id: str) -> dict[str, Any]:
+        """The claim including its summary metadata, for internal use."""
+        return memoized_read(
+            ("claim", claim_id), lambda: self._load_claim_or_404(claim_id)
+        )
+
+    def ensure_claim_exists_or_404(self, claim_id: str) -> None:
+        """Raise 404 unless the claim exists; skip the read if it was seen recently."""
+
+        def fetch(_: str | None) -> FetchResult:
+            self._get_stored_claim_or_404(claim_id)
+            return True, None
+
+        self.claim_existence_cache.get(claim_id, fetch)
+
+    def _load_claim_or_404(self, claim_id: str) -> dict[str, Any]:
         if self.claims_table_name:
             try:
                 claim = self._get_claim_from_dynamodb(claim_id)
                 if claim is not None:
-                    return claim
+                    self.claim_existence_cache.put(claim_id, True, None)
+                    return self.summary_writer.overlay(claim)
             except (ClientError, BotoCoreError):
                 pass
 
-        claims = self._load_json(self.claims_file)
-        claim = next((item for item in claims if item.get("id") == claim_id), None)
+        claim = self.local_claims.get((claim_id,))
         if claim is None:
             raise HTTPException(status_code=404, detail=f"Claim not found: {claim_id}")
-        return claim
+        self.claim_existence_cache.put(claim_id, True, None)
+        return self.summary_writer.overlay(claim)
+
+    def get_claims_batch(
+        self, claim_ids: list[str], include_notes: bool = False
+    ) -> dict[str, Any]:
+        """Return the requested claims in request order and the IDs not found."""
+        claim_ids = list(dict.fromkeys(claim_id for claim_id in claim_ids if claim_id))
+        if not claim_ids:
+            raise HTTPException(
+                status_code=400, detail="At least one claim id is required"
+            )
+        if len(claim_ids) > CLAIMS_BATCH_MAX_IDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {CLAIMS_BATCH_MAX_IDS} claim ids can be requested at once",
+            )
+
+        found: dict[str, dict[str, Any]] = {}
+        if self.claims_table_name:
+            try:
+                found = self._batch_get_claims_from_dynamodb(claim_ids)
+            except (ClientError, BotoCoreError):
+                pass
+
+        # Same fallback as get_claim_or_404: claims missing from DynamoDB are
+        # looked up in the local store, all with one indexed read.
+        local_ids = [claim_id for claim_id in claim_ids if claim_id not in found]
+        if local_ids:
+            local_claims = self.local_claims.get_many(
+                [(claim_id,) for claim_id in local_ids]
+            )
+            found.update({key[0]: claim for key, claim in local_claims.items()})
+
+        for claim_id in found:
+            self.claim_existence_cache.put(claim_id, True, None)
+
+        claims = [
+            self._public_claim(self.summary_writer.overlay(found[claim_id]))
+            for claim_id in claim_ids
+            if claim_id in found
+        ]
+        if include_notes:
+            notes_by_claim = self.notes_service.list_notes_for_claims(
+                [claim["id"] for claim in claims]
+            )
+            claims = [
+                {**claim, "notes": notes_by_claim[claim["id"]]} for claim in claims
+            ]
+        return {
+            "claims": claims,
+            "missing": [claim_id for claim_id in claim_ids if claim_id not in found],
+        }
+
+    def list_claims_by_status(
+        self, status: str, limit: int, cursor: str | None = None
+    ) -> dict[str, Any]:
+        """Return one page of claims with ``status``, most recently updated first.
+
+        ``nextCursor`` is an opaque token for the following page, or None after
+        the last one.
+        """
+        start_after = self._decode_claims_cursor(cursor, status) if cursor else None
+        if self.claims_table_name:
+            try:
+                claims, last_key = self._query_claims_by_status_from_dynamodb(
+                    status, limit, start_after
+                )
+            except (ClientError, BotoCoreError) as error:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to list claims from DynamoDB: {error}",
+                ) from error
+        else:
+            claims, last_key = self._list_local_claims_by_status(
+                status, limit, start_after
+            )
+
+        return {
+            "claims": [self._public_claim(claim) for claim in claims],
+            "nextCursor": self._encode_claims_cursor(last_key) if last_key else None,
+        }
 
     def get_claim_with_notes_or_404(self, claim_id: str) -> dict[str, Any]:
         claim = self.get_claim_or_404(claim_id)
@@ -73,68 +463,398 @@ class ClaimsService:
         return {**claim, "notes": notes}
 
     def list_notes_for_claim_or_404(self, claim_id: str) -> list[dict[str, Any]]:
-        self.get_claim_or_404(claim_id)
+        self.ensure_claim_exists_or_404(claim_id)
         return self.notes_service.list_notes_for_claim(claim_id)
 
     def add_note_to_claim_or_404(self, claim_id: str, content: str) -> dict[str, Any]:
-        self.get_claim_or_404(claim_id)
+        self.ensure_claim_exists_or_404(claim_id)
         return self.notes_service.add_note_to_claim(claim_id, content)
 
     def update_note_for_claim_or_404(
         self, claim_id: str, note_id: str, content: str
     ) -> dict[str, Any]:
-        self.get_claim_or_404(claim_id)
+        self.ensure_claim_exists_or_404(claim_id)
         return self.notes_service.update_note_for_claim(claim_id, note_id, content)
 
     def delete_note_for_claim_or_404(
         self, claim_id: str, note_id: str
     ) -> dict[str, Any]:
-        self.get_claim_or_404(claim_id)
+        self.ensure_claim_exists_or_404(claim_id)
         return self.notes_service.delete_note_for_claim(claim_id, note_id)
 
-    def summarize_claim_or_404(self, claim_id: str) -> dict[str, str]:
-        claim = self.get_claim_or_404(claim_id)
+    def summarize_claim_or_404(
+        self,
+        claim_id: str,
+        force: bool = False,
+        persist: SummaryPersister | None = None,
+    ) -> dict[str, str]:
+        """Return the claim's summary, generating and storing it when stale.
+
+        ``persist`` replaces the immediate write of a generated summary, for
+        callers that store summaries in batches.
+        """
+        deadline = time.monotonic() + self.bedrock_summary_timeout_seconds
+        claim, notes = self._get_claim_and_notes_for_summary_or_404(claim_id)
+
+        input_hash = self._summary_input_hash(claim, notes)
+        cached_summary = self._cached_summary(claim, input_hash, force)
+        if cached_summary is not None:
+            return cached_summary
+
+        summary, complete = self._summarize_with_bedrock_or_fallback(
+            claim, notes, deadline
+        )
+        self._store_generated_summary(
+            claim_id, summary, input_hash, complete, notes, persist
+        )
+        return summary
+
+    def stream_claim_summary_or_404(
+        self,
+        claim_id: str,
+        force: bool = False,
+        cancellation: SummaryStreamCancellation | None = None,
+    ) -> Iterator[SummaryStreamEvent]:
+        """Validate the claim eagerly, then return a generator of summary events.
+
+        The generator yields ``delta`` events with raw model tokens as they
+        arrive, one ``field`` event per finished field with its cleaned value,
+        and a final ``summary`` event once the summary has been persisted.
+        Cancelling ``cancellation`` closes the Bedrock streams behind it.
+        """
+        deadline = time.monotonic() + self.bedrock_summary_timeout_seconds
+        claim, notes = self._get_claim_and_notes_for_summary_or_404(claim_id)
+
+        # Streaming always prompts per field, so only tokens of one field
+        # arrive on each Bedrock stream.
+        input_hash = self._summary_input_hash(
+            claim, notes, mode=BEDROCK_SUMMARY_MODE_PER_FIELD
+        )
+        cached_summary = self._cached_summary(claim, input_hash, force)
+        return self._stream_summary_events(
+            claim,
+            notes,
+            input_hash,
+            cached_summary,
+            deadline,
+            cancellation or SummaryStreamCancellation(),
+        )
+
+    def summary_cache_stats(self) -> dict[str, Any]:
+        counters = self.summary_cache_counters.snapshot()
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hitRate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+    def summary_prompt_stats(self) -> dict[str, Any]:
+        return {
+            **self.summary_prompt_counters.snapshot(),
+            "incrementalTokenBudget": self.bedrock_incremental_token_budget,
+        }
+
+    def persist_summaries(
+        self, writes: list[SummaryWrite]
+    ) -> dict[str, HTTPException | None]:
+        """Store several generated summaries with as few backend writes as possible.
+
+        Returns, per claim ID, None once its summary is stored or the error
+        that prevented it. A claim written more than once keeps its last
+        summary.
+        """
+        latest = {
+            claim_id: (summary, metadata) for claim_id, summary, metadata in writes
+        }
+        for claim_id in latest:
+            forget_read(("claim", claim_id))
+        with timed("summary-persist-batch"):
+            if self.claims_table_name:
+                return self._persist_summaries_to_dynamodb(latest)
+            return self._persist_summaries_to_local_file(latest)
+
+    def bedrock_stats(self) -> dict[str, Any]:
+        return {
+            **self.bedrock_guard.stats(),
+            "summaryTimeoutSeconds": self.bedrock_summary_timeout_seconds,
+        }
+
+    def _get_claim_and_notes_for_summary_or_404(
+        self, claim_id: str
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        claim = self._get_stored_claim_or_404(claim_id)
         notes = self.notes_service.list_notes_for_claim(claim_id)
 
         if not notes:
             raise HTTPException(
                 status_code=404, detail=f"No notes found for claim: {claim_id}"
             )
+        return claim, notes
 
+    def _cached_summary(
+        self, claim: dict[str, Any], input_hash: str, force: bool
+    ) -> dict[str, str] | None:
+        stored_summary = claim.get("summary")
+        if force:
+            self.summary_cache_counters.increment("forced")
+        elif claim.get("summaryInputHash") == input_hash and isinstance(
+            stored_summary, dict
+        ):
+            self.summary_cache_counters.increment("hits")
+            return stored_summary
+        else:
+            self.summary_cache_counters.increment("misses")
+        return None
+
+    def _store_generated_summary(
+        self,
+        claim_id: str,
+        summary: dict[str, str],
+        input_hash: str,
+        complete: bool,
+        notes: list[dict[str, Any]],
+        persist: SummaryPersister | None = None,
+    ) -> None:
+        if not complete:
+            # Do not pin a partially degraded summary; the next call retries Bedrock.
+            self.summary_cache_counters.increment("uncacheable")
+        # Only a fully generated model summary is a valid base for an
+        # incremental update.
+        incremental_base = complete and bool(os.getenv("BEDROCK_MODEL_ID"))
+        if persist is None and self.summary_writer.enabled:
+            forget_read(("claim", claim_id))
+            persist = self.summary_writer.submit
+        (persist or self._persist_summary_for_claim)(
+            claim_id,
+            summary,
+            {
+                "summaryInputHash": input_hash if complete else None,
+                "summaryNoteDigests": (
+                    self._note_digests(notes) if incremental_base else None
+                ),
+            },
+        )
+
+    def _note_digests(self, notes: list[dict[str, Any]]) -> dict[str, str]:
+        return {
+            str(note.get("noteId")): hashlib.sha256(
+                str(note.get("content", "")).encode("utf-8")
+            ).hexdigest()
+            for note in notes
+        }
+
+    def _summary_prompt_notes_text(
+        self, claim: dict[str, Any], notes: list[dict[str, Any]]
+    ) -> str:
+        """Return the notes part of the Bedrock prompts.
+
+        When the stored summary records which notes it covered, only the new or
+        edited notes are sent together with that summary. Deleted notes, an
+        empty delta or a delta above the token budget fall back to all notes.
+        """
         notes_text = " ".join(note.get("content", "") for note in notes)
-        summary = self._summarize_with_bedrock_or_fallback(claim, notes_text)
-        self._persist_summary_for_claim(claim_id, summary)
-        return summary
+        previous_summary = claim.get("summary")
+        previous_digests = claim.get("summaryNoteDigests")
+        if (
+            self.bedrock_incremental_token_budget <= 0
+            or not isinstance(previous_summary, dict)
+            or not isinstance(previous_digests, dict)
+        ):
+            self.summary_prompt_counters.increment("full")
+            return notes_text
 
-    def _load_json(self, path: Path) -> list[dict[str, Any]]:
-        if not path.exists():
-            raise HTTPException(
-                status_code=500, detail=f"Data file not found: {path.name}"
+        current_digests = self._note_digests(notes)
+        delta_notes = [
+            note
+            for note in notes
+            if previous_digests.get(str(note.get("noteId")))
+            != current_digests[str(note.get("noteId"))]
+        ]
+        delta_text = " ".join(note.get("content", "") for note in delta_notes)
+        if (
+            not delta_notes
+            or any(note_id not in current_digests for note_id in previous_digests)
+            or len(delta_text) / APPROX_CHARS_PER_TOKEN
+            > self.bedrock_incremental_token_budget
+        ):
+            self.summary_prompt_counters.increment("full")
+            return notes_text
+
+        self.summary_prompt_counters.increment("incremental")
+        return (
+            f"Previous summary of the earlier notes: {json.dumps(previous_summary)}. "
+            "New or edited notes since that summary, which take precedence: "
+            f"{delta_text}"
+        )
+
+    def _summary_input_hash(
+        self,
+        claim: dict[str, Any],
+        notes: list[dict[str, Any]],
+        mode: str | None = None,
+    ) -> str:
+        summary_input = {
+            "promptVersion": SUMMARY_PROMPT_VERSION,
+            "mode": mode or self.bedrock_summary_mode,
+            "modelId": os.getenv("BEDROCK_MODEL_ID", ""),
+            "claim": {field: claim.get(field) for field in SUMMARY_CLAIM_FIELDS},
+            "notes": [[note.get("noteId"), note.get("content")] for note in notes],
+        }
+        payload = json.dumps(summary_input, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _encode_claims_cursor(self, last_key: dict[str, str]) -> str:
+        payload = json.dumps(last_key, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    def _decode_claims_cursor(self, cursor: str, status: str) -> dict[str, str]:
+        # The cursor holds the status, updatedAt and id of the last claim
+        # returned, which is both the DynamoDB LastEvaluatedKey and the local
+        # index position.
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            last_key = json.loads(base64.urlsafe_b64decode(padded))
+        except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from error
+        if (
+            not isinstance(last_key, dict)
+            or last_key.get("status") != status
+            or not all(
+                isinstance(last_key.get(field), str) for field in ("updatedAt", "id")
             )
-        with path.open("r", encoding="utf-8") as file:
-            return json.load(file)
+        ):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return last_key
 
-    def _write_json(self, path: Path, data: list[dict[str, Any]]) -> None:
-        with path.open("w", encoding="utf-8") as file:
-            json.dump(data, file, indent=4)
+    def _query_claims_by_status_from_dynamodb(
+        self, status: str, limit: int, start_after: dict[str, str] | None
+    ) -> tuple[list[dict[str, Any]], dict[str, str] | None]:
+        query: dict[str, Any] = {
+            "IndexName": CLAIMS_STATUS_INDEX_NAME,
+            "KeyConditionExpression": "#status = :status",
+            "ExpressionAttributeNames": {"#status": "status"},
+            "ExpressionAttributeValues": {":status": status},
+            "ScanIndexForward": False,
+            "Limit": limit,
+        }
+        if start_after:
+            query["ExclusiveStartKey"] = {
+                "claim_id": start_after["id"],
+                "status": start_after["status"],
+                "updatedAt": start_after["updatedAt"],
+            }
+        response = self._dynamodb_table().query(**query)
+        claims = [self._map_dynamodb_item(item) for item in response["Items"]]
 
-    def _put_claim_to_local_file(self, claim: dict[str, Any]) -> None:
-        claims = self._load_json(self.claims_file)
-        exists = any(item.get("id") == claim["id"] for item in claims)
-        if exists:
-            raise HTTPException(
-                status_code=409, detail=f"Claim already exists: {claim['id']}"
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return claims, None
+        return claims, {
+            "status": last_evaluated_key["status"],
+            "updatedAt": last_evaluated_key["updatedAt"],
+            "id": last_evaluated_key["claim_id"],
+        }
+
+    def _list_local_claims_by_status(
+        self, status: str, limit: int, start_after: dict[str, str] | None
+    ) -> tuple[list[dict[str, Any]], dict[str, str] | None]:
+        version = self.local_claims.version()
+        with self._local_status_index_lock:
+            if version != self._local_status_index_version:
+                self._rebuild_local_status_index(version)
+            entries = self._local_status_index.get(status, [])
+            end = (
+                bisect.bisect_left(
+                    entries, (start_after["updatedAt"], start_after["id"])
+                )
+                if start_after
+                else len(entries)
             )
-        claims.append(claim)
-        self._write_json(self.claims_file, claims)
+            start = max(end - limit, 0)
+            page = entries[start:end][::-1]
+            claims = [self._local_status_records[claim_id] for _, claim_id in page]
+        if start == 0 or not page:
+            return claims, None
+        updated_at, claim_id = page[-1]
+        return claims, {"status": status, "updatedAt": updated_at, "id": claim_id}
+
+    def _rebuild_local_status_index(self, version: str) -> None:
+        index: dict[str, list[tuple[str, str]]] = {}
+        records: dict[str, dict[str, Any]] = {}
+        for claim in self.local_claims.values():
+            claim_id = str(claim.get("id"))
+            records[claim_id] = claim
+            index.setdefault(str(claim.get("status", "")), []).append(
+                _local_status_entry(claim)
+            )
+        for entries in index.values():
+            entries.sort()
+        self._local_status_index = index
+        self._local_status_records = records
+        self._local_status_index_version = version
+
+    def _put_local_claims(self, records: list[dict[str, Any]]) -> None:
+        """Write claims to the local store and to the status index.
+
+        Callers hold ``local_claims.locked()``, so the store changes only by
+        these records between the two ``version`` calls.
+        """
+        if not records:
+            return
+        before = self.local_claims.version()
+        self.local_claims.put_many(records)
+        after = self.local_claims.version()
+        with self._local_status_index_lock:
+            if self._local_status_index_version != before:
+                # Already stale; the next listing rebuilds it anyway.
+                return
+            for record in records:
+                claim_id = str(record.get("id"))
+                previous = self._local_status_records.get(claim_id)
+                if previous is not None:
+                    entries = self._local_status_index[str(previous.get("status", ""))]
+                    entry = _local_status_entry(previous)
+                    position = bisect.bisect_left(entries, entry)
+                    if position < len(entries) and entries[position] == entry:
+                        del entries[position]
+                bisect.insort(
+                    self._local_status_index.setdefault(
+                        str(record.get("status", "")), []
+                    ),
+                    _local_status_entry(record),
+                )
+                self._local_status_records[claim_id] = record
+            self._local_status_index_version = after
+
+    def _claim_record(self, claim: dict[str, Any]) -> dict[str, Any]:
+        claim_id = str(claim.get("id", "")).strip()
+        if not claim_id:
+            raise HTTPException(status_code=400, detail="Claim id is required")
+
+        return {
+            "id": claim_id,
+            "status": str(claim.get("status", "")).strip(),
+            "policyNumber": str(claim.get("policyNumber", "")).strip(),
+            "customer": str(claim.get("customer", "")).strip(),
+            "updatedAt": str(
+                claim.get("updatedAt")
+                or datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+            ),
+        }
+
+    def _put_claim_to_local_file(self, claim: dict[str, Any]) -> None:
+        with self.local_claims.locked():
+            if self.local_claims.get((claim["id"],)) is not None:
+                raise HTTPException(
+                    status_code=409, detail=f"Claim already exists: {claim['id']}"
+                )
+            self._put_local_claims([claim])
 
     def _dynamodb_table(self):
-        return boto3.resource("dynamodb", region_name=self.aws_region).Table(
-            self.claims_table_name
-        )
+        return self.aws_clients.dynamodb_table(self.claims_table_name, self.aws_region)
 
     def _map_dynamodb_item(self, item: dict[str, Any]) -> dict[str, Any]:
-        return {
+        claim = {
             "id": item.get("claim_id"),
             "status": item.get("status"),
             "policyNumber": item.get("policyNumber"),
@@ -142,6 +862,18 @@ class ClaimsService:
             "updatedAt": item.get("updatedAt"),
             "summary": item.get("summary"),
         }
+        # Only present when stored, like in the local store.
+        claim.update(
+            {field: item[field] for field in SUMMARY_METADATA_FIELDS if field in item}
+        )
+        return claim
+
+    def _public_claim(self, claim: dict[str, Any]) -> dict[str, Any]:
+        return {
+            key: value
+            for key, value in claim.items()
+            if key not in SUMMARY_METADATA_FIELDS
+        }
 
     def _get_claim_from_dynamodb(self, claim_id: str) -> dict[str, Any] | None:
         response = self._dynamodb_table().get_item(Key={"claim_id": claim_id})
@@ -150,16 +882,87 @@ class ClaimsService:
             return None
         return self._map_dynamodb_item(item)
 
+    def _batch_get_claims_from_dynamodb(
+        self, claim_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        chunks = [
+            claim_ids[start : start + DYNAMODB_BATCH_GET_LIMIT]
+            for start in range(0, len(claim_ids), DYNAMODB_BATCH_GET_LIMIT)
+        ]
+        found: dict[str, dict[str, Any]] = {}
+        for items in map_in_context(
+            self.batch_get_executor, self._batch_get_claims_chunk, chunks
+        ):
+            for item in items:
+                claim = self._map_dynamodb_item(item)
+                found[claim["id"]] = claim
+        return found
+
+    def _batch_get_claims_chunk(self, claim_ids: list[str]) -> list[dict[str, Any]]:
+        dynamodb = self.aws_clients.resource("dynamodb", self.aws_region)
+        request_items = {
+            self.claims_table_name: {
+                "Keys": [{"claim_id": claim_id} for claim_id in claim_ids]
+            }
+        }
+        items: list[dict[str, Any]] = []
+        for attempt in range(DYNAMODB_BATCH_GET_MAX_ATTEMPTS):
+            if attempt:
+                # Unprocessed keys mean the table is throttling; back off.
+                time.sleep(min(0.05 * 2**attempt, 1.0))
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            items.extend(response.get("Responses", {}).get(self.claims_table_name, []))
+            request_items = response.get("UnprocessedKeys") or {}
+            if not request_items:
+                return items
+
+        raise HTTPException(
+            status_code=503,
+            detail="DynamoDB did not return every requested claim; retry the batch",
+        )
+
+    def _import_claim_to_dynamodb(
+        self, claim: dict[str, Any]
+    ) -> tuple[str, str | None]:
+        """Create one imported claim with a conditional PutItem, so a claim
+        written meanwhile through another route is never overwritten."""
+        try:
+            self._put_claim_to_dynamodb(claim)
+        except HTTPException:
+            return CLAIM_IMPORT_DUPLICATE, "Claim already exists"
+        except (ClientError, BotoCoreError) as error:
+            return CLAIM_IMPORT_FAILED, f"Failed to write claim to DynamoDB: {error}"
+        return CLAIM_IMPORT_CREATED, None
+
+    def _scan_claims_from_dynamodb(self) -> Iterator[list[dict[str, Any]]]:
+        scan_kwargs: dict[str, Any] = {}
+        while True:
+            try:
+                response = self._dynamodb_table().scan(**scan_kwargs)
+            except (ClientError, BotoCoreError) as error:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to export claims from DynamoDB: {error}",
+                ) from error
+            yield [self._map_dynamodb_item(item) for item in response.get("Items", [])]
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            scan_kwargs["ExclusiveStartKey"] = last_key
+
+    def _claim_dynamodb_item(self, claim: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "claim_id": claim["id"],
+            "status": claim["status"],
+            "policyNumber": claim["policyNumber"],
+            "customer": claim["customer"],
+            "updatedAt": claim["updatedAt"],
+        }
+
     def _put_claim_to_dynamodb(self, claim: dict[str, Any]) -> None:
         try:
             self._dynamodb_table().put_item(
-                Item={
-                    "claim_id": claim["id"],
-                    "status": claim["status"],
-                    "policyNumber": claim["policyNumber"],
-                    "customer": claim["customer"],
-                    "updatedAt": claim["updatedAt"],
-                },
+                Item=self._claim_dynamodb_item(claim),
                 ConditionExpression="attribute_not_exists(claim_id)",
             )
         except ClientError as error:
@@ -173,49 +976,88 @@ class ClaimsService:
             raise
 
     def _persist_summary_for_claim(
-        self, claim_id: str, summary: dict[str, str]
+        self,
+        claim_id: str,
+        summary: dict[str, str],
+        summary_metadata: dict[str, Any] | None = None,
     ) -> None:
-        if self.claims_table_name:
-            self._persist_summary_for_dynamodb_claim(claim_id, summary)
-            return
+        # summary_metadata holds extra attributes stored next to the summary;
+        # a None value removes the attribute.
+        forget_read(("claim", claim_id))
+        with timed("summary-persist"):
+            if self.claims_table_name:
+                self._persist_summary_for_dynamodb_claim(
+                    claim_id, summary, summary_metadata or {}
+                )
+                return
 
-        self._persist_summary_for_local_claim(claim_id, summary)
+            self._persist_summary_for_local_claim(
+                claim_id, summary, summary_metadata or {}
+            )
 
     def _persist_summary_for_local_claim(
-        self, claim_id: str, summary: dict[str, str]
+        self,
+        claim_id: str,
+        summary: dict[str, str],
+        summary_metadata: dict[str, Any],
     ) -> None:
-        claims = self._load_json(self.claims_file)
-        claim_index = next(
-            (index for index, item in enumerate(claims) if item.get("id") == claim_id),
-            -1,
-        )
-        if claim_index == -1:
-            raise HTTPException(status_code=404, detail=f"Claim not found: {claim_id}")
+        with self.local_claims.locked():
+            stored_claim = self.local_claims.get((claim_id,))
+            if stored_claim is None:
+                raise HTTPException(
+                    status_code=404, detail=f"Claim not found: {claim_id}"
+                )
+            self._put_local_claims(
+                [self._with_summary(stored_claim, summary, summary_metadata)]
+            )
 
-        claims[claim_index]["summary"] = summary
-        claims[claim_index]["updatedAt"] = (
-            datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-        )
-        self._write_json(self.claims_file, claims)
+    def _persist_summaries_to_local_file(
+        self, writes: dict[str, tuple[dict[str, str], dict[str, Any]]]
+    ) -> dict[str, HTTPException | None]:
+        results: dict[str, HTTPException | None] = {}
+        records: list[dict[str, Any]] = []
+        with self.local_claims.locked():
+            for claim_id, (summary, summary_metadata) in writes.items():
+                stored_claim = self.local_claims.get((claim_id,))
+                if stored_claim is None:
+                    results[claim_id] = HTTPException(
+                        status_code=404, detail=f"Claim not found: {claim_id}"
+                    )
+                    continue
+                records.append(
+                    self._with_summary(stored_claim, summary, summary_metadata)
+                )
+                results[claim_id] = None
+            self._put_local_claims(records)
+        return results
+
+    def _with_summary(
+        self,
+        stored_claim: dict[str, Any],
+        summary: dict[str, str],
+        summary_metadata: dict[str, Any],
+    ) -> dict[str, Any]:
+        claim = {
+            **stored_claim,
+            **summary_metadata,
+            "summary": summary,
+            "updatedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        }
+        return {
+            key: value
+            for key, value in claim.items()
+            if value is not None or key not in summary_metadata
+        }
 
     def _persist_summary_for_dynamodb_claim(
-        self, claim_id: str, summary: dict[str, str]
+        self,
+        claim_id: str,
+        summary: dict[str, str],
+        summary_metadata: dict[str, Any],
     ) -> None:
         try:
             self._dynamodb_table().update_item(
-                Key={"claim_id": claim_id},
-                UpdateExpression="SET #summary = :summary, #updatedAt = :updatedAt",
-                ExpressionAttributeNames={
-                    "#summary": "summary",
-                    "#updatedAt": "updatedAt",
-                },
-                ExpressionAttributeValues={
-                    ":summary": summary,
-                    ":updatedAt": datetime.now(timezone.utc)
-                    .isoformat()
-                    .replace("+00:00", "Z"),
-                },
-                ConditionExpression="attribute_exists(claim_id)",
+                **self._summary_update(claim_id, summary, summary_metadata)
             )
         except ClientError as error:
             if (
@@ -229,6 +1071,81 @@ class ClaimsService:
                 status_code=500,
                 detail=f"Failed to persist claim summary in DynamoDB: {error}",
             ) from error
+        except BotoCoreError as error:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to persist claim summary in DynamoDB: {error}",
+            ) from error
+
+    def _persist_summaries_to_dynamodb(
+        self, writes: dict[str, tuple[dict[str, str], dict[str, Any]]]
+    ) -> dict[str, HTTPException | None]:
+        """One transaction per chunk of updates; a cancelled chunk is retried
+        claim by claim so one missing claim does not fail its neighbours."""
+        table = self._dynamodb_table()
+        claim_ids = list(writes)
+        results: dict[str, HTTPException | None] = {}
+        for start in range(0, len(claim_ids), DYNAMODB_SUMMARY_TRANSACTION_SIZE):
+            chunk = claim_ids[start : start + DYNAMODB_SUMMARY_TRANSACTION_SIZE]
+            try:
+                # The resource's client accepts plain Python values.
+                table.meta.client.transact_write_items(
+                    TransactItems=[
+                        {
+                            "Update": {
+                                "TableName": self.claims_table_name,
+                                **self._summary_update(claim_id, *writes[claim_id]),
+                            }
+                        }
+                        for claim_id in chunk
+                    ]
+                )
+            except (ClientError, BotoCoreError):
+                for claim_id in chunk:
+                    try:
+                        self._persist_summary_for_dynamodb_claim(
+                            claim_id, *writes[claim_id]
+                        )
+                        results[claim_id] = None
+                    except HTTPException as error:
+                        results[claim_id] = error
+                continue
+            results.update(dict.fromkeys(chunk))
+        return results
+
+    def _summary_update(
+        self,
+        claim_id: str,
+        summary: dict[str, str],
+        summary_metadata: dict[str, Any],
+    ) -> dict[str, Any]:
+        """UpdateItem parameters that store ``summary`` on an existing claim."""
+        set_clauses = ["#summary = :summary", "#updatedAt = :updatedAt"]
+        remove_clauses: list[str] = []
+        attribute_names = {"#summary": "summary", "#updatedAt": "updatedAt"}
+        attribute_values: dict[str, Any] = {
+            ":summary": summary,
+            ":updatedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        }
+        for index, (attribute, value) in enumerate(summary_metadata.items()):
+            attribute_names[f"#meta{index}"] = attribute
+            if value is None:
+                remove_clauses.append(f"#meta{index}")
+            else:
+                set_clauses.append(f"#meta{index} = :meta{index}")
+                attribute_values[f":meta{index}"] = value
+
+        update_expression = "SET " + ", ".join(set_clauses)
+        if remove_clauses:
+            update_expression += " REMOVE " + ", ".join(remove_clauses)
+
+        return {
+            "Key": {"claim_id": claim_id},
+            "UpdateExpression": update_expression,
+            "ExpressionAttributeNames": attribute_names,
+            "ExpressionAttributeValues": attribute_values,
+            "ConditionExpression": "attribute_exists(claim_id)",
+        }
 
     def _build_fallback_summary(
         self, claim: dict[str, Any], notes_text: str
@@ -259,34 +1176,215 @@ class ClaimsService:
         }
 
     def _summarize_with_bedrock_or_fallback(
-        self, claim: dict[str, Any], notes_text: str
-    ) -> dict[str, str]:
+        self,
+        claim: dict[str, Any],
+        notes: list[dict[str, Any]],
+        deadline: float,
+    ) -> tuple[dict[str, str], bool]:
+        """Return the summary and whether every field came from its intended source."""
         model_id = os.getenv("BEDROCK_MODEL_ID")
         region = os.getenv("AWS_REGION", "us-east-1")
 
+        notes_text = " ".join(note.get("content", "") for note in notes)
+        fallback_summary = self._build_fallback_summary(claim, notes_text)
         if not model_id:
-            return self._build_fallback_summary(claim, notes_text)
+            return fallback_summary, True
+        if not self.bedrock_guard.allow():
+            # Bedrock is degraded; answer from the template right away.
+            return fallback_summary, False
+        # The local fallback always describes every note; only the prompts
+        # may carry an incremental delta.
+        notes_text = self._summary_prompt_notes_text(claim, notes)
 
         try:
-            client = boto3.client("bedrock-runtime", region_name=region)
-            field_prompts = {
-                "summary": (
-                    "Provide an overall one-to-three sentence claim summary for internal reference."
-                ),
-                "customer-facing-summary": (
-                    "Provide a customer-facing one-to-three sentence update in empathetic and plain language."
-                ),
-                "adjuster-focused-summary": (
-                    "Provide an adjuster-focused one-to-three sentence operational summary highlighting important claim handling details."
-                ),
-                "recommended-next-step": (
-                    "Provide exactly one concise recommended next action for the adjuster."
-                ),
-            }
+            client = self.aws_clients.client("bedrock-runtime", region)
+        except (ClientError, BotoCoreError):
+            return fallback_summary, False
 
-            generated_summary: dict[str, str] = {}
-            for field_key, field_instruction in field_prompts.items():
-                generated_summary[field_key] = self._invoke_bedrock_field(
+        generated_summary: dict[str, str] = {}
+        if self.bedrock_summary_mode == BEDROCK_SUMMARY_MODE_SINGLE_CALL:
+            generated_summary = self.bedrock_guard.run(
+                self.bedrock_executor,
+                {
+                    "structured-summary": partial(
+                        self._invoke_bedrock_structured_summary,
+                        client=client,
+                        model_id=model_id,
+                        claim=claim,
+                        notes_text=notes_text,
+                    )
+                },
+                deadline,
+            ).get("structured-summary", {})
+
+        # Per-field mode generates every field here; single-call mode only
+        # retries the fields the structured response did not provide.
+        missing_field_prompts = {
+            field_key: field_instruction
+            for field_key, field_instruction in BEDROCK_FIELD_PROMPTS.items()
+            if field_key not in generated_summary
+        }
+        if missing_field_prompts:
+            generated_summary.update(
+                self._generate_bedrock_fields(
+                    client=client,
+                    model_id=model_id,
+                    claim=claim,
+                    notes_text=notes_text,
+                    field_prompts=missing_field_prompts,
+                    deadline=deadline,
+                )
+            )
+
+        # Fields that failed or missed the deadline fall back individually.
+        summary = {
+            field_key: generated_summary.get(field_key, fallback_value)
+            for field_key, fallback_value in fallback_summary.items()
+        }
+        return summary, len(generated_summary) == len(fallback_summary)
+
+    def _stream_summary_events(
+        self,
+        claim: dict[str, Any],
+        notes: list[dict[str, Any]],
+        input_hash: str,
+        cached_summary: dict[str, str] | None,
+        deadline: float,
+        cancellation: SummaryStreamCancellation,
+    ) -> Iterator[SummaryStreamEvent]:
+        if cached_summary is not None:
+            yield "summary", {"claimId": claim["id"], "summary": cached_summary}
+            return
+
+        model_id = os.getenv("BEDROCK_MODEL_ID")
+        region = os.getenv("AWS_REGION", "us-east-1")
+
+        notes_text = " ".join(note.get("content", "") for note in notes)
+        fallback_summary = self._build_fallback_summary(claim, notes_text)
+        generated_summary: dict[str, str] = {}
+        if model_id and self.bedrock_guard.allow():
+            try:
+                client = self.aws_clients.client("bedrock-runtime", region)
+            except (ClientError, BotoCoreError):
+                client = None
+            if client is not None:
+                yield from self._stream_bedrock_fields(
+                    client=client,
+                    model_id=model_id,
+                    claim=claim,
+                    notes_text=self._summary_prompt_notes_text(claim, notes),
+                    generated=generated_summary,
+                    deadline=deadline,
+                    cancellation=cancellation,
+                )
+
+        for field_key, fallback_value in fallback_summary.items():
+            if field_key not in generated_summary:
+                yield "field", {
+                    "field": field_key,
+                    "value": fallback_value,
+                    "fallback": True,
+                }
+
+        summary = {
+            field_key: generated_summary.get(field_key, fallback_value)
+            for field_key, fallback_value in fallback_summary.items()
+        }
+        complete = not model_id or len(generated_summary) == len(fallback_summary)
+        self._store_generated_summary(claim["id"], summary, input_hash, complete, notes)
+        yield "summary", {"claimId": claim["id"], "summary": summary}
+
+    def _stream_bedrock_fields(
+        self,
+        client: Any,
+        model_id: str,
+        claim: dict[str, Any],
+        notes_text: str,
+        generated: dict[str, str],
+        deadline: float,
+        cancellation: SummaryStreamCancellation,
+    ) -> Iterator[SummaryStreamEvent]:
+        """Relay tokens of all fields as they arrive and collect finished fields.
+
+        Each field streams on its own executor thread and pushes its tokens onto
+        a shared queue, so the first token of any field is yielded as soon as it
+        is received. Streams still open at the deadline, or when the client
+        disconnects, are closed and their fields fall back. Streams are not
+        hedged: tokens already relayed cannot be swapped for another attempt's.
+        """
+        events: queue.Queue[tuple[str, str, Any]] = queue.Queue()
+
+        futures: dict[Future, str] = {}
+        for field_key, field_instruction in BEDROCK_FIELD_PROMPTS.items():
+            future = submit_in_context(
+                self.bedrock_executor,
+                self._stream_bedrock_field,
+                client=client,
+                model_id=model_id,
+                claim=claim,
+                notes_text=notes_text,
+                field_key=field_key,
+                field_instruction=field_instruction,
+                emit=lambda text, key=field_key: events.put(("delta", key, text)),
+                cancellation=cancellation,
+            )
+            futures[future] = field_key
+            future.add_done_callback(
+                lambda done, key=field_key: events.put(("done", key, done))
+            )
+
+        pending = set(futures.values())
+        try:
+            while pending and not cancellation.event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    kind, field_key, payload = events.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if cancellation.event.is_set():
+                    # Fields fail once their streams are closed under them.
+                    break
+
+                if kind == "delta":
+                    yield "delta", {"field": field_key, "text": payload}
+                    continue
+
+                pending.discard(field_key)
+                try:
+                    generated[field_key] = payload.result()
+                except BEDROCK_ERRORS as error:
+                    self.bedrock_guard.record_result(error)
+                    continue
+                self.bedrock_guard.record_result(None)
+                yield "field", {
+                    "field": field_key,
+                    "value": generated[field_key],
+                    "fallback": False,
+                }
+            if not cancellation.event.is_set():
+                for _ in pending:
+                    self.bedrock_guard.record_deadline_exceeded()
+        finally:
+            cancellation.cancel()
+            for future in futures:
+                future.cancel()
+
+    def _generate_bedrock_fields(
+        self,
+        client: Any,
+        model_id: str,
+        claim: dict[str, Any],
+        notes_text: str,
+        field_prompts: dict[str, str],
+        deadline: float,
+    ) -> dict[str, str]:
+        return self.bedrock_guard.run(
+            self.bedrock_executor,
+            {
+                field_key: partial(
+                    self._invoke_bedrock_field,
                     client=client,
                     model_id=model_id,
                     claim=claim,
@@ -294,10 +1392,10 @@ class ClaimsService:
                     field_key=field_key,
                     field_instruction=field_instruction,
                 )
-
-            return generated_summary
-        except (ClientError, BotoCoreError, ValueError, KeyError, json.JSONDecodeError):
-            return self._build_fallback_summary(claim, notes_text)
+                for field_key, field_instruction in field_prompts.items()
+            },
+            deadline,
+        )
 
     def _invoke_bedrock_field(
         self,
@@ -308,26 +1406,127 @@ class ClaimsService:
         field_key: str,
         field_instruction: str,
     ) -> str:
-        prompt = (
+        prompt = self._bedrock_field_prompt(
+            claim, notes_text, field_key, field_instruction
+        )
+
+        with timed(f"bedrock-field-{field_key}"):
+            response = client.converse(
+                modelId=model_id,
+                messages=[{"role": "user", "content": [{"text": prompt}]}],
+                inferenceConfig={"maxTokens": 220, "temperature": 0.2},
+            )
+
+        text_blocks = response.get("output", {}).get("message", {}).get("content", [])
+        text = "".join(block.get("text", "") for block in text_blocks)
+        return self._extract_bedrock_field_text(text=text, field_key=field_key)
+
+    def _stream_bedrock_field(
+        self,
+        client: Any,
+        model_id: str,
+        claim: dict[str, Any],
+        notes_text: str,
+        field_key: str,
+        field_instruction: str,
+        emit: Callable[[str], None],
+        cancellation: SummaryStreamCancellation,
+    ) -> str:
+        prompt = self._bedrock_field_prompt(
+            claim, notes_text, field_key, field_instruction
+        )
+
+        # Timed until the last token; ConverseStream itself returns at the
+        # first byte.
+        with timed(f"bedrock-field-{field_key}"):
+            response = client.converse_stream(
+                modelId=model_id,
+                messages=[{"role": "user", "content": [{"text": prompt}]}],
+                inferenceConfig={"maxTokens": 220, "temperature": 0.2},
+            )
+
+            chunks: list[str] = []
+            with cancellation.opened(response["stream"]) as stream:
+                for event in stream:
+                    if cancellation.event.is_set():
+                        raise ValueError(
+                            f"Bedrock stream for '{field_key}' was abandoned"
+                        )
+                    delta = event.get("contentBlockDelta", {}).get("delta", {})
+                    text = delta.get("text")
+                    if text:
+                        chunks.append(text)
+                        emit(text)
+
+        # Deltas are relayed raw; the field value gets the same clean-up as
+        # the non-streaming path.
+        return self._extract_bedrock_field_text(
+            text="".join(chunks), field_key=field_key
+        )
+
+    def _bedrock_field_prompt(
+        self,
+        claim: dict[str, Any],
+        notes_text: str,
+        field_key: str,
+        field_instruction: str,
+    ) -> str:
+        return (
             "You are an insurance claim assistant. "
             f"Generate ONLY the '{field_key}' value. "
             "Return plain text only, unless asked for JSON explicitly. "
             "Do not include markdown fences. "
             f"Instruction: {field_instruction} "
-            f"Claim: {json.dumps(claim)}. Notes: {notes_text}"
+            f"Claim: {self._prompt_claim_json(claim)}. Notes: {notes_text}"
         )
 
-        response = client.converse(
-            modelId=model_id,
-            messages=[{"role": "user", "content": [{"text": prompt}]}],
-            inferenceConfig={"maxTokens": 220, "temperature": 0.2},
+    def _invoke_bedrock_structured_summary(
+        self,
+        client: Any,
+        model_id: str,
+        claim: dict[str, Any],
+        notes_text: str,
+    ) -> dict[str, str]:
+        field_instructions = " ".join(
+            f"'{field_key}': {field_instruction}"
+            for field_key, field_instruction in BEDROCK_FIELD_PROMPTS.items()
         )
+        prompt = (
+            "You are an insurance claim assistant. "
+            "Return ONLY a JSON object with the string keys "
+            f"{', '.join(repr(field_key) for field_key in BEDROCK_FIELD_PROMPTS)}. "
+            "Do not include markdown fences. "
+            f"Field instructions: {field_instructions} "
+            f"Claim: {self._prompt_claim_json(claim)}. Notes: {notes_text}"
+        )
+
+        with timed("bedrock-structured-summary"):
+            response = client.converse(
+                modelId=model_id,
+                messages=[{"role": "user", "content": [{"text": prompt}]}],
+                inferenceConfig={"maxTokens": 900, "temperature": 0.2},
+            )
 
         text_blocks = response.get("output", {}).get("message", {}).get("content", [])
         text = "".join(block.get("text", "") for block in text_blocks)
-        return self._extract_bedrock_field_text(text=text, field_key=field_key)
+        parsed = json.loads(self._clean_bedrock_text(text))
+        if not isinstance(parsed, dict):
+            raise ValueError("Bedrock structured response was not a JSON object")
 
-    def _extract_bedrock_field_text(self, text: str, field_key: str) -> str:
+        generated: dict[str, str] = {}
+        for field_key in BEDROCK_FIELD_PROMPTS:
+            try:
+                generated[field_key] = self._pick_bedrock_json_field(parsed, field_key)
+            except KeyError:
+                continue
+        return generated
+
+    def _prompt_claim_json(self, claim: dict[str, Any]) -> str:
+        # Stored summary attributes stay out of the prompt; the incremental
+        # path adds the previous summary explicitly.
+        return json.dumps({field: claim.get(field) for field in SUMMARY_CLAIM_FIELDS})
+
+    def _clean_bedrock_text(self, text: str) -> str:
         cleaned_text = text.strip()
         if not cleaned_text:
             raise ValueError("Bedrock response was empty")
@@ -336,6 +1535,10 @@ class ClaimsService:
             cleaned_text = cleaned_text.strip("`")
             if cleaned_text.lower().startswith("json"):
                 cleaned_text = cleaned_text[4:].strip()
+        return cleaned_text
+
+    def _extract_bedrock_field_text(self, text: str, field_key: str) -> str:
+        cleaned_text = self._clean_bedrock_text(text)
 
         if not (cleaned_text.startswith("{") and cleaned_text.endswith("}")):
             return cleaned_text
@@ -345,28 +1548,16 @@ class ClaimsService:
         except json.JSONDecodeError:
             return cleaned_text
 
-        key_aliases = {
-            "summary": ["summary", "overall_summary", "overall-summary"],
-            "customer-facing-summary": [
-                "customer-facing-summary",
-                "customer_facing_summary",
-                "customerFacingSummary",
-            ],
-            "adjuster-focused-summary": [
-                "adjuster-focused-summary",
-                "adjuster_focused_summary",
-                "adjusterFocusedSummary",
-            ],
-            "recommended-next-step": [
-                "recommended-next-step",
-                "recommended_next_step",
-                "recommendedNextStep",
-            ],
-        }
+        return self._pick_bedrock_json_field(parsed, field_key)
 
-        for key in key_aliases.get(field_key, [field_key]):
+    def _pick_bedrock_json_field(self, parsed: dict[str, Any], field_key: str) -> str:
+        for key in BEDROCK_FIELD_KEY_ALIASES.get(field_key, [field_key]):
             value = parsed.get(key)
             if isinstance(value, str) and value.strip():
                 return value.strip()
 
         raise KeyError(f"Missing expected field '{field_key}' in Bedrock JSON response")
+
+
+def _local_status_entry(claim: dict[str, Any]) -> tuple[str, str]:
+    return str(claim.get("updatedAt") or ""), str(claim.get("id"))
@@ -0,0 +1,37 @@
+import json
+from decimal import Decimal
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the standard library encoder.
+    orjson = None
+
+JSON_ENGINE = "orjson" if orjson is not None else "json"
+
+
+def _encode_default(value: Any) -> Any:
+    # boto3 returns DynamoDB numbers as Decimal.
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Encode plain JSON data (dicts, lists, strings, numbers) to compact UTF-8.
+
+    Uses orjson when it is installed. Unlike FastAPI's ``jsonable_encoder`` the
+    value is not walked and copied first, which matters for claims with
+    thousands of notes.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_encode_default)
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), default=_encode_default
+    ).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
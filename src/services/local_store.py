@@ -0,0 +1,434 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from fastapi import HTTPException
+
+from src.services.cache import FetchResult, ReadThroughCache, file_version_tag
+from src.services.timing import timed
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only.
+    fcntl = None
+
+LOCAL_STORAGE_ENGINE_JSON = "json"
+LOCAL_STORAGE_ENGINE_JSONL = "jsonl"
+
+RecordKey = tuple[Any, ...]
+
+# First line of a JSON Lines log. Compaction writes the next generation into
+# the new log, so readers notice the swap without relying on inode numbers.
+_GENERATION_OP = "generation"
+_GENERATION_LINE_PREFIX = b'{"op":"generation",'
+
+
+def open_local_store(
+    path: Path, key_fields: tuple[str, ...], data_cache: ReadThroughCache
+) -> "JsonFileStore | JsonLinesStore":
+    """Return the local record store selected by ``LOCAL_STORAGE_ENGINE``.
+
+    ``path`` is the JSON array file (``mocks/claims.json``); the ``jsonl``
+    engine keeps its log next to it (``mocks/claims.jsonl``) and seeds the log
+    from the JSON file the first time it is opened.
+    """
+    engine = os.getenv("LOCAL_STORAGE_ENGINE", LOCAL_STORAGE_ENGINE_JSON).strip()
+    engine = engine.lower()
+    if engine == LOCAL_STORAGE_ENGINE_JSON:
+        return JsonFileStore(path, key_fields, data_cache)
+    if engine == LOCAL_STORAGE_ENGINE_JSONL:
+        return JsonLinesStore(
+            path.with_suffix(".jsonl"),
+            key_fields,
+            seed_path=path,
+            compaction_min_lines=int(
+                os.getenv("LOCAL_STORE_COMPACTION_MIN_LINES", "1000")
+            ),
+        )
+    raise ValueError(
+        f"Unsupported LOCAL_STORAGE_ENGINE: {engine}. "
+        f"Expected '{LOCAL_STORAGE_ENGINE_JSON}' or '{LOCAL_STORAGE_ENGINE_JSONL}'."
+    )
+
+
+class JsonFileStore:
+    """Records kept as one JSON array file that is rewritten on every change.
+
+    Reads go through the shared read-through cache. Writes are serialised
+    within the process and replace the file atomically, so readers never see a
+    partially written file, but every write still costs O(number of records).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        key_fields: tuple[str, ...],
+        data_cache: ReadThroughCache,
+    ) -> None:
+        self.path = path
+        self.key_fields = key_fields
+        self.data_cache = data_cache
+        self._read_timing = f"local-read-{path.stem}"
+        self._write_timing = f"local-write-{path.stem}"
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def values(self) -> list[dict[str, Any]]:
+        return self._load()
+
+    def version(self) -> str:
+        """Token that changes whenever the stored records change."""
+        return file_version_tag(self.path) if self.path.exists() else ""
+
+    def get(self, key: RecordKey) -> dict[str, Any] | None:
+        return next((item for item in self._load() if self._key(item) == key), None)
+
+    def values_for(self, group: Any) -> list[dict[str, Any]]:
+        """Return the records whose first key field equals ``group``."""
+        return [item for item in self._load() if self._key(item)[0] == group]
+
+    def get_many(self, keys: list[RecordKey]) -> dict[RecordKey, dict[str, Any]]:
+        wanted = set(keys)
+        found: dict[RecordKey, dict[str, Any]] = {}
+        for item in self._load():
+            key = self._key(item)
+            if key in wanted and key not in found:
+                found[key] = item
+        return found
+
+    def put(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            records = self._load()
+            key = self._key(record)
+            index = next(
+                (i for i, item in enumerate(records) if self._key(item) == key), -1
+            )
+            if index == -1:
+                records.append(record)
+            else:
+                records[index] = record
+            self._write(records)
+
+    def put_many(self, records: list[dict[str, Any]]) -> None:
+        """Insert or replace several records with a single file rewrite."""
+        with self._lock:
+            stored = self._load()
+            positions = {self._key(item): index for index, item in enumerate(stored)}
+            for record in records:
+                key = self._key(record)
+                if key in positions:
+                    stored[positions[key]] = record
+                else:
+                    positions[key] = len(stored)
+                    stored.append(record)
+            self._write(stored)
+
+    def delete(self, key: RecordKey) -> dict[str, Any] | None:
+        with self._lock:
+            records = self._load()
+            index = next(
+                (i for i, item in enumerate(records) if self._key(item) == key), -1
+            )
+            if index == -1:
+                return None
+            deleted = records.pop(index)
+            self._write(records)
+            return deleted
+
+    def _key(self, record: dict[str, Any]) -> RecordKey:
+        return tuple(record.get(field) for field in self.key_fields)
+
+    def _load(self) -> list[dict[str, Any]]:
+        if not self.path.exists():
+            raise HTTPException(
+                status_code=500, detail=f"Data file not found: {self.path.name}"
+            )
+
+        def fetch(previous_tag: str | None) -> FetchResult:
+            tag = file_version_tag(self.path)
+            if tag == previous_tag:
+                return None
+            with timed(self._read_timing), self.path.open(
+                "r", encoding="utf-8"
+            ) as file:
+                return json.load(file), tag
+
+        return list(self.data_cache.get(f"file:{self.path}", fetch))
+
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        with timed(self._write_timing), _atomic_writer(self.path, "w") as file:
+            json.dump(records, file, indent=4)
+        self.data_cache.put(f"file:{self.path}", records, file_version_tag(self.path))
+
+
+class JsonLinesStore:
+    """Append-only NDJSON log of ``put``/``delete`` operations with an in-memory index.
+
+    Every change appends one line and fsyncs it, so writes are O(1). Writers
+    hold a process lock and an exclusive ``flock`` on ``<log>.lock`` so several
+    workers can share the log. Before each operation the index catches up with
+    lines appended by other processes; an incomplete trailing line is left for
+    the next read, so a torn write is never applied. Once the log holds at least
+    ``compaction_min_lines`` lines and more than twice as many lines as live
+    records, a background thread rewrites it as a snapshot and swaps it in with
+    ``os.replace``. The log starts with a generation line that compaction
+    increments, which tells readers to reload the index. Records are also
+    indexed by their first key field, so ``values_for`` returns one group
+    without visiting the others.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        key_fields: tuple[str, ...],
+        seed_path: Path | None = None,
+        compaction_min_lines: int = 1000,
+    ) -> None:
+        self.path = path
+        self.key_fields = key_fields
+        self.seed_path = seed_path
+        self.compaction_min_lines = max(compaction_min_lines, 1)
+        self._read_timing = f"local-read-{path.stem}"
+        self._write_timing = f"local-write-{path.stem}"
+        self._records: dict[RecordKey, dict[str, Any]] = {}
+        self._groups: dict[Any, dict[RecordKey, dict[str, Any]]] = {}
+        self._generation: int | None = None
+        self._offset = 0
+        self._lines = 0
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_path = path.with_name(path.name + ".lock")
+        self._compacting = False
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        with self._lock:
+            self._lock_depth += 1
+            lock_file = None
+            try:
+                if self._lock_depth == 1 and fcntl is not None:
+                    lock_file = self._lock_path.open("a")
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._refresh()
+                yield
+            finally:
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+                self._lock_depth -= 1
+
+    def values(self) -> list[dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return list(self._records.values())
+
+    def version(self) -> str:
+        """Token that changes whenever the stored records change."""
+        with self._lock:
+            self._refresh()
+            return f"{self._generation}:{self._offset}"
+
+    def get(self, key: RecordKey) -> dict[str, Any] | None:
+        with self._lock:
+            self._refresh()
+            return self._records.get(key)
+
+    def values_for(self, group: Any) -> list[dict[str, Any]]:
+        """Return the records whose first key field equals ``group``."""
+        with self._lock:
+            self._refresh()
+            return list(self._groups.get(group, {}).values())
+
+    def get_many(self, keys: list[RecordKey]) -> dict[RecordKey, dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return {key: self._records[key] for key in keys if key in self._records}
+
+    def put(self, record: dict[str, Any]) -> None:
+        with self.locked():
+            self._append({"op": "put", "record": record})
+
+    def put_many(self, records: list[dict[str, Any]]) -> None:
+        """Insert or replace several records with one append and one fsync."""
+        with self.locked():
+            self._append(*({"op": "put", "record": record} for record in records))
+
+    def delete(self, key: RecordKey) -> dict[str, Any] | None:
+        with self.locked():
+            if key not in self._records:
+                return None
+            deleted = self._records[key]
+            self._append({"op": "delete", "key": list(key)})
+            return deleted
+
+    def _key(self, record: dict[str, Any]) -> RecordKey:
+        return tuple(record.get(field) for field in self.key_fields)
+
+    def _apply(self, entry: dict[str, Any]) -> None:
+        if entry.get("op") == "put":
+            record = entry["record"]
+            key = self._key(record)
+            self._records[key] = record
+            self._groups.setdefault(key[0], {})[key] = record
+        elif entry.get("op") == "delete":
+            key = tuple(entry["key"])
+            if self._records.pop(key, None) is not None:
+                group = self._groups[key[0]]
+                del group[key]
+                if not group:
+                    del self._groups[key[0]]
+
+    def _refresh(self) -> None:
+        try:
+            file = self.path.open("rb")
+        except FileNotFoundError:
+            self._seed()
+            file = self.path.open("rb")
+
+        with file:
+            # Size and generation come from the same open file, so a log swapped
+            # in by another process's compaction is never mixed with this one.
+            size = os.fstat(file.fileno()).st_size
+            generation = _read_generation(file)
+            if generation != self._generation or size < self._offset:
+                # First load, or another process compacted the log.
+                self._records = {}
+                self._groups = {}
+                self._generation = generation
+                self._offset = 0
+                self._lines = 0
+            if size == self._offset:
+                return
+
+            with timed(self._read_timing):
+                file.seek(self._offset)
+                chunk = file.read(size - self._offset)
+                complete = chunk[: chunk.rfind(b"\n") + 1]
+                for line in complete.splitlines():
+                    if line.strip():
+                        self._apply(json.loads(line))
+                        self._lines += 1
+                self._offset += len(complete)
+
+    def _seed(self) -> None:
+        records: list[dict[str, Any]] = []
+        if self.seed_path is not None and self.seed_path.exists():
+            with self.seed_path.open("r", encoding="utf-8") as file:
+                records = json.load(file)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=self.path.parent, prefix=self.path.name, delete=False
+        ) as file:
+            temp_path = Path(file.name)
+            file.write(_encode_line({"op": _GENERATION_OP, "generation": 1}))
+            for record in records:
+                file.write(_encode_line({"op": "put", "record": record}))
+            file.flush()
+            os.fsync(file.fileno())
+        try:
+            # Link instead of replace so a log created meanwhile by another
+            # process, possibly with appends, is kept.
+            os.link(temp_path, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            temp_path.unlink()
+
+    def _append(self, *entries: dict[str, Any]) -> None:
+        # Callers hold locked(), so the index is current and no other writer
+        # can append between the refresh and this write.
+        if not entries:
+            return
+        lines = b"".join(_encode_line(entry) for entry in entries)
+        with timed(self._write_timing), self.path.open("ab") as file:
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+        for entry in entries:
+            self._apply(entry)
+        self._offset += len(lines)
+        self._lines += len(entries)
+
+        if (
+            not self._compacting
+            and self._lines >= self.compaction_min_lines
+            and self._lines > 2 * len(self._records)
+        ):
+            self._compacting = True
+            threading.Thread(
+                target=self._compact, name="local-store-compaction", daemon=True
+            ).start()
+
+    def _compact(self) -> None:
+        try:
+            with self.locked():
+                snapshot = list(self._records.values())
+                generation, offset = self._generation or 0, self._offset
+
+            # The snapshot is written without holding the lock; lines appended
+            # meanwhile are copied over before the swap.
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=self.path.parent, prefix=self.path.name, delete=False
+            ) as file:
+                temp_path = Path(file.name)
+                file.write(
+                    _encode_line({"op": _GENERATION_OP, "generation": generation + 1})
+                )
+                for record in snapshot:
+                    file.write(_encode_line({"op": "put", "record": record}))
+
+            with self.locked():
+                if self._generation != generation:
+                    temp_path.unlink(missing_ok=True)
+                    return
+                with self.path.open("rb") as source:
+                    source.seek(offset)
+                    tail = source.read(self._offset - offset)
+                with temp_path.open("ab") as file:
+                    file.write(tail)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(temp_path, self.path)
+                self._generation = generation + 1
+                self._offset = self.path.stat().st_size
+                self._lines = 1 + len(snapshot) + tail.count(b"\n")
+        finally:
+            self._compacting = False
+
+
+def _read_generation(file: Any) -> int:
+    """Return the generation on the log's first line, ``0`` for older logs."""
+    file.seek(0)
+    first_line = file.readline(256)
+    if first_line.startswith(_GENERATION_LINE_PREFIX) and first_line.endswith(b"\n"):
+        return int(json.loads(first_line)["generation"])
+    return 0
+
+
+def _encode_line(entry: dict[str, Any]) -> bytes:
+    return (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+@contextmanager
+def _atomic_writer(path: Path, mode: str) -> Iterator[Any]:
+    encoding = None if "b" in mode else "utf-8"
+    with tempfile.NamedTemporaryFile(
+        mode, dir=path.parent, prefix=path.name, delete=False, encoding=encoding
+    ) as file:
+        temp_path = Path(file.name)
+        try:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        except BaseException:
+            file.close()
+            temp_path.unlink(missing_ok=True)
+            raise
+    os.replace(temp_path, path)
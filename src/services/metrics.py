@@ -0,0 +1,64 @@
+import threading
+from collections import deque
+from typing import Any
+
+LATENCY_WINDOW_SIZE = 200
+
+
+class CounterSet:
+    """Thread-safe named counters reported through ``GET /metrics``."""
+
+    def __init__(self, *names: str) -> None:
+        self._counters = {name: 0 for name in names}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+class LatencyWindow:
+    """The most recent durations recorded under each name, for percentiles."""
+
+    def __init__(self, size: int = LATENCY_WINDOW_SIZE) -> None:
+        self.size = size
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.size)
+            samples.append(seconds)
+
+    def percentile(
+        self, name: str, percentile: float, min_samples: int
+    ) -> float | None:
+        """Nearest-rank percentile, or None until ``min_samples`` are recorded."""
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        rank = max(round(percentile / 100 * len(samples)) - 1, 0)
+        return samples[min(rank, len(samples) - 1)]
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            names = list(self._samples)
+        return {
+            name: {
+                "samples": len(self._samples[name]),
+                "p50Ms": _milliseconds(self.percentile(name, 50, 1)),
+                "p95Ms": _milliseconds(self.percentile(name, 95, 1)),
+            }
+            for name in names
+        }
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
@@ -0,0 +1,463 @@
+import heapq
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from fastapi import HTTPException
+
+from src.services.json_codec import dumps, loads
+from src.services.metrics import CounterSet
+
+NoteKey = tuple[str, str]
+NotesLoader = Callable[[], Iterable[dict[str, Any]]]
+# Per note: (impact level, *positions of the term among the note's words); one
+# flat tuple keeps the index at one object per posting.
+Posting = dict[int, tuple[int, ...]]
+
+NOTES_SEARCH_MAX_LIMIT = 100
+# Bump when the snapshot layout changes; older snapshots are then ignored.
+NOTES_SEARCH_SNAPSHOT_VERSION = 2
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_PHRASE_PATTERN = re.compile(r'"([^"]*)"')
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this "
+    "to was were will with".split()
+)
+
+# BM25 parameters.
+_K1 = 1.2
+_B = 0.75
+# A term's BM25 contribution without its IDF is below K1 + 1; it is stored
+# rounded up to one of this many levels.
+_IMPACT_LEVELS = 255
+_IMPACT_SCALE = (_K1 + 1) / _IMPACT_LEVELS
+# Average note length assumed until an index is built from actual notes.
+_DEFAULT_AVERAGE_LENGTH = 32.0
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class NotesSearchIndex:
+    """In-memory inverted index over note contents, ranked with BM25.
+
+    Every query term must occur in a note; ``"quoted phrases"`` must also occur
+    as consecutive words (stop words inside a phrase match any word). Each
+    posting stores the term's positions in the note and its BM25 term weight
+    quantized to a level, and each term's notes are bucketed by level. A query
+    walks its terms' notes from the best level down and stops as soon as no
+    unvisited note can enter the top ``limit``, so it rarely visits more than
+    the top few levels. Length normalization uses the average note length of
+    the last build.
+
+    ``start`` builds the index in the background from ``load_notes``; writes
+    through this process then update it incrementally. Notes written through
+    other pods are only picked up by periodic rebuilds every
+    ``rebuild_seconds``, which are off by default because each one reads
+    every note from the backend. With a ``snapshot_path`` each build is saved
+    there as JSON. ``start`` serves a saved snapshot right away and still
+    rebuilds in the background, since notes written after the snapshot was
+    saved are missing from it.
+    """
+
+    def __init__(
+        self,
+        load_notes: NotesLoader,
+        enabled: bool,
+        rebuild_seconds: float,
+        snapshot_path: Path | None = None,
+    ) -> None:
+        self.load_notes = load_notes
+        self.enabled = enabled
+        self.rebuild_seconds = max(rebuild_seconds, 0.0)
+        self.snapshot_path = snapshot_path
+        self.counters = CounterSet(
+            "queries", "builds", "buildFailures", "snapshotsLoaded", "updates"
+        )
+        self._lock = threading.RLock()
+        self._postings: dict[str, Posting] = {}
+        # Term -> level -> doc ids. Dicts of plain ints, unlike sets, are not
+        # tracked by the garbage collector, which keeps builds linear.
+        self._levels: dict[str, dict[int, dict[int, None]]] = {}
+        # Doc id -> (claim ID, note ID, content, token count).
+        self._docs: dict[int, tuple[str, str, str, int]] = {}
+        self._doc_ids: dict[NoteKey, int] = {}
+        self._next_doc_id = 0
+        self._average_length = _DEFAULT_AVERAGE_LENGTH
+        self._ready = False
+        self._last_build_seconds: float | None = None
+        # Changes made while a rebuild reads the backend, replayed on top of it.
+        self._changes_during_build: list[tuple[str, Any]] | None = None
+        self._builder: threading.Thread | None = None
+
+    @classmethod
+    def from_env(cls, load_notes: NotesLoader) -> "NotesSearchIndex":
+        snapshot_path = os.getenv("NOTES_SEARCH_SNAPSHOT_PATH", "").strip()
+        return cls(
+            load_notes,
+            enabled=os.getenv("NOTES_SEARCH_ENABLED", "true").strip().lower()
+            in {"1", "true", "yes"},
+            rebuild_seconds=float(os.getenv("NOTES_SEARCH_REBUILD_SECONDS", "0")),
+            snapshot_path=Path(snapshot_path) if snapshot_path else None,
+        )
+
+    def start(self) -> None:
+        if not self.enabled or self._builder is not None:
+            return
+        self._load_snapshot()
+        self._builder = threading.Thread(
+            target=self._build_periodically, name="notes-search-index", daemon=True
+        )
+        self._builder.start()
+
+    def add_note(self, note: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._add(note)
+            if self._changes_during_build is not None:
+                self._changes_during_build.append(("add", note))
+        self.counters.increment("updates")
+
+    def remove_note(self, claim_id: str, note_id: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._remove((claim_id, note_id))
+            if self._changes_during_build is not None:
+                self._changes_during_build.append(("remove", (claim_id, note_id)))
+        self.counters.increment("updates")
+
+    def search(self, query: str, limit: int) -> list[dict[str, Any]]:
+        if not self.enabled:
+            raise HTTPException(status_code=404, detail="Notes search is disabled")
+        if not self._ready:
+            raise HTTPException(
+                status_code=503,
+                detail="Notes search index is still being built",
+                headers={"Retry-After": "5"},
+            )
+        terms = list(dict.fromkeys(_index_terms(tokenize(query))))
+        if not terms:
+            raise HTTPException(
+                status_code=400, detail="Query needs at least one searchable word"
+            )
+        phrases = [
+            phrase
+            for phrase in map(_phrase_terms, _PHRASE_PATTERN.findall(query))
+            if len(phrase) > 1
+        ]
+        self.counters.increment("queries")
+
+        # Only references are taken under the lock, and each level's notes are
+        # copied under it as the walk reaches them, so note writes never wait
+        # for a whole query.
+        with self._lock:
+            postings = {term: self._postings.get(term) for term in terms}
+            if not all(postings.values()):
+                return []
+            doc_count = len(self._docs)
+            cursors = [
+                _LevelCursor(
+                    self._lock,
+                    self._levels[term],
+                    _idf(doc_count, len(postings[term])),
+                )
+                for term in terms
+            ]
+        scoring = [
+            (cursor.weight, postings[term]) for term, cursor in zip(terms, cursors)
+        ]
+
+        # Threshold algorithm: walk every term's notes from the best level down
+        # in turn. A note not seen yet scores at most the sum of the levels the
+        # walks are at, so the query stops once the top ``limit`` reach that.
+        top: list[tuple[float, int]] = []
+        seen: set[int] = set()
+        while True:
+            for cursor in cursors:
+                doc_id = cursor.next()
+                if doc_id is None:
+                    # Notes left unseen lack this term, so none can match.
+                    return self._results(top)
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                score = 0.0
+                for weight, posting in scoring:
+                    entry = posting.get(doc_id)
+                    if entry is None:
+                        break
+                    score += weight * entry[0]
+                else:
+                    if phrases and not all(
+                        _matches_phrase(postings, doc_id, phrase) for phrase in phrases
+                    ):
+                        continue
+                    if len(top) < limit:
+                        heapq.heappush(top, (score, doc_id))
+                    elif score > top[0][0]:
+                        heapq.heapreplace(top, (score, doc_id))
+            if len(top) >= limit and top[0][0] >= sum(
+                cursor.weight * cursor.level for cursor in cursors
+            ):
+                return self._results(top)
+
+    def _results(self, top: list[tuple[float, int]]) -> list[dict[str, Any]]:
+        results = []
+        for score, doc_id in sorted(top, reverse=True):
+            doc = self._docs.get(doc_id)
+            if doc is not None:
+                results.append(
+                    {
+                        "claimId": doc[0],
+                        "noteId": doc[1],
+                        "content": doc[2],
+                        "score": round(score * _IMPACT_SCALE, 4),
+                    }
+                )
+        return results
+
+    def rebuild(self) -> None:
+        """Replace the index with a fresh read of every note."""
+        started = time.monotonic()
+        with self._lock:
+            self._changes_during_build = []
+        try:
+            notes = list(self.load_notes())
+            fresh = NotesSearchIndex(self.load_notes, enabled=True, rebuild_seconds=0)
+            tokens = [tokenize(str(note.get("content", ""))) for note in notes]
+            if notes:
+                fresh._average_length = max(sum(map(len, tokens)) / len(notes), 1.0)
+            for note, note_tokens in zip(notes, tokens):
+                fresh._add(note, note_tokens)
+        except BaseException:
+            with self._lock:
+                self._changes_during_build = None
+            raise
+
+        with self._lock:
+            changes, self._changes_during_build = self._changes_during_build, None
+            self._adopt(fresh)
+            for kind, payload in changes:
+                if kind == "add":
+                    self._add(payload)
+                else:
+                    self._remove(payload)
+            self._ready = True
+            self._last_build_seconds = time.monotonic() - started
+        self.counters.increment("builds")
+        self._save_snapshot()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counters.snapshot(),
+                "enabled": self.enabled,
+                "ready": self._ready,
+                "notes": len(self._docs),
+                "terms": len(self._postings),
+                "lastBuildSeconds": (
+                    round(self._last_build_seconds, 3)
+                    if self._last_build_seconds is not None
+                    else None
+                ),
+                "rebuildSeconds": self.rebuild_seconds,
+            }
+
+    def _add(self, note: dict[str, Any], tokens: list[str] | None = None) -> None:
+        key = (str(note.get("claimId")), str(note.get("noteId")))
+        self._remove(key)
+        content = str(note.get("content", ""))
+        if tokens is None:
+            tokens = tokenize(content)
+        doc_id = self._next_doc_id
+        self._next_doc_id += 1
+        self._doc_ids[key] = doc_id
+        self._docs[doc_id] = (*key, content, len(tokens))
+
+        positions: dict[str, list[int]] = {}
+        for position, token in enumerate(tokens):
+            if token not in STOP_WORDS:
+                positions.setdefault(token, []).append(position)
+        length_norm = _K1 * (1 - _B + _B * len(tokens) / self._average_length)
+        for term, term_positions in positions.items():
+            frequency = len(term_positions)
+            level = math.ceil(
+                frequency * (_K1 + 1) / (frequency + length_norm) / _IMPACT_SCALE
+            )
+            self._index(term, doc_id, (min(level, _IMPACT_LEVELS), *term_positions))
+
+    def _index(self, term: str, doc_id: int, entry: tuple[int, ...]) -> None:
+        posting = self._postings.get(term)
+        if posting is None:
+            posting = self._postings[term] = {}
+            self._levels[term] = {}
+        posting[doc_id] = entry
+        levels = self._levels[term]
+        doc_ids = levels.get(entry[0])
+        if doc_ids is None:
+            levels[entry[0]] = {doc_id: None}
+        else:
+            doc_ids[doc_id] = None
+
+    def _remove(self, key: NoteKey) -> None:
+        doc_id = self._doc_ids.pop(key, None)
+        if doc_id is None:
+            return
+        content = self._docs.pop(doc_id)[2]
+        for term in set(_index_terms(tokenize(content))):
+            posting = self._postings.get(term)
+            entry = posting.pop(doc_id, None) if posting is not None else None
+            if entry is None:
+                continue
+            levels = self._levels[term]
+            levels[entry[0]].pop(doc_id, None)
+            if not levels[entry[0]]:
+                del levels[entry[0]]
+            if not posting:
+                del self._postings[term]
+                del self._levels[term]
+
+    def _adopt(self, other: "NotesSearchIndex") -> None:
+        self._postings = other._postings
+        self._levels = other._levels
+        self._docs = other._docs
+        self._doc_ids = other._doc_ids
+        self._next_doc_id = other._next_doc_id
+        self._average_length = other._average_length
+
+    def _build_periodically(self) -> None:
+        while True:
+            try:
+                self.rebuild()
+            except Exception:
+                # Keep serving the previous index; the next round retries.
+                self.counters.increment("buildFailures")
+            if not self.rebuild_seconds:
+                return
+            time.sleep(self.rebuild_seconds)
+
+    def _load_snapshot(self) -> bool:
+        if self.snapshot_path is None or not self.snapshot_path.exists():
+            return False
+        try:
+            snapshot = loads(self.snapshot_path.read_bytes())
+            if snapshot.get("version") != NOTES_SEARCH_SNAPSHOT_VERSION:
+                return False
+            loaded = NotesSearchIndex(self.load_notes, enabled=True, rebuild_seconds=0)
+            loaded._average_length = float(snapshot["averageLength"])
+            for doc_id, claim_id, note_id, content, length in snapshot["docs"]:
+                loaded._docs[doc_id] = (claim_id, note_id, content, length)
+                loaded._doc_ids[(claim_id, note_id)] = doc_id
+            for term, entries in snapshot["postings"].items():
+                for doc_id, *entry in entries:
+                    loaded._index(term, doc_id, tuple(entry))
+            loaded._next_doc_id = max(loaded._docs, default=-1) + 1
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        with self._lock:
+            self._adopt(loaded)
+            self._ready = True
+        self.counters.increment("snapshotsLoaded")
+        return True
+
+    def _save_snapshot(self) -> None:
+        if self.snapshot_path is None:
+            return
+        with self._lock:
+            payload = dumps(
+                {
+                    "version": NOTES_SEARCH_SNAPSHOT_VERSION,
+                    "averageLength": self._average_length,
+                    "docs": [[doc_id, *doc] for doc_id, doc in self._docs.items()],
+                    "postings": {
+                        term: [[doc_id, *entry] for doc_id, entry in posting.items()]
+                        for term, posting in self._postings.items()
+                    },
+                }
+            )
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "wb",
+            dir=self.snapshot_path.parent,
+            prefix=self.snapshot_path.name,
+            delete=False,
+        ) as file:
+            file.write(payload)
+        os.replace(file.name, self.snapshot_path)
+
+
+def _index_terms(tokens: list[str]) -> list[str]:
+    return [token for token in tokens if token not in STOP_WORDS]
+
+
+def _phrase_terms(phrase: str) -> list[tuple[int, str]]:
+    """(offset from the first indexed word, term) of each indexed word."""
+    words = [
+        (position, token)
+        for position, token in enumerate(tokenize(phrase))
+        if token not in STOP_WORDS
+    ]
+    if not words:
+        return []
+    return [(position - words[0][0], token) for position, token in words]
+
+
+def _matches_phrase(
+    postings: dict[str, Posting | None],
+    doc_id: int,
+    phrase: list[tuple[int, str]],
+) -> bool:
+    positions = []
+    for _, term in phrase:
+        entry = postings[term].get(doc_id)
+        if entry is None:
+            return False
+        positions.append(entry[1:])
+    following = [
+        (offset, set(term_positions))
+        for (offset, _), term_positions in zip(phrase[1:], positions[1:])
+    ]
+    return any(
+        all(start + offset in term_positions for offset, term_positions in following)
+        for start in positions[0]
+    )
+
+
+def _idf(doc_count: int, matching: int) -> float:
+    return math.log(1 + (doc_count - matching + 0.5) / (matching + 0.5))
+
+
+class _LevelCursor:
+    """Walks one term's notes from the highest impact level down."""
+
+    def __init__(
+        self,
+        lock: threading.RLock,
+        levels: dict[int, dict[int, None]],
+        weight: float,
+    ) -> None:
+        self.weight = weight
+        self._lock = lock
+        self._levels = levels
+        self._pending_levels = sorted(levels, reverse=True)
+        self._doc_ids: list[int] = []
+        self.level = self._pending_levels[0] if self._pending_levels else 0
+
+    def next(self) -> int | None:
+        while not self._doc_ids:
+            if not self._pending_levels:
+                self.level = 0
+                return None
+            self.level = self._pending_levels.pop(0)
+            with self._lock:
+                self._doc_ids = list(self._levels.get(self.level, ()))
+        return self._doc_ids.pop()
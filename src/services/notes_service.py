@@ -1,213 +1,680 @@
 import json
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+from urllib.parse import quote
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import HTTPException
 
+from src.services.aws_clients import AwsClientRegistry, get_aws_client_registry
+from src.services.cache import FetchResult, ReadThroughCache
+from src.services.local_store import open_local_store
+from src.services.notes_search import NotesSearchIndex
+from src.services.request_scope import forget_read, map_in_context, memoized_read
+from src.services.timing import timed
+from src.services.write_coalescer import Mutation, WriteCoalescer
+
+NOTES_S3_LAYOUT_SINGLE = "single"
+NOTES_S3_LAYOUT_PER_CLAIM = "per-claim"
+
+# Sort key of the per-claim item holding the last issued note number in the
+# DynamoDB notes table; it is never returned as a note.
+NOTES_COUNTER_SORT_KEY = "#counter"
+
+# A note write and its notesVersion bump share one transaction; transactions
+# on the same claim's counter item can cancel each other, so retry those.
+NOTES_TRANSACTION_MAX_ATTEMPTS = 5
+
+# Error codes S3 returns when a conditional PutObject loses a race.
+S3_CONDITIONAL_WRITE_CONFLICT_CODES = {
+    "PreconditionFailed",
+    "ConditionalRequestConflict",
+    "412",
+    "409",
+}
+
+
+def notes_shard_key(prefix: str, claim_id: str) -> str:
+    return f"{prefix}{quote(claim_id, safe='')}.json"
+
+
+def _cancellation_codes(error: ClientError) -> list[str]:
+    """Per-action reason codes of a cancelled DynamoDB transaction."""
+    if error.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+        return []
+    return [
+        reason.get("Code", "None")
+        for reason in error.response.get("CancellationReasons", [])
+    ]
+
 
 class NotesService:
-    def __init__(self, project_root: Path) -> None:
+    def __init__(
+        self, project_root: Path, aws_clients: AwsClientRegistry | None = None
+    ) -> None:
         self.mocks_dir = project_root / "mocks"
         self.notes_file = self.mocks_dir / "notes.json"
         self.aws_region = os.getenv("AWS_REGION", "us-east-1")
+        self.notes_table_name = os.getenv("NOTES_DYNAMODB_TABLE_NAME", "")
         self.notes_bucket_name = os.getenv("NOTES_S3_BUCKET_NAME", "")
         self.notes_s3_key = os.getenv("NOTES_S3_OBJECT_KEY", "notes.json")
+        self.notes_s3_layout = (
+            os.getenv("NOTES_S3_LAYOUT", NOTES_S3_LAYOUT_SINGLE).strip().lower()
+        )
+        self.notes_s3_prefix = os.getenv("NOTES_S3_PREFIX", "notes/")
+        if self.notes_s3_layout not in {
+            NOTES_S3_LAYOUT_SINGLE,
+            NOTES_S3_LAYOUT_PER_CLAIM,
+        }:
+            raise ValueError(
+                f"Unsupported NOTES_S3_LAYOUT: {self.notes_s3_layout}. "
+                f"Expected '{NOTES_S3_LAYOUT_SINGLE}' or '{NOTES_S3_LAYOUT_PER_CLAIM}'."
+            )
+        self.data_cache = ReadThroughCache.from_env()
+        self.local_notes = open_local_store(
+            self.notes_file, ("claimId", "noteId"), self.data_cache
+        )
+        self.aws_clients = aws_clients or get_aws_client_registry()
+        self.notes_s3_write_max_attempts = int(
+            os.getenv("NOTES_S3_WRITE_MAX_ATTEMPTS", "5")
+        )
+        self.s3_write_coalescer = WriteCoalescer.from_env(self._commit_s3_mutations)
+        self.batch_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("NOTES_BATCH_CONCURRENCY", "8")),
+            thread_name_prefix="notes-batch",
+        )
+        self.search_index = NotesSearchIndex.from_env(self.iter_all_notes)
+
+    def warm_up(self) -> None:
+        if self.notes_table_name:
+            self._dynamodb_table()
+        if self.notes_bucket_name:
+            self._s3_client()
+        self.search_index.start()
+
+    def search_notes(self, query: str, limit: int) -> list[dict[str, Any]]:
+        return self.search_index.search(query, limit)
+
+    def iter_all_notes(self) -> Iterator[dict[str, Any]]:
+        """Yield every note in the backend, for building the search index.
+
+        Unlike the per-claim reads this does not fall back to the local store
+        on errors, so a failing backend never replaces the index with mock data.
+        """
+        if self.notes_table_name:
+            scan: dict[str, Any] = {}
+            while True:
+                response = self._dynamodb_table().scan(**scan)
+                for item in response["Items"]:
+                    if item.get("noteId") != NOTES_COUNTER_SORT_KEY:
+                        yield self._map_dynamodb_note(item)
+                if "LastEvaluatedKey" not in response:
+                    return
+                scan["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        if self.notes_bucket_name and self.notes_s3_layout == NOTES_S3_LAYOUT_PER_CLAIM:
+            paginator = self._s3_client().get_paginator("list_objects_v2")
+            for page in paginator.paginate(
+                Bucket=self.notes_bucket_name, Prefix=self.notes_s3_prefix
+            ):
+                keys = [item["Key"] for item in page.get("Contents", [])]
+                # Read straight from S3 so a rebuild does not flush the cache.
+                for notes in self.batch_executor.map(self._read_notes_object, keys):
+                    yield from notes
+            return
+
+        if self.notes_bucket_name:
+            yield from self._load_notes_from_s3(self.notes_s3_key)
+            return
+
+        yield from self.local_notes.values()
 
     def list_notes_for_claim(self, claim_id: str) -> list[dict[str, Any]]:
+        return self.list_notes_for_claim_with_version(claim_id)[0]
+
+    def list_notes_for_claim_with_version(
+        self, claim_id: str
+    ) -> tuple[list[dict[str, Any]], str]:
+        """Return the claim's notes and the version token they were read at."""
+        return memoized_read(
+            ("notes", claim_id), lambda: self._load_notes_for_claim(claim_id)
+        )
+
+    def notes_version_for_claim(self, claim_id: str) -> str:
+        """Return the current version token of the claim's notes without loading them.
+
+        The token changes whenever the notes change and matches the one returned
+        by ``list_notes_for_claim_with_version`` for the same data. It is read
+        from the same backend the notes would be loaded from: the counter item in
+        DynamoDB, the object's ETag in S3 (``HeadObject``), or the local store.
+        """
+        if self.notes_table_name:
+            try:
+                response = self._dynamodb_table().get_item(
+                    Key={"claimId": claim_id, "noteId": NOTES_COUNTER_SORT_KEY},
+                    ProjectionExpression="notesVersion",
+                )
+                return self._dynamodb_notes_version(response.get("Item"))
+            except (ClientError, BotoCoreError):
+                pass
+
+        if self.notes_bucket_name:
+            try:
+                response = self._s3_client().head_object(
+                    Bucket=self.notes_bucket_name, Key=self._notes_s3_key(claim_id)
+                )
+                return f"s3:{response.get('ETag') or ''}"
+            except ClientError as error:
+                if error.response.get("Error", {}).get("Code") in {
+                    "404",
+                    "NoSuchKey",
+                    "NotFound",
+                }:
+                    return "s3:"
+            except BotoCoreError:
+                pass
+
+        return f"local:{self.local_notes.version()}"
+
+    def list_notes_for_claims(
+        self, claim_ids: list[str]
+    ) -> dict[str, list[dict[str, Any]]]:
+        if self.notes_table_name or (
+            self.notes_bucket_name and self.notes_s3_layout == NOTES_S3_LAYOUT_PER_CLAIM
+        ):
+            # Notes are stored per claim, so load the claims in parallel.
+            return dict(
+                zip(
+                    claim_ids,
+                    map_in_context(
+                        self.batch_executor, self.list_notes_for_claim, claim_ids
+                    ),
+                )
+            )
+
+        # Every claim's notes live in one document; one load serves the batch.
+        notes_by_claim: dict[str, list[dict[str, Any]]] = {
+            claim_id: [] for claim_id in claim_ids
+        }
+        for note in self._load_all_notes():
+            claim_notes = notes_by_claim.get(note.get("claimId"))
+            if claim_notes is not None:
+                claim_notes.append(note)
+        return notes_by_claim
+
+    def _load_all_notes(self) -> list[dict[str, Any]]:
         if self.notes_bucket_name:
             try:
-                notes = self._load_notes_from_s3()
-                return [item for item in notes if item.get("claimId") == claim_id]
+                return self._load_notes_from_s3(self.notes_s3_key)
+            except (ClientError, BotoCoreError):
+                pass
+        return self.local_notes.values()
+
+    def _load_notes_for_claim(self, claim_id: str) -> tuple[list[dict[str, Any]], str]:
+        if self.notes_table_name:
+            try:
+                return self._query_notes_from_dynamodb(claim_id)
+            except (ClientError, BotoCoreError):
+                pass
+
+        if self.notes_bucket_name:
+            try:
+                notes, etag = self._load_notes_and_etag_from_s3(
+                    self._notes_s3_key(claim_id)
+                )
+                return (
+                    [item for item in notes if item.get("claimId") == claim_id],
+                    f"s3:{etag or ''}",
+                )
             except (ClientError, BotoCoreError):
                 pass
 
-        notes = self._load_json(self.notes_file)
-        return [item for item in notes if item.get("claimId") == claim_id]
+        # Read the version first: if the notes change in between, the token is
+        # older than the data and the next conditional request gets a fresh copy.
+        version = f"local:{self.local_notes.version()}"
+        return self.local_notes.values_for(claim_id), version
 
     def add_note_to_claim(self, claim_id: str, content: str) -> dict[str, Any]:
+        note = self._add_note_to_claim(claim_id, content)
+        self.search_index.add_note(note)
+        return note
+
+    def update_note_for_claim(
+        self, claim_id: str, note_id: str, content: str
+    ) -> dict[str, Any]:
+        note = self._update_note_for_claim(claim_id, note_id, content)
+        self.search_index.add_note(note)
+        return note
+
+    def delete_note_for_claim(self, claim_id: str, note_id: str) -> dict[str, Any]:
+        result = self._delete_note_for_claim(claim_id, note_id)
+        self.search_index.remove_note(claim_id, note_id)
+        return result
+
+    def _add_note_to_claim(self, claim_id: str, content: str) -> dict[str, Any]:
+        # Later reads in this request must see the change.
+        forget_read(("notes", claim_id))
         normalized_content = content.strip()
         if not normalized_content:
             raise HTTPException(status_code=400, detail="Note content is required")
 
-        if self.notes_bucket_name:
+        if self.notes_table_name:
             try:
-                note_id = self._next_note_id(self.list_notes_for_claim(claim_id))
+                return self._put_note_to_dynamodb(claim_id, normalized_content)
+            except (ClientError, BotoCoreError) as error:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to write note to DynamoDB: {error}",
+                ) from error
+
+        if self.notes_bucket_name:
+
+            def add_note(notes: list[dict[str, Any]]) -> dict[str, Any]:
                 note = {
                     "claimId": claim_id,
-                    "noteId": note_id,
+                    "noteId": self._next_note_id(
+                        [item for item in notes if item.get("claimId") == claim_id]
+                    ),
                     "content": normalized_content,
                 }
-                notes = self._load_notes_from_s3()
                 notes.append(note)
-                self._write_notes_to_s3(notes)
                 return note
-            except HTTPException:
-                raise
-            except (ClientError, BotoCoreError) as error:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to write note to S3: {error}",
-                ) from error
 
-        notes = self._load_json(self.notes_file)
-        note = {
-            "claimId": claim_id,
-            "noteId": self._next_note_id(notes),
-            "content": normalized_content,
-        }
-        notes.append(note)
-        self._write_json(self.notes_file, notes)
+            return self._mutate_notes_in_s3(
+                claim_id, add_note, "Failed to write note to S3"
+            )
+
+        with self.local_notes.locked():
+            note = {
+                "claimId": claim_id,
+                "noteId": self._next_note_id(self.local_notes.values_for(claim_id)),
+                "content": normalized_content,
+            }
+            self.local_notes.put(note)
         return note
 
-    def update_note_for_claim(
+    def _update_note_for_claim(
         self, claim_id: str, note_id: str, content: str
     ) -> dict[str, Any]:
+        # Later reads in this request must see the change.
+        forget_read(("notes", claim_id))
         normalized_content = content.strip()
         if not normalized_content:
             raise HTTPException(status_code=400, detail="Note content is required")
 
+        if self.notes_table_name:
+            return self._update_note_in_dynamodb(claim_id, note_id, normalized_content)
+
         if self.notes_bucket_name:
-            notes = self._load_notes_from_s3()
-            note_index = next(
-                (
-                    index
-                    for index, item in enumerate(notes)
-                    if item.get("claimId") == claim_id and item.get("noteId") == note_id
-                ),
-                -1,
-            )
-            if note_index == -1:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Note not found: {note_id} for claim {claim_id}",
-                )
 
-            try:
-                notes[note_index]["content"] = normalized_content
-                self._write_notes_to_s3(notes)
+            def update_note(notes: list[dict[str, Any]]) -> dict[str, Any]:
+                note_index = self._find_note_index_or_404(notes, claim_id, note_id)
+                notes[note_index] = {**notes[note_index], "content": normalized_content}
                 return notes[note_index]
-            except (ClientError, BotoCoreError) as error:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to update note in S3: {error}",
-                ) from error
 
-        notes = self._load_json(self.notes_file)
-        note_index = next(
-            (
-                index
-                for index, item in enumerate(notes)
-                if item.get("claimId") == claim_id and item.get("noteId") == note_id
-            ),
-            -1,
-        )
-        if note_index == -1:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Note not found: {note_id} for claim {claim_id}",
+            return self._mutate_notes_in_s3(
+                claim_id, update_note, "Failed to update note in S3"
             )
 
-        notes[note_index]["content"] = normalized_content
-        self._write_json(self.notes_file, notes)
-        return notes[note_index]
-
-    def delete_note_for_claim(self, claim_id: str, note_id: str) -> dict[str, Any]:
-        if self.notes_bucket_name:
-            notes = self._load_notes_from_s3()
-            note_index = next(
-                (
-                    index
-                    for index, item in enumerate(notes)
-                    if item.get("claimId") == claim_id and item.get("noteId") == note_id
-                ),
-                -1,
-            )
-            if note_index == -1:
+        with self.local_notes.locked():
+            note = self.local_notes.get((claim_id, note_id))
+            if note is None:
                 raise HTTPException(
                     status_code=404,
                     detail=f"Note not found: {note_id} for claim {claim_id}",
                 )
 
-            try:
+            note = {**note, "content": normalized_content}
+            self.local_notes.put(note)
+        return note
+
+    def _delete_note_for_claim(self, claim_id: str, note_id: str) -> dict[str, Any]:
+        # Later reads in this request must see the change.
+        forget_read(("notes", claim_id))
+        if self.notes_table_name:
+            self._delete_note_from_dynamodb(claim_id, note_id)
+            return {"deleted": True, "claimId": claim_id, "noteId": note_id}
+
+        if self.notes_bucket_name:
+
+            def delete_note(notes: list[dict[str, Any]]) -> dict[str, Any]:
+                note_index = self._find_note_index_or_404(notes, claim_id, note_id)
                 deleted_note = notes.pop(note_index)
-                self._write_notes_to_s3(notes)
                 return {
                     "deleted": True,
                     "claimId": claim_id,
                     "noteId": deleted_note.get("noteId"),
                 }
-            except (ClientError, BotoCoreError) as error:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to delete note from S3: {error}",
-                ) from error
 
-        notes = self._load_json(self.notes_file)
-        note_index = next(
-            (
-                index
-                for index, item in enumerate(notes)
-                if item.get("claimId") == claim_id and item.get("noteId") == note_id
-            ),
-            -1,
-        )
-        if note_index == -1:
+            return self._mutate_notes_in_s3(
+                claim_id, delete_note, "Failed to delete note from S3"
+            )
+
+        deleted_note = self.local_notes.delete((claim_id, note_id))
+        if deleted_note is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Note not found: {note_id} for claim {claim_id}",
             )
 
-        deleted_note = notes.pop(note_index)
-        self._write_json(self.notes_file, notes)
         return {
             "deleted": True,
             "claimId": claim_id,
             "noteId": deleted_note.get("noteId"),
         }
 
-    def _load_json(self, path: Path) -> list[dict[str, Any]]:
-        if not path.exists():
-            raise HTTPException(
-                status_code=500, detail=f"Data file not found: {path.name}"
-            )
-        with path.open("r", encoding="utf-8") as file:
-            return json.load(file)
+    def _dynamodb_table(self):
+        return self.aws_clients.dynamodb_table(self.notes_table_name, self.aws_region)
 
-    def _write_json(self, path: Path, data: list[dict[str, Any]]) -> None:
-        with path.open("w", encoding="utf-8") as file:
-            json.dump(data, file, indent=4)
+    def _query_notes_from_dynamodb(
+        self, claim_id: str
+    ) -> tuple[list[dict[str, Any]], str]:
+        # The counter item is read with the notes so the version matches them.
+        query = {
+            "KeyConditionExpression": "claimId = :claimId",
+            "ExpressionAttributeValues": {":claimId": claim_id},
+        }
+        notes: list[dict[str, Any]] = []
+        counter: dict[str, Any] | None = None
+        while True:
+            response = self._dynamodb_table().query(**query)
+            for item in response["Items"]:
+                if item.get("noteId") == NOTES_COUNTER_SORT_KEY:
+                    counter = item
+                else:
+                    notes.append(self._map_dynamodb_note(item))
+            if "LastEvaluatedKey" not in response:
+                break
+            query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
 
-    def _s3_client(self):
-        return boto3.client("s3", region_name=self.aws_region)
+        # Sort keys compare as strings, which puts N-1000 before N-200.
+        notes.sort(key=self._note_id_sort_key)
+        return notes, self._dynamodb_notes_version(counter)
 
-    def _load_notes_from_s3(self) -> list[dict[str, Any]]:
+    def _dynamodb_notes_version(self, counter: dict[str, Any] | None) -> str:
+        return f"dynamodb:{int((counter or {}).get('notesVersion', 0))}"
+
+    def _write_note_to_dynamodb(
+        self, claim_id: str, operation: str, parameters: dict[str, Any]
+    ) -> None:
+        """Apply one ``Put``/``Update``/``Delete`` to a note and bump the claim's
+        ``notesVersion`` in the same transaction, so readers never see one
+        without the other."""
+        table = self._dynamodb_table()
+        for attempt in range(NOTES_TRANSACTION_MAX_ATTEMPTS):
+            try:
+                # The resource's client accepts plain Python values.
+                table.meta.client.transact_write_items(
+                    TransactItems=[
+                        {operation: {"TableName": self.notes_table_name, **parameters}},
+                        {
+                            "Update": {
+                                "TableName": self.notes_table_name,
+                                "Key": {
+                                    "claimId": claim_id,
+                                    "noteId": NOTES_COUNTER_SORT_KEY,
+                                },
+                                "UpdateExpression": "ADD notesVersion :one",
+                                "ExpressionAttributeValues": {":one": 1},
+                            }
+                        },
+                    ]
+                )
+                return
+            except ClientError as error:
+                if (
+                    "TransactionConflict" not in _cancellation_codes(error)
+                    or attempt == NOTES_TRANSACTION_MAX_ATTEMPTS - 1
+                ):
+                    raise
+            time.sleep(random.uniform(0, min(0.02 * 2**attempt, 0.5)))
+
+    def _put_note_to_dynamodb(self, claim_id: str, content: str) -> dict[str, Any]:
+        while True:
+            response = self._dynamodb_table().update_item(
+                Key={"claimId": claim_id, "noteId": NOTES_COUNTER_SORT_KEY},
+                UpdateExpression="ADD lastNoteNumber :one",
+                ExpressionAttributeValues={":one": 1},
+                ReturnValues="UPDATED_NEW",
+            )
+            note = {
+                "claimId": claim_id,
+                "noteId": f"N-{int(response['Attributes']['lastNoteNumber']):03d}",
+                "content": content,
+            }
+            try:
+                self._write_note_to_dynamodb(
+                    claim_id,
+                    "Put",
+                    {
+                        "Item": note,
+                        "ConditionExpression": "attribute_not_exists(noteId)",
+                    },
+                )
+                return note
+            except ClientError as error:
+                # A note imported without advancing the counter already uses
+                # this number; take the next one.
+                if _cancellation_codes(error)[:1] != ["ConditionalCheckFailed"]:
+                    raise
+
+    def _update_note_in_dynamodb(
+        self, claim_id: str, note_id: str, content: str
+    ) -> dict[str, Any]:
+        if note_id == NOTES_COUNTER_SORT_KEY:
+            # The counter item is not a note, and a transaction cannot write
+            # the same item twice.
+            raise HTTPException(
+                status_code=404,
+                detail=f"Note not found: {note_id} for claim {claim_id}",
+            )
         try:
-            response = self._s3_client().get_object(
-                Bucket=self.notes_bucket_name,
-                Key=self.notes_s3_key,
+            self._write_note_to_dynamodb(
+                claim_id,
+                "Update",
+                {
+                    "Key": {"claimId": claim_id, "noteId": note_id},
+                    "UpdateExpression": "SET content = :content",
+                    "ConditionExpression": "attribute_exists(noteId)",
+                    "ExpressionAttributeValues": {":content": content},
+                },
             )
-            raw = response["Body"].read().decode("utf-8")
-            data = json.loads(raw)
-            if isinstance(data, list):
-                return data
-            return []
+            return {"claimId": claim_id, "noteId": note_id, "content": content}
         except ClientError as error:
-            code = error.response.get("Error", {}).get("Code", "")
-            if code in {"NoSuchKey", "NoSuchBucket"}:
-                return []
-            raise
-
-    def _write_notes_to_s3(self, notes: list[dict[str, Any]]) -> None:
-        payload = json.dumps(notes, indent=4).encode("utf-8")
-        self._s3_client().put_object(
+            if _cancellation_codes(error)[:1] == ["ConditionalCheckFailed"]:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Note not found: {note_id} for claim {claim_id}",
+                ) from error
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to update note in DynamoDB: {error}",
+            ) from error
+        except BotoCoreError as error:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to update note in DynamoDB: {error}",
+            ) from error
+
+    def _delete_note_from_dynamodb(self, claim_id: str, note_id: str) -> None:
+        if note_id == NOTES_COUNTER_SORT_KEY:
+            # The counter item is not a note, and a transaction cannot write
+            # the same item twice.
+            raise HTTPException(
+                status_code=404,
+                detail=f"Note not found: {note_id} for claim {claim_id}",
+            )
+        try:
+            self._write_note_to_dynamodb(
+                claim_id,
+                "Delete",
+                {
+                    "Key": {"claimId": claim_id, "noteId": note_id},
+                    "ConditionExpression": "attribute_exists(noteId)",
+                },
+            )
+        except ClientError as error:
+            if _cancellation_codes(error)[:1] == ["ConditionalCheckFailed"]:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Note not found: {note_id} for claim {claim_id}",
+                ) from error
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to delete note from DynamoDB: {error}",
+            ) from error
+        except BotoCoreError as error:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to delete note from DynamoDB: {error}",
+            ) from error
+
+    def _map_dynamodb_note(self, item: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "claimId": item.get("claimId"),
+            "noteId": item.get("noteId"),
+            "content": item.get("content"),
+        }
+
+    def _note_id_sort_key(self, note: dict[str, Any]) -> tuple[int, str]:
+        note_id = str(note.get("noteId", ""))
+        numeric_part = note_id[2:] if note_id.startswith("N-") else ""
+        return (int(numeric_part) if numeric_part.isdigit() else 0, note_id)
+
+    def _s3_client(self):
+        return self.aws_clients.client("s3", self.aws_region)
+
+    def _notes_s3_key(self, claim_id: str) -> str:
+        if self.notes_s3_layout == NOTES_S3_LAYOUT_PER_CLAIM:
+            return notes_shard_key(self.notes_s3_prefix, claim_id)
+        return self.notes_s3_key
+
+    def _load_notes_from_s3(self, key: str) -> list[dict[str, Any]]:
+        return self._load_notes_and_etag_from_s3(key)[0]
+
+    def _read_notes_object(self, key: str) -> list[dict[str, Any]]:
+        response = self._s3_client().get_object(Bucket=self.notes_bucket_name, Key=key)
+        data = json.loads(response["Body"].read().decode("utf-8"))
+        return data if isinstance(data, list) else []
+
+    def _load_notes_and_etag_from_s3(
+        self, key: str
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        def fetch(previous_etag: str | None) -> FetchResult:
+            request = {"Bucket": self.notes_bucket_name, "Key": key}
+            if previous_etag:
+                request["IfNoneMatch"] = previous_etag
+            try:
+                response = self._s3_client().get_object(**request)
+            except ClientError as error:
+                code = error.response.get("Error", {}).get("Code", "")
+                status = error.response.get("ResponseMetadata", {}).get(
+                    "HTTPStatusCode"
+                )
+                if previous_etag and (code in {"304", "NotModified"} or status == 304):
+                    return None
+                if code in {"NoSuchKey", "NoSuchBucket"}:
+                    return [], None
+                raise
+
+            # The body is streamed after GetObject returns, so it is timed here.
+            with timed("s3-body-read"):
+                raw = response["Body"].read().decode("utf-8")
+            with timed("notes-json-parse"):
+                data = json.loads(raw)
+            return (data if isinstance(data, list) else []), response.get("ETag")
+
+        notes, etag = self.data_cache.get_with_tag(f"s3:{key}", fetch)
+        return list(notes), etag
+
+    def _write_notes_to_s3(
+        self, key: str, notes: list[dict[str, Any]], expected_etag: str | None
+    ) -> None:
+        if self.notes_s3_layout == NOTES_S3_LAYOUT_PER_CLAIM:
+            payload = json.dumps(notes, separators=(",", ":")).encode("utf-8")
+        else:
+            payload = json.dumps(notes, indent=4).encode("utf-8")
+        # Only replace the version that was read; create only if still absent.
+        condition = (
+            {"IfMatch": expected_etag} if expected_etag else {"IfNoneMatch": "*"}
+        )
+        response = self._s3_client().put_object(
             Bucket=self.notes_bucket_name,
-            Key=self.notes_s3_key,
+            Key=key,
             Body=payload,
             ContentType="application/json",
+            **condition,
         )
+        self.data_cache.put(f"s3:{key}", notes, response.get("ETag"))
+
+    def _mutate_notes_in_s3(
+        self, claim_id: str, mutation: Mutation, failure_detail: str
+    ) -> dict[str, Any]:
+        try:
+            return self.s3_write_coalescer.submit(
+                self._notes_s3_key(claim_id), mutation
+            )
+        except (ClientError, BotoCoreError) as error:
+            raise HTTPException(
+                status_code=500, detail=f"{failure_detail}: {error}"
+            ) from error
+
+    def _commit_s3_mutations(self, key: str, mutations: list[Mutation]) -> list[Any]:
+        """Apply a batch of note mutations to one S3 object with a single PUT.
+
+        The PUT is conditional on the ETag that was read. When another writer
+        got there first, the object is re-read and every mutation is re-applied.
+        """
+        for _ in range(self.notes_s3_write_max_attempts):
+            notes, etag = self._load_notes_and_etag_from_s3(key)
+            outcomes: list[Any] = []
+            for mutation in mutations:
+                try:
+                    outcomes.append(mutation(notes))
+                except HTTPException as error:
+                    outcomes.append(error)
+
+            if all(isinstance(outcome, HTTPException) for outcome in outcomes):
+                return outcomes
+
+            try:
+                self._write_notes_to_s3(key, notes, etag)
+                return outcomes
+            except ClientError as error:
+                if (
+                    error.response.get("Error", {}).get("Code")
+                    not in S3_CONDITIONAL_WRITE_CONFLICT_CODES
+                ):
+                    raise
+                # The cached copy is stale; force the next read to go to S3.
+                self.data_cache.invalidate(f"s3:{key}")
+
+        raise HTTPException(
+            status_code=409,
+            detail="Notes were modified concurrently; please retry",
+        )
+
+    def _find_note_index_or_404(
+        self, notes: list[dict[str, Any]], claim_id: str, note_id: str
+    ) -> int:
+        note_index = next(
+            (
+                index
+                for index, item in enumerate(notes)
+                if item.get("claimId") == claim_id and item.get("noteId") == note_id
+            ),
+            -1,
+        )
+        if note_index == -1:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Note not found: {note_id} for claim {claim_id}",
+            )
+        return note_index
 
     def _next_note_id(self, notes: list[dict[str, Any]]) -> str:
         max_numeric_id = 0
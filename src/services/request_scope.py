@@ -0,0 +1,67 @@
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Hashable, Iterable, Iterator, TypeVar
+
+from src.services.metrics import CounterSet
+
+T = TypeVar("T")
+
+# Memo of backend reads made while handling the current request. It is None
+# outside a request, so background work and tools always read through.
+_request_reads: ContextVar[dict[Hashable, Any] | None] = ContextVar(
+    "request_reads", default=None
+)
+
+request_read_counters = CounterSet("hits", "misses")
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    token = _request_reads.set({})
+    try:
+        yield
+    finally:
+        _request_reads.reset(token)
+
+
+def memoized_read(key: Hashable, load: Callable[[], T]) -> T:
+    """Return the value already read for ``key`` in this request, or load it.
+
+    Failed loads are not memoized, so a 404 is raised again on the next call.
+    """
+    reads = _request_reads.get()
+    if reads is None:
+        return load()
+    if key in reads:
+        request_read_counters.increment("hits")
+        return reads[key]
+
+    request_read_counters.increment("misses")
+    value = load()
+    reads[key] = value
+    return value
+
+
+def forget_read(key: Hashable) -> None:
+    reads = _request_reads.get()
+    if reads is not None:
+        reads.pop(key, None)
+
+
+def submit_in_context(
+    executor: Executor, function: Callable[..., T], /, *args: Any, **kwargs: Any
+) -> Future:
+    """``executor.submit`` that runs ``function`` in a copy of the caller's context.
+
+    Pool threads do not inherit context variables, so without this the request's
+    memoized reads and dependency timings would not reach them.
+    """
+    return executor.submit(copy_context().run, function, *args, **kwargs)
+
+
+def map_in_context(
+    executor: Executor, function: Callable[[Any], T], items: Iterable[Any]
+) -> list[T]:
+    futures = [submit_in_context(executor, function, item) for item in items]
+    return [future.result() for future in futures]
@@ -0,0 +1,446 @@
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from fastapi import HTTPException
+
+from src.services.claims_service import (
+    CLAIMS_PAGE_MAX_LIMIT,
+    ClaimsService,
+    SummaryWrite,
+)
+from src.services.metrics import CounterSet
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+CLAIM_SUMMARIZED = "summarized"
+CLAIM_UNCHANGED = "unchanged"
+CLAIM_FAILED = "failed"
+
+# Finished jobs kept for GET /summaries/jobs/{id}; older ones are forgotten.
+SUMMARY_JOBS_RETAINED = 100
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+@dataclass
+class SummaryJob:
+    id: str
+    force: bool
+    status_filter: str | None = None
+    claim_ids: list[str] | None = None
+    state: str = JOB_QUEUED
+    truncated: bool = False
+    error: str | None = None
+    created_at: str = field(default_factory=_utc_now)
+    started_at: str | None = None
+    finished_at: str | None = None
+    # Claim ID -> {"status": ..., "detail": ...}, in completion order.
+    results: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in {JOB_SUCCEEDED, JOB_FAILED}
+
+    def progress(self) -> dict[str, Any]:
+        counts = {CLAIM_SUMMARIZED: 0, CLAIM_UNCHANGED: 0, CLAIM_FAILED: 0}
+        for result in self.results.values():
+            counts[result["status"]] += 1
+        total = len(self.claim_ids) if self.claim_ids is not None else None
+        return {
+            "jobId": self.id,
+            "state": self.state,
+            "force": self.force,
+            "status": self.status_filter,
+            "total": total,
+            **counts,
+            "pending": total - len(self.results) if total is not None else None,
+            "truncated": self.truncated,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **self.progress(),
+            "results": [
+                {"claimId": claim_id, **result}
+                for claim_id, result in self.results.items()
+            ],
+        }
+
+    def to_checkpoint(self) -> dict[str, Any]:
+        return {**self.to_dict(), "claimIds": self.claim_ids}
+
+    @classmethod
+    def from_checkpoint(cls, data: dict[str, Any]) -> "SummaryJob":
+        return cls(
+            id=data["jobId"],
+            force=data["force"],
+            status_filter=data.get("status"),
+            claim_ids=data.get("claimIds"),
+            state=data["state"],
+            truncated=data.get("truncated", False),
+            error=data.get("error"),
+            created_at=data["createdAt"],
+            started_at=data.get("startedAt"),
+            finished_at=data.get("finishedAt"),
+            results={
+                result["claimId"]: {
+                    key: value for key, value in result.items() if key != "claimId"
+                }
+                for result in data.get("results", [])
+            },
+        )
+
+
+class RateLimiter:
+    """Spaces ``acquire`` calls at least ``1 / rate_per_second`` apart."""
+
+    def __init__(self, rate_per_second: float) -> None:
+        self.rate_per_second = rate_per_second
+        self.interval = 1 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        time.sleep(slot - now)
+
+
+class SummaryJobRunner:
+    """Runs batch summarization jobs in the background, one job at a time.
+
+    Jobs wait on an in-process queue. A dispatcher thread resolves each job's
+    claims (from its claim IDs or by paging through a status), then feeds them
+    to ``concurrency`` workers at no more than ``claims_per_second``. Workers
+    call ``ClaimsService.summarize_claim_or_404`` but hand generated summaries
+    back instead of writing them, and the dispatcher stores them
+    ``write_batch_size`` at a time through ``persist_summaries``.
+
+    With a ``checkpoint_dir`` every job is written there after each batch, and
+    unfinished jobs are resumed by ``start``, skipping claims that already have
+    a result. Without one, jobs only live in this process.
+    """
+
+    def __init__(
+        self,
+        claims_service: ClaimsService,
+        concurrency: int,
+        claims_per_second: float,
+        write_batch_size: int,
+        max_claims: int,
+        checkpoint_dir: Path | None = None,
+    ) -> None:
+        self.claims_service = claims_service
+        self.concurrency = max(concurrency, 1)
+        self.rate_limiter = RateLimiter(claims_per_second)
+        self.write_batch_size = max(write_batch_size, 1)
+        self.max_claims = max(max_claims, 1)
+        self.checkpoint_dir = checkpoint_dir
+        self.counters = CounterSet(
+            "jobsSubmitted",
+            "jobsSucceeded",
+            "jobsFailed",
+            CLAIM_SUMMARIZED,
+            CLAIM_UNCHANGED,
+            CLAIM_FAILED,
+            "writeBatches",
+        )
+        self._jobs: OrderedDict[str, SummaryJob] = OrderedDict()
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._dispatcher: threading.Thread | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="summary-jobs"
+        )
+
+    @classmethod
+    def from_env(cls, claims_service: ClaimsService) -> "SummaryJobRunner":
+        checkpoint_dir = os.getenv("SUMMARY_JOBS_CHECKPOINT_DIR", "").strip()
+        return cls(
+            claims_service,
+            concurrency=int(os.getenv("SUMMARY_JOBS_CONCURRENCY", "2")),
+            claims_per_second=float(os.getenv("SUMMARY_JOBS_CLAIMS_PER_SECOND", "2")),
+            write_batch_size=int(os.getenv("SUMMARY_JOBS_WRITE_BATCH_SIZE", "25")),
+            max_claims=int(os.getenv("SUMMARY_JOBS_MAX_CLAIMS", "10000")),
+            checkpoint_dir=Path(checkpoint_dir) if checkpoint_dir else None,
+        )
+
+    def start(self) -> None:
+        if self._dispatcher is not None:
+            return
+        if self.checkpoint_dir is not None:
+            self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            self._resume_checkpointed_jobs()
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="summary-jobs-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop after the claims in flight; an interrupted job is checkpointed
+        as queued so that the next ``start`` resumes it."""
+        self._stopping.set()
+        self._queue.put(None)
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout)
+        self._executor.shutdown(wait=False)
+
+    def submit(
+        self,
+        claim_ids: list[str] | None = None,
+        status: str | None = None,
+        force: bool = False,
+    ) -> dict[str, Any]:
+        if (claim_ids is None) == (status is None):
+            raise HTTPException(
+                status_code=400, detail="Provide either claimIds or status"
+            )
+        if claim_ids is not None:
+            claim_ids = list(dict.fromkeys(claim_id.strip() for claim_id in claim_ids))
+            if not claim_ids or not all(claim_ids):
+                raise HTTPException(
+                    status_code=400, detail="claimIds must be non-empty IDs"
+                )
+            if len(claim_ids) > self.max_claims:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"At most {self.max_claims} claims per job",
+                )
+
+        job = SummaryJob(
+            id=uuid.uuid4().hex,
+            force=force,
+            status_filter=status,
+            claim_ids=claim_ids,
+        )
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_finished_jobs()
+            snapshot = job.progress()
+        self._checkpoint(job)
+        self.counters.increment("jobsSubmitted")
+        self._queue.put(job.id)
+        return snapshot
+
+    def get_job_or_404(self, job_id: str) -> dict[str, Any]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise HTTPException(
+                    status_code=404, detail=f"Summary job not found: {job_id}"
+                )
+            return job.to_dict()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+        return {
+            **self.counters.snapshot(),
+            "queued": states.count(JOB_QUEUED),
+            "running": states.count(JOB_RUNNING),
+            "concurrency": self.concurrency,
+            "claimsPerSecond": self.rate_limiter.rate_per_second,
+        }
+
+    def _dispatch(self) -> None:
+        while not self._stopping.is_set():
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                continue
+            try:
+                self._run(job)
+            except HTTPException as error:
+                self._finish(job, JOB_FAILED, str(error.detail))
+            except Exception as error:
+                self._finish(job, JOB_FAILED, f"{type(error).__name__}: {error}")
+
+    def _run(self, job: SummaryJob) -> None:
+        with self._lock:
+            job.state = JOB_RUNNING
+            job.started_at = job.started_at or _utc_now()
+        if job.claim_ids is None:
+            claim_ids, truncated = self._claim_ids_with_status(job.status_filter)
+            with self._lock:
+                job.claim_ids, job.truncated = claim_ids, truncated
+        self._checkpoint(job)
+
+        completed: queue.Queue[tuple[str, SummaryWrite | None, str | None]] = (
+            queue.Queue()
+        )
+        slots = threading.BoundedSemaphore(self.concurrency)
+        writes: list[SummaryWrite] = []
+        outstanding = 0
+
+        def collect(block: bool) -> None:
+            nonlocal outstanding
+            while outstanding:
+                try:
+                    claim_id, write, error = completed.get(block=block)
+                except queue.Empty:
+                    return
+                outstanding -= 1
+                if write is not None:
+                    writes.append(write)
+                elif error is not None:
+                    self._record(job, claim_id, CLAIM_FAILED, error)
+                else:
+                    self._record(job, claim_id, CLAIM_UNCHANGED)
+                if len(writes) >= self.write_batch_size:
+                    self._flush(job, writes)
+
+        def release(done: Future) -> None:
+            slots.release()
+            completed.put(done.result())
+
+        for claim_id in job.claim_ids:
+            if self._stopping.is_set():
+                break
+            if claim_id in job.results:
+                continue
+            self.rate_limiter.acquire()
+            slots.acquire()
+            outstanding += 1
+            self._executor.submit(self._summarize, job, claim_id).add_done_callback(
+                release
+            )
+            collect(block=False)
+        collect(block=True)
+        self._flush(job, writes)
+
+        if self._stopping.is_set() and len(job.results) < len(job.claim_ids):
+            with self._lock:
+                job.state = JOB_QUEUED
+            self._checkpoint(job)
+            return
+        self._finish(job, JOB_SUCCEEDED)
+
+    def _summarize(
+        self, job: SummaryJob, claim_id: str
+    ) -> tuple[str, SummaryWrite | None, str | None]:
+        """(claim ID, summary to store or None if it was current, error)."""
+        generated: list[SummaryWrite] = []
+        try:
+            self.claims_service.summarize_claim_or_404(
+                claim_id,
+                force=job.force,
+                persist=lambda *write: generated.append(write),
+            )
+        except HTTPException as error:
+            return claim_id, None, str(error.detail)
+        except Exception as error:
+            return claim_id, None, f"{type(error).__name__}: {error}"
+        return claim_id, generated[0] if generated else None, None
+
+    def _flush(self, job: SummaryJob, writes: list[SummaryWrite]) -> None:
+        if writes:
+            self.counters.increment("writeBatches")
+            errors = self.claims_service.persist_summaries(writes)
+            for claim_id, error in errors.items():
+                if error is None:
+                    self._record(job, claim_id, CLAIM_SUMMARIZED)
+                else:
+                    self._record(job, claim_id, CLAIM_FAILED, str(error.detail))
+            writes.clear()
+        self._checkpoint(job)
+
+    def _record(
+        self,
+        job: SummaryJob,
+        claim_id: str,
+        status: str,
+        detail: str | None = None,
+    ) -> None:
+        result: dict[str, Any] = {"status": status}
+        if detail is not None:
+            result["detail"] = detail
+        with self._lock:
+            job.results[claim_id] = result
+        self.counters.increment(status)
+
+    def _finish(self, job: SummaryJob, state: str, error: str | None = None) -> None:
+        with self._lock:
+            job.state = state
+            job.error = error
+            job.finished_at = _utc_now()
+        self.counters.increment(
+            "jobsSucceeded" if state == JOB_SUCCEEDED else "jobsFailed"
+        )
+        self._checkpoint(job)
+
+    def _claim_ids_with_status(self, status: str) -> tuple[list[str], bool]:
+        """Claim IDs with ``status`` up to ``max_claims``, and whether more exist."""
+        claim_ids: list[str] = []
+        cursor = None
+        while True:
+            page = self.claims_service.list_claims_by_status(
+                status, CLAIMS_PAGE_MAX_LIMIT, cursor
+            )
+            claim_ids.extend(claim["id"] for claim in page["claims"])
+            cursor = page["nextCursor"]
+            if len(claim_ids) >= self.max_claims:
+                return claim_ids[: self.max_claims], bool(
+                    cursor or len(claim_ids) > self.max_claims
+                )
+            if not cursor:
+                return claim_ids, False
+
+    def _forget_finished_jobs(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(len(finished) - SUMMARY_JOBS_RETAINED, 0)]:
+            del self._jobs[job_id]
+            if self.checkpoint_dir is not None:
+                (self.checkpoint_dir / f"{job_id}.json").unlink(missing_ok=True)
+
+    def _checkpoint(self, job: SummaryJob) -> None:
+        if self.checkpoint_dir is None:
+            return
+        with self._lock:
+            payload = json.dumps(job.to_checkpoint()).encode("utf-8")
+        path = self.checkpoint_dir / f"{job.id}.json"
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=self.checkpoint_dir, prefix=path.name, delete=False
+        ) as file:
+            file.write(payload)
+        os.replace(file.name, path)
+
+    def _resume_checkpointed_jobs(self) -> None:
+        paths = sorted(
+            self.checkpoint_dir.glob("*.json"), key=lambda path: path.stat().st_mtime
+        )
+        for path in paths:
+            try:
+                job = SummaryJob.from_checkpoint(json.loads(path.read_bytes()))
+            except (OSError, ValueError, KeyError):
+                continue
+            self._jobs[job.id] = job
+            if not job.finished:
+                job.state = JOB_QUEUED
+                self._queue.put(job.id)
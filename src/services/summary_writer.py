@@ -0,0 +1,212 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from src.services.metrics import CounterSet
+
+# (claim ID, summary, summary metadata) of one generated summary to store.
+SummaryWrite = tuple[str, dict[str, str], dict[str, Any]]
+# Stores a batch of summaries and returns, per claim ID, None or the error.
+PersistBatch = Callable[[list[SummaryWrite]], dict[str, Exception | None]]
+
+
+@dataclass
+class _PendingSummary:
+    summary: dict[str, str]
+    metadata: dict[str, Any]
+    attempts: int = 0
+
+
+class SummaryWriteBehind:
+    """Stores generated summaries in the background instead of in the request.
+
+    ``submit`` queues a summary and returns at once; a newer summary for a claim
+    that is still queued replaces the older one. A flusher thread stores the
+    queue ``batch_size`` claims at a time with ``persist_batch``, as soon as a
+    batch is full or ``flush_interval_seconds`` after the oldest entry arrived.
+    Failed writes are retried up to ``max_attempts`` times unless a newer
+    summary arrived meanwhile. Queued and in-flight summaries are overlaid on
+    claims read by this process, so the API reads its own writes. Once
+    ``max_pending`` claims are queued, ``submit`` writes through instead.
+    """
+
+    def __init__(
+        self,
+        persist_batch: PersistBatch,
+        enabled: bool,
+        flush_interval_seconds: float,
+        batch_size: int,
+        max_pending: int,
+        max_attempts: int,
+    ) -> None:
+        self.persist_batch = persist_batch
+        self.enabled = enabled
+        self.flush_interval_seconds = max(flush_interval_seconds, 0.0)
+        self.batch_size = max(batch_size, 1)
+        self.max_pending = max(max_pending, 1)
+        self.max_attempts = max(max_attempts, 1)
+        self.counters = CounterSet(
+            "queued",
+            "coalesced",
+            "written",
+            "batches",
+            "retried",
+            "dropped",
+            "writeThrough",
+        )
+        self._pending: OrderedDict[str, _PendingSummary] = OrderedDict()
+        self._in_flight: dict[str, _PendingSummary] = {}
+        self._max_depth = 0
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._flusher: threading.Thread | None = None
+
+    @classmethod
+    def from_env(cls, persist_batch: PersistBatch) -> "SummaryWriteBehind":
+        return cls(
+            persist_batch,
+            enabled=os.getenv("SUMMARY_WRITE_BEHIND_ENABLED", "false").strip().lower()
+            in {"1", "true", "yes"},
+            flush_interval_seconds=float(
+                os.getenv("SUMMARY_WRITE_BEHIND_FLUSH_MS", "100")
+            )
+            / 1000,
+            batch_size=int(os.getenv("SUMMARY_WRITE_BEHIND_BATCH_SIZE", "25")),
+            max_pending=int(os.getenv("SUMMARY_WRITE_BEHIND_MAX_PENDING", "1000")),
+            max_attempts=int(os.getenv("SUMMARY_WRITE_BEHIND_MAX_ATTEMPTS", "3")),
+        )
+
+    def submit(
+        self, claim_id: str, summary: dict[str, str], metadata: dict[str, Any]
+    ) -> None:
+        entry = _PendingSummary(summary, metadata)
+        with self._condition:
+            # A claim with a write in flight is always queued so that its
+            # writes land in order.
+            if self._stopping or (
+                claim_id not in self._pending
+                and claim_id not in self._in_flight
+                and len(self._pending) >= self.max_pending
+            ):
+                write_through = True
+            else:
+                write_through = False
+                if self._pending.pop(claim_id, None) is not None:
+                    self.counters.increment("coalesced")
+                self._pending[claim_id] = entry
+                self._max_depth = max(self._max_depth, len(self._pending))
+                self.counters.increment("queued")
+                self._ensure_flusher()
+                if len(self._pending) >= self.batch_size:
+                    self._condition.notify()
+
+        if write_through:
+            # Backpressure: the caller pays for its own write and sees its error.
+            self.counters.increment("writeThrough")
+            error = self.persist_batch([(claim_id, summary, metadata)]).get(claim_id)
+            if error is not None:
+                raise error
+
+    def pending_summary(self, claim_id: str) -> dict[str, Any] | None:
+        """Attributes a queued or in-flight summary will set on the claim."""
+        with self._condition:
+            entry = self._pending.get(claim_id) or self._in_flight.get(claim_id)
+            if entry is None:
+                return None
+            return {**entry.metadata, "summary": entry.summary}
+
+    def overlay(self, claim: dict[str, Any]) -> dict[str, Any]:
+        if not self.enabled:
+            return claim
+        attributes = self.pending_summary(claim["id"])
+        if attributes is None:
+            return claim
+        return {
+            key: value
+            for key, value in {**claim, **attributes}.items()
+            if value is not None or key not in attributes
+        }
+
+    def flush(self) -> None:
+        """Write everything queued so far from the calling thread."""
+        while self._flush_batch(wait=False):
+            pass
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Drain the queue; later ``submit`` calls write through."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._flusher is not None:
+            self._flusher.join(timeout)
+        self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            depth, in_flight = len(self._pending), len(self._in_flight)
+            max_depth = self._max_depth
+        return {
+            **self.counters.snapshot(),
+            "enabled": self.enabled,
+            "depth": depth,
+            "inFlight": in_flight,
+            "maxDepth": max_depth,
+            "maxPending": self.max_pending,
+            "batchSize": self.batch_size,
+            "flushIntervalMs": self.flush_interval_seconds * 1000,
+        }
+
+    def _ensure_flusher(self) -> None:
+        # Callers hold the condition.
+        if self._flusher is None:
+            self._flusher = threading.Thread(
+                target=self._run, name="summary-write-behind", daemon=True
+            )
+            self._flusher.start()
+
+    def _run(self) -> None:
+        while self._flush_batch(wait=True):
+            pass
+
+    def _flush_batch(self, wait: bool) -> bool:
+        """Write one batch; False once there is nothing left to do."""
+        with self._condition:
+            if wait:
+                while not self._pending and not self._stopping:
+                    self._condition.wait()
+                if not self._stopping and len(self._pending) < self.batch_size:
+                    # Give the batch time to fill up.
+                    self._condition.wait(self.flush_interval_seconds)
+            if not self._pending:
+                return False
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                claim_id, entry = self._pending.popitem(last=False)
+                self._in_flight[claim_id] = entry
+                batch.append((claim_id, entry))
+
+        try:
+            errors = self.persist_batch(
+                [(claim_id, entry.summary, entry.metadata) for claim_id, entry in batch]
+            )
+        except Exception as error:
+            errors = {claim_id: error for claim_id, _ in batch}
+        self.counters.increment("batches")
+
+        with self._condition:
+            for claim_id, entry in batch:
+                self._in_flight.pop(claim_id, None)
+                if errors.get(claim_id) is None:
+                    self.counters.increment("written")
+                elif claim_id in self._pending:
+                    # A newer summary replaces the failed one.
+                    self.counters.increment("dropped")
+                elif entry.attempts + 1 < self.max_attempts:
+                    entry.attempts += 1
+                    self._pending[claim_id] = entry
+                    self.counters.increment("retried")
+                else:
+                    self.counters.increment("dropped")
+        return True
@@ -0,0 +1,204 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+from urllib.parse import urlsplit
+
+from src.services.metrics import CounterSet
+
+# Seconds spent per dependency while handling the current request, keyed by
+# names such as ``dynamodb.GetItem`` or ``summary-persist``. None outside a
+# request, so background work records nothing.
+_request_timings: ContextVar[dict[str, list[float]] | None] = ContextVar(
+    "request_timings", default=None
+)
+
+EMF_DESTINATION_STDOUT = "stdout"
+
+
+@contextmanager
+def timing_scope() -> Iterator[dict[str, list[float]]]:
+    timings: dict[str, list[float]] = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def record_timing(name: str, seconds: float) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.setdefault(name, []).append(seconds)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - started)
+
+
+def instrument_boto3_client(client: Any) -> None:
+    """Record the duration of every API call made through ``client``.
+
+    Calls are named ``<service>.<Operation>`` and include botocore's retries.
+    Streaming bodies (S3 objects, Bedrock streams) are read after the call
+    returns, so callers time those separately.
+    """
+    service_name = client.meta.service_model.service_name
+
+    def before_call(model: Any, context: dict[str, Any], **_: Any) -> None:
+        context["timing"] = (f"{service_name}.{model.name}", time.perf_counter())
+
+    def after_call(context: dict[str, Any], **_: Any) -> None:
+        name, started = context.pop("timing", (None, 0.0))
+        if name is not None:
+            record_timing(name, time.perf_counter() - started)
+
+    client.meta.events.register("before-call", before_call)
+    client.meta.events.register("after-call", after_call)
+    client.meta.events.register("after-call-error", after_call)
+
+
+def server_timing_header(timings: dict[str, list[float]], total: float) -> str:
+    # Calls made in parallel add up, so a dependency can exceed the total.
+    entries = [
+        f'{name};dur={sum(durations) * 1000:.1f};desc="calls={len(durations)}"'
+        for name, durations in timings.items()
+    ]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class EmfEmitter:
+    """Writes one CloudWatch Embedded Metric Format document per request.
+
+    Each document carries the request latency and every dependency's call
+    durations as metrics with a ``Route`` dimension, so CloudWatch keeps
+    per-route, per-dependency distributions (p50/p95/p99). ``destination`` is
+    ``stdout`` or ``udp://host:port`` / ``tcp://host:port`` of a CloudWatch
+    agent with the EMF listener enabled; an empty destination disables it.
+    Failed sends are counted and dropped so metrics never fail a request.
+    """
+
+    def __init__(self, destination: str, namespace: str) -> None:
+        self.destination = destination.strip()
+        self.namespace = namespace
+        self.counters = CounterSet("emitted", "dropped")
+        self._socket: socket.socket | None = None
+        self._address: tuple[Any, ...] | None = None
+        self._lock = threading.Lock()
+        if self.destination and self.destination != EMF_DESTINATION_STDOUT:
+            target = urlsplit(self.destination)
+            if target.scheme not in {"udp", "tcp"} or not target.hostname:
+                raise ValueError(
+                    f"Unsupported METRICS_EMF_DESTINATION: {self.destination}. "
+                    f"Expected '{EMF_DESTINATION_STDOUT}', 'udp://host:port' "
+                    "or 'tcp://host:port'."
+                )
+            self._scheme = target.scheme
+            self._host = target.hostname
+            self._port = target.port or 25888
+
+    @classmethod
+    def from_env(cls) -> "EmfEmitter":
+        return cls(
+            destination=os.getenv("METRICS_EMF_DESTINATION", ""),
+            namespace=os.getenv("METRICS_NAMESPACE", "ClaimStatusApi"),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.destination)
+
+    def emit(
+        self,
+        route: str,
+        status_code: int,
+        latency: float,
+        timings: dict[str, list[float]],
+    ) -> None:
+        if not self.enabled:
+            return
+        metrics = {"Latency": round(latency * 1000, 3)}
+        metrics.update(
+            {
+                name: [round(duration * 1000, 3) for duration in durations]
+                for name, durations in timings.items()
+            }
+        )
+        document = {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [["Route"]],
+                        "Metrics": [
+                            {"Name": name, "Unit": "Milliseconds"} for name in metrics
+                        ],
+                    }
+                ],
+            },
+            "Route": route,
+            "StatusCode": status_code,
+            **metrics,
+        }
+        line = json.dumps(document, separators=(",", ":")) + "\n"
+        try:
+            self._send(line)
+            self.counters.increment("emitted")
+        except OSError:
+            self.counters.increment("dropped")
+            self._close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.counters.snapshot(),
+            "destination": self.destination,
+            "namespace": self.namespace,
+        }
+
+    def _send(self, line: str) -> None:
+        if self.destination == EMF_DESTINATION_STDOUT:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+            return
+
+        payload = line.encode("utf-8")
+        with self._lock:
+            if self._socket is None:
+                # Resolved once per connection rather than on every send.
+                family, kind, proto, _, address = socket.getaddrinfo(
+                    self._host,
+                    self._port,
+                    type=(
+                        socket.SOCK_DGRAM
+                        if self._scheme == "udp"
+                        else socket.SOCK_STREAM
+                    ),
+                )[0]
+                connection = socket.socket(family, kind, proto)
+                connection.settimeout(0.2)
+                if self._scheme == "tcp":
+                    connection.connect(address)
+                self._socket, self._address = connection, address
+
+            if self._scheme == "udp":
+                self._socket.sendto(payload, self._address)
+            else:
+                self._socket.sendall(payload)
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._socket is not None:
+                self._socket.close()
+            self._socket = None
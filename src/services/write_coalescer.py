@@ -0,0 +1,111 @@
+import os
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from src.services.metrics import CounterSet
+
+# A mutation edits the loaded document in place and returns the caller's
+# result, or raises to fail only that caller without touching the document.
+Mutation = Callable[[Any], Any]
+# Applies a batch of mutations to one document and returns, per mutation, its
+# result or the exception it raised.
+CommitBatch = Callable[[str, list[Mutation]], list[Any]]
+
+
+@dataclass
+class _Batch:
+    mutations: list[Mutation] = field(default_factory=list)
+    futures: list[Future] = field(default_factory=list)
+    full: threading.Event = field(default_factory=threading.Event)
+
+
+class WriteCoalescer:
+    """Group commit for read-modify-write updates of a shared document.
+
+    The first caller for a key opens a batch and becomes its leader: it waits up
+    to ``window_seconds`` (or until ``max_batch_size`` mutations have joined),
+    closes the batch and commits every mutation with one ``commit_batch`` call.
+    Followers block until the leader hands them their own result or exception.
+    """
+
+    def __init__(
+        self,
+        commit_batch: CommitBatch,
+        window_seconds: float,
+        max_batch_size: int,
+    ) -> None:
+        self.commit_batch = commit_batch
+        self.window_seconds = max(window_seconds, 0.0)
+        self.max_batch_size = max(max_batch_size, 1)
+        self.counters = CounterSet("batches", "mutations")
+        self._batches: dict[str, _Batch] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, commit_batch: CommitBatch) -> "WriteCoalescer":
+        return cls(
+            commit_batch,
+            window_seconds=float(os.getenv("NOTES_S3_WRITE_WINDOW_MS", "10")) / 1000,
+            max_batch_size=int(os.getenv("NOTES_S3_WRITE_MAX_BATCH", "32")),
+        )
+
+    def submit(self, key: str, mutation: Mutation) -> Any:
+        future: Future = Future()
+        with self._lock:
+            batch = self._batches.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._batches[key] = _Batch()
+            batch.mutations.append(mutation)
+            batch.futures.append(future)
+            if len(batch.mutations) >= self.max_batch_size:
+                # Close a full batch right away so later callers start a new one.
+                self._batches.pop(key, None)
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window_seconds)
+            with self._lock:
+                if self._batches.get(key) is batch:
+                    self._batches.pop(key)
+            self._commit(key, batch)
+
+        return future.result()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.counters.snapshot(),
+            "windowMs": self.window_seconds * 1000,
+            "maxBatchSize": self.max_batch_size,
+        }
+
+    def _commit(self, key: str, batch: _Batch) -> None:
+        self.counters.increment("batches")
+        self.counters.increment("mutations", len(batch.mutations))
+        try:
+            outcomes = self.commit_batch(key, batch.mutations)
+        except BaseException as error:
+            for future in batch.futures:
+                future.set_exception(error)
+            raise
+
+        try:
+            if len(outcomes) != len(batch.futures):
+                raise RuntimeError(
+                    f"commit_batch returned {len(outcomes)} outcomes "
+                    f"for {len(batch.futures)} mutations"
+                )
+            for future, outcome in zip(batch.futures, outcomes):
+                if isinstance(outcome, BaseException):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+        finally:
+            # Never leave a follower blocked on a future nobody will resolve.
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(
+                        RuntimeError(f"Write batch for {key} was not committed")
+                    )
@@ -0,0 +1,863 @@
+"""Benchmark every route of ``src/main.py`` offline against synthetic datasets.
+
+    python -m src.tools.benchmark_routes [--backend local|aws] \\
+        [--claims 10000 100000] [--notes 100 10000 1000000] \\
+        [--requests 100] [--concurrency 8] [--output results.json] \\
+        [--baseline previous.json] [--max-regression 0.25]
+
+Each (claims, notes) pair is a separate case run in a fresh child process, so
+peak RSS and warm caches do not leak between cases. A case writes a synthetic
+dataset, drives the FastAPI app in-process through ASGI (no sockets, no HTTP
+client) and reports, per route, throughput and p50/p95/p99 latency, plus the
+peak RSS of the child.
+
+Backends, none of which touch the network:
+
+- ``local`` — ``mocks/claims.json`` and ``mocks/notes.json`` in a temporary
+  directory; ``LOCAL_STORAGE_ENGINE`` and the other service settings are taken
+  from the environment as usual.
+- ``aws`` — claims in DynamoDB and notes in S3 (``--notes-backend s3``, layout
+  from ``NOTES_S3_LAYOUT``) or in the DynamoDB notes table
+  (``--notes-backend dynamodb``), all served in-process by moto
+  (``pip install "moto[dynamodb,s3]"``). Peak RSS includes moto's copy of the
+  data.
+
+Summaries use a stub Bedrock client that answers after
+``--bedrock-latency-ms``; ``--bedrock off`` uses the local fallback summary.
+
+With ``--baseline`` the run fails (exit code 1) when any route's p95 latency or
+a case's peak RSS grew by more than ``--max-regression`` over the baseline run,
+or a route exceeds ``--max-p99-ms``. Routes that return errors always fail.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported.
+    resource = None
+
+CLAIM_STATUSES = ("OPEN", "IN_REVIEW", "CLOSED")
+CLAIMS_TABLE_NAME = "benchmark-claims"
+NOTES_TABLE_NAME = "benchmark-claim-notes"
+NOTES_BUCKET_NAME = "benchmark-claim-notes"
+BATCH_LOOKUP_SIZE = 50
+PAGE_LIMIT = 50
+BULK_IMPORT_SIZE = 100
+SUMMARY_JOB_SIZE = 5
+# Each export reads every claim, so it is measured with fewer requests.
+EXPORT_MAX_REQUESTS = 10
+SEARCH_QUERIES = ("adjuster photos", '"repair estimate"', "customer requested")
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark every API route offline across dataset sizes."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["local", "aws"],
+        default="local",
+        help="local files, or moto stand-ins for DynamoDB and S3 (default: local).",
+    )
+    parser.add_argument(
+        "--notes-backend",
+        choices=["s3", "dynamodb"],
+        default="s3",
+        help="Where notes live with --backend aws (default: s3).",
+    )
+    parser.add_argument(
+        "--claims",
+        type=int,
+        nargs="+",
+        default=[10000],
+        help="Claim counts to benchmark (default: 10000).",
+    )
+    parser.add_argument(
+        "--notes",
+        type=int,
+        nargs="+",
+        default=[100, 10000],
+        help="Note counts to benchmark, spread evenly over the claims "
+        "(default: 100 10000).",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=100,
+        help="Measured requests per route (default: 100).",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=5,
+        help="Unmeasured requests per route before measuring (default: 5).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Requests in flight per route (default: 8).",
+    )
+    parser.add_argument(
+        "--bedrock",
+        choices=["stub", "off"],
+        default="stub",
+        help="Stub Bedrock client, or the local fallback summary (default: stub).",
+    )
+    parser.add_argument(
+        "--bedrock-latency-ms",
+        type=float,
+        default=50.0,
+        help="Latency of each stub Bedrock call (default: 50).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=7,
+        help="Random seed for the request mix (default: 7).",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write the results as JSON to this file."
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="Results of an earlier run to compare against.",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="Allowed growth of p95 latency and peak RSS over the baseline "
+        "(default: 0.25, i.e. 25%%).",
+    )
+    parser.add_argument(
+        "--min-regression-ms",
+        type=float,
+        default=1.0,
+        help="p95 growth below this is treated as noise (default: 1.0).",
+    )
+    parser.add_argument(
+        "--max-p99-ms",
+        type=float,
+        help="Fail when any route's p99 latency exceeds this.",
+    )
+    return parser.parse_args(argv)
+
+
+# Synthetic data ------------------------------------------------------------
+
+
+def _claim_id(index: int) -> str:
+    return f"CLM-{index:07d}"
+
+
+def _iter_claims(claim_count: int) -> Iterator[dict[str, Any]]:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for index in range(claim_count):
+        updated_at = start + timedelta(seconds=index)
+        yield {
+            "id": _claim_id(index),
+            "status": CLAIM_STATUSES[index % len(CLAIM_STATUSES)],
+            "policyNumber": f"POL-{index % 50000:06d}",
+            "customer": f"Customer {index}",
+            "updatedAt": updated_at.isoformat().replace("+00:00", "Z"),
+        }
+
+
+def _notes_for_claim(claim_index: int, claim_count: int, note_count: int) -> int:
+    # Note j belongs to claim j % claim_count.
+    return note_count // claim_count + (
+        1 if claim_index < note_count % claim_count else 0
+    )
+
+
+def _iter_claim_notes(
+    claim_index: int, claim_count: int, note_count: int
+) -> Iterator[dict[str, Any]]:
+    claim_id = _claim_id(claim_index)
+    for number in range(1, _notes_for_claim(claim_index, claim_count, note_count) + 1):
+        yield {
+            "claimId": claim_id,
+            "noteId": f"N-{number:03d}",
+            "content": (
+                f"Note {number} for {claim_id}: adjuster reviewed the repair "
+                "estimate and requested updated photos from the customer."
+            ),
+        }
+
+
+def _iter_notes(claim_count: int, note_count: int) -> Iterator[dict[str, Any]]:
+    for claim_index in range(min(claim_count, note_count)):
+        yield from _iter_claim_notes(claim_index, claim_count, note_count)
+
+
+def _write_json_array(path: Path, items: Iterable[dict[str, Any]]) -> None:
+    # Streamed so that generating a million records does not inflate peak RSS.
+    with path.open("w", encoding="utf-8") as file:
+        file.write("[")
+        for index, item in enumerate(items):
+            file.write((",\n" if index else "\n") + json.dumps(item))
+        file.write("\n]")
+
+
+def _seed_local(data_root: Path, claim_count: int, note_count: int) -> None:
+    mocks_dir = data_root / "mocks"
+    mocks_dir.mkdir(parents=True, exist_ok=True)
+    _write_json_array(mocks_dir / "claims.json", _iter_claims(claim_count))
+    _write_json_array(mocks_dir / "notes.json", _iter_notes(claim_count, note_count))
+
+
+def _seed_aws(
+    data_root: Path, claim_count: int, note_count: int, notes_backend: str
+) -> None:
+    import boto3
+
+    from src.services.notes_service import (
+        NOTES_COUNTER_SORT_KEY,
+        NOTES_S3_LAYOUT_PER_CLAIM,
+        notes_shard_key,
+    )
+
+    # The local files stay empty; every read must be served by the stand-ins.
+    _seed_local(data_root, 0, 0)
+    region = os.environ["AWS_REGION"]
+    dynamodb = boto3.resource("dynamodb", region_name=region)
+    claims_table = dynamodb.create_table(
+        TableName=CLAIMS_TABLE_NAME,
+        BillingMode="PAY_PER_REQUEST",
+        KeySchema=[{"AttributeName": "claim_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "claim_id", "AttributeType": "S"},
+            {"AttributeName": "status", "AttributeType": "S"},
+            {"AttributeName": "updatedAt", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "status-updatedAt-index",
+                "KeySchema": [
+                    {"AttributeName": "status", "KeyType": "HASH"},
+                    {"AttributeName": "updatedAt", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ],
+    )
+    with claims_table.batch_writer() as batch:
+        for claim in _iter_claims(claim_count):
+            item = {key: value for key, value in claim.items() if key != "id"}
+            batch.put_item(Item={"claim_id": claim["id"], **item})
+
+    claims_with_notes = range(min(claim_count, note_count))
+    if notes_backend == "dynamodb":
+        notes_table = dynamodb.create_table(
+            TableName=NOTES_TABLE_NAME,
+            BillingMode="PAY_PER_REQUEST",
+            KeySchema=[
+                {"AttributeName": "claimId", "KeyType": "HASH"},
+                {"AttributeName": "noteId", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "claimId", "AttributeType": "S"},
+                {"AttributeName": "noteId", "AttributeType": "S"},
+            ],
+        )
+        with notes_table.batch_writer() as batch:
+            for claim_index in claims_with_notes:
+                for note in _iter_claim_notes(claim_index, claim_count, note_count):
+                    batch.put_item(Item=note)
+                batch.put_item(
+                    Item={
+                        "claimId": _claim_id(claim_index),
+                        "noteId": NOTES_COUNTER_SORT_KEY,
+                        "lastNoteNumber": _notes_for_claim(
+                            claim_index, claim_count, note_count
+                        ),
+                    }
+                )
+        return
+
+    s3 = boto3.client("s3", region_name=region)
+    s3.create_bucket(Bucket=NOTES_BUCKET_NAME)
+    if os.getenv("NOTES_S3_LAYOUT", "").strip().lower() == NOTES_S3_LAYOUT_PER_CLAIM:
+        prefix = os.getenv("NOTES_S3_PREFIX", "notes/")
+        for claim_index in claims_with_notes:
+            notes = list(_iter_claim_notes(claim_index, claim_count, note_count))
+            s3.put_object(
+                Bucket=NOTES_BUCKET_NAME,
+                Key=notes_shard_key(prefix, _claim_id(claim_index)),
+                Body=json.dumps(notes, separators=(",", ":")).encode("utf-8"),
+            )
+        return
+
+    notes_file = data_root / "notes-object.json"
+    _write_json_array(notes_file, _iter_notes(claim_count, note_count))
+    s3.upload_file(
+        str(notes_file),
+        NOTES_BUCKET_NAME,
+        os.getenv("NOTES_S3_OBJECT_KEY", "notes.json"),
+    )
+    notes_file.unlink()
+
+
+# Bedrock stand-in ----------------------------------------------------------
+
+
+class _StubBedrockStream:
+    def __init__(self, chunks: list[str]) -> None:
+        self._chunks = chunks
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for chunk in self._chunks:
+            yield {"contentBlockDelta": {"delta": {"text": chunk}}}
+
+    def close(self) -> None:
+        pass
+
+
+class _StubBedrockClient:
+    """Answers Converse calls with canned text after a fixed latency."""
+
+    def __init__(self, latency_seconds: float) -> None:
+        self.latency_seconds = latency_seconds
+
+    def _answer(self, messages: list[dict[str, Any]]) -> str:
+        from src.services.claims_service import BEDROCK_FIELD_PROMPTS
+
+        time.sleep(self.latency_seconds)
+        prompt = messages[0]["content"][0]["text"]
+        if "Return ONLY a JSON object" in prompt:
+            return json.dumps(
+                {field: f"Benchmark {field}." for field in BEDROCK_FIELD_PROMPTS}
+            )
+        return "Benchmark summary text for the requested field."
+
+    def converse(self, messages: list[dict[str, Any]], **_: Any) -> dict[str, Any]:
+        text = self._answer(messages)
+        return {"output": {"message": {"content": [{"text": text}]}}}
+
+    def converse_stream(
+        self, messages: list[dict[str, Any]], **_: Any
+    ) -> dict[str, Any]:
+        words = self._answer(messages).split(" ")
+        return {"stream": _StubBedrockStream([word + " " for word in words])}
+
+
+# ASGI driver ---------------------------------------------------------------
+
+
+@dataclass
+class _Request:
+    method: str
+    path: str
+    query: str = ""
+    # A dict is sent as JSON, bytes as NDJSON.
+    body: dict[str, Any] | bytes | None = None
+    headers: tuple[tuple[str, str], ...] = ()
+
+
+class _AsgiClient:
+    """Calls the ASGI app directly, without sockets or an HTTP client library."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def send(self, request: _Request) -> tuple[int, dict[str, str], bytes]:
+        headers = [(b"host", b"benchmark")]
+        if request.body is None:
+            payload = b""
+        elif isinstance(request.body, bytes):
+            payload = request.body
+            headers.append((b"content-type", b"application/x-ndjson"))
+        else:
+            payload = json.dumps(request.body).encode()
+            headers.append((b"content-type", b"application/json"))
+        headers.extend(
+            (name.lower().encode(), value.encode()) for name, value in request.headers
+        )
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": "http",
+            "path": request.path,
+            "raw_path": request.path.encode(),
+            "query_string": request.query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("benchmark", 80),
+        }
+        pending = [{"type": "http.request", "body": payload, "more_body": False}]
+        response: dict[str, Any] = {"status": 0, "headers": {}, "body": []}
+
+        async def receive() -> dict[str, Any]:
+            if pending:
+                return pending.pop()
+            # The client never disconnects; Starlette cancels this wait.
+            await asyncio.Event().wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {
+                    name.decode(): value.decode()
+                    for name, value in message.get("headers", [])
+                }
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return response["status"], response["headers"], b"".join(response["body"])
+
+
+# Routes --------------------------------------------------------------------
+
+
+@dataclass
+class _CaseContext:
+    client: _AsgiClient
+    rng: random.Random
+    claim_count: int
+    note_count: int
+    created_claims: int = 0
+    search_ready: bool = False
+
+    def random_claim(self) -> str:
+        return _claim_id(self.rng.randrange(self.claim_count))
+
+    def random_claim_with_notes(self) -> tuple[str, int]:
+        index = self.rng.randrange(max(min(self.claim_count, self.note_count), 1))
+        return _claim_id(index), _notes_for_claim(
+            index, self.claim_count, self.note_count
+        )
+
+    async def create_note(self, claim_id: str) -> str:
+        _, _, body = await self.client.send(
+            _Request("POST", f"/claims/{claim_id}/notes", body={"content": "Benchmark"})
+        )
+        return json.loads(body)["noteId"]
+
+
+def _new_claim(context: _CaseContext) -> dict[str, Any]:
+    context.created_claims += 1
+    return {
+        "id": f"CLM-NEW-{context.created_claims:07d}",
+        "status": "OPEN",
+        "policyNumber": "POL-BENCH",
+        "customer": "Benchmark Customer",
+    }
+
+
+async def _post_claim(context: _CaseContext) -> _Request:
+    return _Request("POST", "/claims", body=_new_claim(context))
+
+
+async def _post_claims_bulk(context: _CaseContext) -> _Request:
+    body = b"".join(
+        json.dumps(_new_claim(context)).encode() + b"\n"
+        for _ in range(BULK_IMPORT_SIZE)
+    )
+    return _Request("POST", "/claims:bulk", body=body)
+
+
+async def _get_claims_export(_: _CaseContext) -> _Request:
+    return _Request("GET", "/claims:export")
+
+
+async def _get_claims_batch(context: _CaseContext) -> _Request:
+    ids = ",".join(context.random_claim() for _ in range(BATCH_LOOKUP_SIZE))
+    return _Request("GET", "/claims", query=f"ids={ids}&includeNotes=true")
+
+
+async def _get_claims_page(context: _CaseContext) -> _Request:
+    status = context.rng.choice(CLAIM_STATUSES)
+    return _Request("GET", "/claims", query=f"status={status}&limit={PAGE_LIMIT}")
+
+
+async def _get_claim(context: _CaseContext) -> _Request:
+    return _Request("GET", f"/claims/{context.random_claim_with_notes()[0]}")
+
+
+async def _get_claim_not_modified(context: _CaseContext) -> _Request:
+    path = f"/claims/{context.random_claim_with_notes()[0]}"
+    _, headers, _ = await context.client.send(_Request("GET", path))
+    return _Request("GET", path, headers=(("If-None-Match", headers["etag"]),))
+
+
+async def _get_notes(context: _CaseContext) -> _Request:
+    return _Request("GET", f"/claims/{context.random_claim_with_notes()[0]}/notes")
+
+
+async def _post_note(context: _CaseContext) -> _Request:
+    claim_id = context.random_claim_with_notes()[0]
+    return _Request(
+        "POST", f"/claims/{claim_id}/notes", body={"content": "Benchmark note"}
+    )
+
+
+async def _put_note(context: _CaseContext) -> _Request:
+    claim_id, note_count = context.random_claim_with_notes()
+    note_id = (
+        f"N-{context.rng.randint(1, note_count):03d}"
+        if note_count
+        else await context.create_note(claim_id)
+    )
+    return _Request(
+        "PUT", f"/claims/{claim_id}/notes/{note_id}", body={"content": "Edited"}
+    )
+
+
+async def _delete_note(context: _CaseContext) -> _Request:
+    claim_id = context.random_claim_with_notes()[0]
+    note_id = await context.create_note(claim_id)
+    return _Request("DELETE", f"/claims/{claim_id}/notes/{note_id}")
+
+
+async def _search_notes(context: _CaseContext) -> _Request:
+    request = _Request(
+        "GET", "/notes/search", query=f"q={quote(context.rng.choice(SEARCH_QUERIES))}"
+    )
+    # The index is built in the background at startup; wait for it once.
+    while not context.search_ready:
+        status, _, _ = await context.client.send(request)
+        context.search_ready = status != 503
+        if not context.search_ready:
+            await asyncio.sleep(0.05)
+    return request
+
+
+async def _get_metrics(_: _CaseContext) -> _Request:
+    return _Request("GET", "/metrics")
+
+
+async def _summarize(context: _CaseContext) -> _Request:
+    claim_id = context.random_claim_with_notes()[0]
+    return _Request("POST", f"/claims/{claim_id}/summarize", query="force=true")
+
+
+async def _summarize_stream(context: _CaseContext) -> _Request:
+    claim_id = context.random_claim_with_notes()[0]
+    return _Request("POST", f"/claims/{claim_id}/summarize/stream", query="force=true")
+
+
+def _summary_job_body(context: _CaseContext) -> dict[str, Any]:
+    return {"claimIds": [context.random_claim() for _ in range(SUMMARY_JOB_SIZE)]}
+
+
+async def _post_summary_job(context: _CaseContext) -> _Request:
+    return _Request("POST", "/summaries:batch", body=_summary_job_body(context))
+
+
+async def _get_summary_job(context: _CaseContext) -> _Request:
+    _, _, body = await context.client.send(
+        _Request("POST", "/summaries:batch", body=_summary_job_body(context))
+    )
+    return _Request("GET", f"/summaries/jobs/{json.loads(body)['jobId']}")
+
+
+# Name, request factory (its own calls are not measured), expected statuses
+# and, for expensive routes, a cap on the measured requests.
+ROUTES: list[
+    tuple[str, Callable[[_CaseContext], Awaitable[_Request]], set[int], int | None]
+] = [
+    ("POST /claims", _post_claim, {200}, None),
+    ("POST /claims:bulk", _post_claims_bulk, {200}, None),
+    ("GET /claims:export", _get_claims_export, {200}, EXPORT_MAX_REQUESTS),
+    ("GET /claims?ids", _get_claims_batch, {200}, None),
+    ("GET /claims?status", _get_claims_page, {200}, None),
+    ("GET /claims/{id}", _get_claim, {200}, None),
+    ("GET /claims/{id} If-None-Match", _get_claim_not_modified, {304}, None),
+    ("GET /claims/{id}/notes", _get_notes, {200}, None),
+    ("POST /claims/{id}/notes", _post_note, {200}, None),
+    ("PUT /claims/{id}/notes/{noteId}", _put_note, {200}, None),
+    ("DELETE /claims/{id}/notes/{noteId}", _delete_note, {200}, None),
+    ("GET /notes/search", _search_notes, {200}, None),
+    ("GET /metrics", _get_metrics, {200}, None),
+    ("POST /claims/{id}/summarize", _summarize, {200}, None),
+    ("POST /claims/{id}/summarize/stream", _summarize_stream, {200}, None),
+    # Jobs keep running in the background, so they are measured last.
+    ("POST /summaries:batch", _post_summary_job, {202}, None),
+    ("GET /summaries/jobs/{id}", _get_summary_job, {200}, None),
+]
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+async def _measure_route(
+    context: _CaseContext,
+    make_request: Callable[[_CaseContext], Awaitable[_Request]],
+    expected_statuses: set[int],
+    request_count: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    latencies: list[float] = []
+    errors: list[str] = []
+
+    async def one() -> None:
+        async with semaphore:
+            request = await make_request(context)
+            started = time.perf_counter()
+            status, _, body = await context.client.send(request)
+            latencies.append(time.perf_counter() - started)
+            if status not in expected_statuses:
+                errors.append(f"{status} {body[:200].decode(errors='replace')}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(request_count)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        "requests": request_count,
+        "errors": len(errors),
+        "throughputRps": round(request_count / elapsed, 1) if elapsed else 0.0,
+        "p50Ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95Ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99Ms": round(_percentile(latencies, 99) * 1000, 3),
+    }
+    if errors:
+        result["firstError"] = errors[0]
+    return result
+
+
+async def _drive_app(
+    app: Any, case: dict[str, Any], args: dict[str, Any]
+) -> dict[str, Any]:
+    client = _AsgiClient(app)
+    context = _CaseContext(
+        client=client,
+        rng=random.Random(args["seed"]),
+        claim_count=case["claims"],
+        note_count=case["notes"],
+    )
+    routes: dict[str, Any] = {}
+    async with app.router.lifespan_context(app):
+        for name, make_request, expected_statuses, max_requests in ROUTES:
+            await _measure_route(
+                context, make_request, expected_statuses, args["warmup"], 1
+            )
+            routes[name] = await _measure_route(
+                context,
+                make_request,
+                expected_statuses,
+                min(args["requests"], max_requests or args["requests"]),
+                args["concurrency"],
+            )
+    return routes
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _run_case(case: dict[str, Any], args: dict[str, Any]) -> dict[str, Any]:
+    """Run one dataset case; executed in a fresh child process."""
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    if args["bedrock"] == "stub":
+        os.environ["BEDROCK_MODEL_ID"] = "benchmark-stub"
+    else:
+        os.environ.pop("BEDROCK_MODEL_ID", None)
+
+    mock = None
+    if args["backend"] == "aws":
+        from moto import mock_aws
+
+        os.environ.update(
+            AWS_ACCESS_KEY_ID="benchmark",
+            AWS_SECRET_ACCESS_KEY="benchmark",
+            DYNAMODB_TABLE_NAME=CLAIMS_TABLE_NAME,
+        )
+        if args["notes_backend"] == "dynamodb":
+            os.environ["NOTES_DYNAMODB_TABLE_NAME"] = NOTES_TABLE_NAME
+        else:
+            os.environ["NOTES_S3_BUCKET_NAME"] = NOTES_BUCKET_NAME
+        mock = mock_aws()
+        mock.start()
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="claims-benchmark-") as directory:
+            data_root = Path(directory)
+            started = time.perf_counter()
+            if args["backend"] == "aws":
+                _seed_aws(
+                    data_root, case["claims"], case["notes"], args["notes_backend"]
+                )
+            else:
+                _seed_local(data_root, case["claims"], case["notes"])
+            setup_seconds = time.perf_counter() - started
+
+            import src.main as main
+            from src.services.aws_clients import AwsClientRegistry
+            from src.services.claims_service import ClaimsService
+            from src.services.notes_service import NotesService
+
+            bedrock = _StubBedrockClient(args["bedrock_latency_ms"] / 1000)
+
+            class StandInClients(AwsClientRegistry):
+                def client(self, service_name: str, region_name: str) -> Any:
+                    if service_name == "bedrock-runtime":
+                        return bedrock
+                    return super().client(service_name, region_name)
+
+            # The routes look the services up as module globals on every call.
+            clients = StandInClients()
+            main.notes_service = NotesService(data_root, aws_clients=clients)
+            main.claims_service = ClaimsService(
+                data_root, notes_service=main.notes_service, aws_clients=clients
+            )
+            routes = asyncio.run(_drive_app(main.app, case, args))
+    finally:
+        if mock is not None:
+            mock.stop()
+
+    return {
+        **case,
+        "setupSeconds": round(setup_seconds, 2),
+        "peakRssMb": _peak_rss_mb(),
+        "routes": routes,
+    }
+
+
+def _case_key(case: dict[str, Any]) -> tuple[Any, ...]:
+    return (case["backend"], case["notesBackend"], case["claims"], case["notes"])
+
+
+def _budget_violations(
+    results: dict[str, Any],
+    baseline: dict[str, Any] | None,
+    args: argparse.Namespace,
+) -> list[str]:
+    baseline_cases = {
+        _case_key(case): case for case in (baseline or {}).get("cases", [])
+    }
+    violations: list[str] = []
+    for case in results["cases"]:
+        label = f"claims={case['claims']} notes={case['notes']}"
+        previous = baseline_cases.get(_case_key(case))
+        for name, route in case["routes"].items():
+            if route["errors"]:
+                violations.append(
+                    f"{label} {name}: {route['errors']} errors "
+                    f"(first: {route['firstError']})"
+                )
+            if args.max_p99_ms is not None and route["p99Ms"] > args.max_p99_ms:
+                violations.append(
+                    f"{label} {name}: p99 {route['p99Ms']}ms > {args.max_p99_ms}ms"
+                )
+            previous_route = (previous or {}).get("routes", {}).get(name)
+            if previous_route is None:
+                continue
+            allowed = previous_route["p95Ms"] * (1 + args.max_regression)
+            if (
+                route["p95Ms"] > allowed
+                and route["p95Ms"] - previous_route["p95Ms"] >= args.min_regression_ms
+            ):
+                violations.append(
+                    f"{label} {name}: p95 {route['p95Ms']}ms vs baseline "
+                    f"{previous_route['p95Ms']}ms"
+                )
+        if previous and case["peakRssMb"] and previous.get("peakRssMb"):
+            if case["peakRssMb"] > previous["peakRssMb"] * (1 + args.max_regression):
+                violations.append(
+                    f"{label}: peak RSS {case['peakRssMb']}MB vs baseline "
+                    f"{previous['peakRssMb']}MB"
+                )
+    return violations
+
+
+def _print_case(case: dict[str, Any]) -> None:
+    print(
+        f"\nbackend={case['backend']} notesBackend={case['notesBackend']} "
+        f"claims={case['claims']} notes={case['notes']} "
+        f"setup={case['setupSeconds']}s peakRss={case['peakRssMb']}MB"
+    )
+    print(
+        f"{'route':<40} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'errors':>6}"
+    )
+    for name, route in case["routes"].items():
+        print(
+            f"{name:<40} {route['throughputRps']:>9} {route['p50Ms']:>9} "
+            f"{route['p95Ms']:>9} {route['p99Ms']:>9} {route['errors']:>6}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.backend == "aws" and importlib.util.find_spec("moto") is None:
+        print('--backend aws needs moto: pip install "moto[dynamodb,s3]"')
+        return 2
+
+    case_args = {
+        "backend": args.backend,
+        "notes_backend": args.notes_backend,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "bedrock": args.bedrock,
+        "bedrock_latency_ms": args.bedrock_latency_ms,
+        "seed": args.seed,
+    }
+    # A fresh interpreter per case keeps peak RSS and caches per dataset.
+    context = multiprocessing.get_context("spawn")
+    results: dict[str, Any] = {"cases": []}
+    for claim_count in args.claims:
+        for note_count in args.notes:
+            case = {
+                "backend": args.backend,
+                "notesBackend": args.notes_backend if args.backend == "aws" else None,
+                "claims": claim_count,
+                "notes": note_count,
+            }
+            with context.Pool(1) as pool:
+                result = pool.apply(_run_case, (case, case_args))
+            results["cases"].append(result)
+            _print_case(result)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    violations = _budget_violations(results, baseline, args)
+    if violations:
+        print("\nBudget exceeded:")
+        for violation in violations:
+            print(f"- {violation}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Compare response serialization costs for claims with many notes.
+
+    python -m src.tools.benchmark_serialization [--notes 1000 5000] [--repeat 20]
+
+For each notes count a synthetic claim with that many notes is encoded two
+ways and the best time of ``--repeat`` runs is printed:
+
+- ``default`` — what FastAPI does for a route annotated ``-> dict[str, Any]``:
+  validate the value against the return type, serialize it to JSON-compatible
+  Python and encode that with the stdlib ``json`` module (``JSONResponse``).
+- ``fast`` — what the read routes do now: ``src.services.json_codec.dumps``
+  directly (orjson when installed, otherwise the stdlib encoder).
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from src.services.json_codec import JSON_ENGINE, dumps
+
+_RESPONSE_ADAPTER = TypeAdapter(dict[str, Any])
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark claim response serialization."
+    )
+    parser.add_argument(
+        "--notes",
+        type=int,
+        nargs="+",
+        default=[1000, 5000],
+        help="Notes per claim to benchmark (default: 1000 5000).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Runs per measurement; the fastest is reported (default: 20).",
+    )
+    return parser.parse_args(argv)
+
+
+def _build_claim(note_count: int) -> dict[str, Any]:
+    claim_id = "CLM-BENCH"
+    return {
+        "id": claim_id,
+        "status": "IN_REVIEW",
+        "policyNumber": "POL-123456",
+        "customer": "Benchmark Customer",
+        "updatedAt": "2026-01-01T00:00:00Z",
+        "summary": None,
+        "notes": [
+            {
+                "claimId": claim_id,
+                "noteId": f"N-{index:03d}",
+                "content": (
+                    f"Note {index}: adjuster reviewed the repair estimate and "
+                    "requested updated photos from the customer."
+                ),
+            }
+            for index in range(1, note_count + 1)
+        ],
+    }
+
+
+def _default_encode(claim: dict[str, Any]) -> bytes:
+    value = _RESPONSE_ADAPTER.validate_python(claim)
+    content = _RESPONSE_ADAPTER.dump_python(value, mode="json")
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _best_ms(function: Any, claim: dict[str, Any], repeat: int) -> float:
+    return min(timeit.repeat(lambda: function(claim), number=1, repeat=repeat)) * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    print(f"engine={JSON_ENGINE}")
+    for note_count in args.notes:
+        claim = _build_claim(note_count)
+        if json.loads(_default_encode(claim)) != json.loads(dumps(claim)):
+            print(f"notes={note_count} encoders disagree")
+            return 1
+
+        default_ms = _best_ms(_default_encode, claim, args.repeat)
+        fast_ms = _best_ms(dumps, claim, args.repeat)
+        print(
+            f"notes={note_count} bytes={len(dumps(claim))} "
+            f"default_ms={default_ms:.2f} fast_ms={fast_ms:.2f} "
+            f"speedup={default_ms / fast_ms:.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
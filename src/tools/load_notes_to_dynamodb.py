@@ -0,0 +1,177 @@
+"""Load notes into the DynamoDB notes table used by ``NOTES_DYNAMODB_TABLE_NAME``.
+
+Run before pointing the service at the table:
+
+    python -m src.tools.load_notes_to_dynamodb --table <table> --bucket <bucket>
+
+The source defaults to ``s3://<bucket>/<NOTES_S3_OBJECT_KEY>``; pass
+``--source-file mocks/notes.json`` to load a local export instead. Notes are
+written with their existing IDs, so re-running the tool with the same source
+is safe, and each claim's note counter is raised to its highest imported note
+number. ``--create-table`` creates the table first, which is meant for a local
+stand-in such as DynamoDB Local (``AWS_ENDPOINT_URL_DYNAMODB``).
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import boto3
+from botocore.exceptions import ClientError
+
+from src.services.notes_service import NOTES_COUNTER_SORT_KEY
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Load notes.json into the DynamoDB notes table."
+    )
+    parser.add_argument(
+        "--table",
+        default=os.getenv("NOTES_DYNAMODB_TABLE_NAME", ""),
+        help="Notes table (default: NOTES_DYNAMODB_TABLE_NAME).",
+    )
+    parser.add_argument(
+        "--bucket",
+        default=os.getenv("NOTES_S3_BUCKET_NAME", ""),
+        help="Notes bucket to read from (default: NOTES_S3_BUCKET_NAME).",
+    )
+    parser.add_argument(
+        "--source-key",
+        default=os.getenv("NOTES_S3_OBJECT_KEY", "notes.json"),
+        help="Monolithic notes object key (default: NOTES_S3_OBJECT_KEY).",
+    )
+    parser.add_argument(
+        "--source-file",
+        type=Path,
+        help="Read notes from a local JSON file instead of S3.",
+    )
+    parser.add_argument(
+        "--region",
+        default=os.getenv("AWS_REGION", "us-east-1"),
+        help="AWS region (default: AWS_REGION).",
+    )
+    parser.add_argument(
+        "--create-table",
+        action="store_true",
+        help="Create the table (claimId/noteId keys) if it does not exist.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print what would be written without writing it.",
+    )
+    return parser.parse_args(argv)
+
+
+def _load_source_notes(args: argparse.Namespace) -> list[dict[str, Any]]:
+    if args.source_file:
+        with args.source_file.open("r", encoding="utf-8") as file:
+            data = json.load(file)
+    else:
+        client = boto3.client("s3", region_name=args.region)
+        response = client.get_object(Bucket=args.bucket, Key=args.source_key)
+        data = json.loads(response["Body"].read().decode("utf-8"))
+
+    if not isinstance(data, list):
+        raise ValueError("Notes source must contain a JSON array")
+    return data
+
+
+def _create_table(dynamodb: Any, table_name: str) -> None:
+    try:
+        table = dynamodb.create_table(
+            TableName=table_name,
+            BillingMode="PAY_PER_REQUEST",
+            KeySchema=[
+                {"AttributeName": "claimId", "KeyType": "HASH"},
+                {"AttributeName": "noteId", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "claimId", "AttributeType": "S"},
+                {"AttributeName": "noteId", "AttributeType": "S"},
+            ],
+        )
+        table.wait_until_exists()
+    except ClientError as error:
+        if error.response.get("Error", {}).get("Code") != "ResourceInUseException":
+            raise
+
+
+def _note_number(note_id: str) -> int:
+    numeric_part = note_id[2:] if note_id.startswith("N-") else ""
+    return int(numeric_part) if numeric_part.isdigit() else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if not args.table:
+        print("A notes table is required (--table or NOTES_DYNAMODB_TABLE_NAME).")
+        return 2
+    if not args.source_file and not args.bucket:
+        print("A source is required (--source-file, --bucket or NOTES_S3_BUCKET_NAME).")
+        return 2
+
+    notes = _load_source_notes(args)
+
+    notes_by_claim: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    skipped_notes = 0
+    for note in notes:
+        claim_id = str(note.get("claimId", "")).strip()
+        note_id = str(note.get("noteId", "")).strip()
+        if not claim_id or not note_id or note_id == NOTES_COUNTER_SORT_KEY:
+            skipped_notes += 1
+            continue
+        notes_by_claim[claim_id].append(
+            {"claimId": claim_id, "noteId": note_id, "content": note.get("content")}
+        )
+
+    if args.dry_run:
+        for claim_id, claim_notes in sorted(notes_by_claim.items()):
+            print(f"would write {len(claim_notes)} notes for {claim_id}")
+        return 0
+
+    dynamodb = boto3.resource("dynamodb", region_name=args.region)
+    if args.create_table:
+        _create_table(dynamodb, args.table)
+    table = dynamodb.Table(args.table)
+
+    written = 0
+    with table.batch_writer(overwrite_by_pkeys=["claimId", "noteId"]) as batch:
+        for claim_notes in notes_by_claim.values():
+            for note in claim_notes:
+                batch.put_item(Item=note)
+                written += 1
+
+    for claim_id, claim_notes in notes_by_claim.items():
+        highest = max(_note_number(note["noteId"]) for note in claim_notes)
+        try:
+            table.update_item(
+                Key={"claimId": claim_id, "noteId": NOTES_COUNTER_SORT_KEY},
+                UpdateExpression="SET lastNoteNumber = :highest",
+                ConditionExpression=(
+                    "attribute_not_exists(lastNoteNumber) "
+                    "OR lastNoteNumber < :highest"
+                ),
+                ExpressionAttributeValues={":highest": highest},
+            )
+        except ClientError as error:
+            if (
+                error.response.get("Error", {}).get("Code")
+                != "ConditionalCheckFailedException"
+            ):
+                raise
+
+    print(
+        f"claims={len(notes_by_claim)} notes_written={written} "
+        f"notes_skipped={skipped_notes}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
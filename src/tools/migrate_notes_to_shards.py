@@ -0,0 +1,138 @@
+"""Split a monolithic notes JSON document into per-claim S3 shards.
+
+Run before switching the service to ``NOTES_S3_LAYOUT=per-claim``:
+
+    python -m src.tools.migrate_notes_to_shards --bucket <bucket> [--dry-run]
+
+The source defaults to ``s3://<bucket>/<NOTES_S3_OBJECT_KEY>``; pass
+``--source-file mocks/notes.json`` to seed shards from a local export instead.
+Existing shards are left untouched unless ``--overwrite`` is given, so the tool
+is safe to re-run after a partial migration.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import boto3
+from botocore.exceptions import ClientError
+
+from src.services.notes_service import notes_shard_key
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Split notes.json into one S3 object per claim."
+    )
+    parser.add_argument(
+        "--bucket",
+        default=os.getenv("NOTES_S3_BUCKET_NAME", ""),
+        help="Notes bucket (default: NOTES_S3_BUCKET_NAME).",
+    )
+    parser.add_argument(
+        "--source-key",
+        default=os.getenv("NOTES_S3_OBJECT_KEY", "notes.json"),
+        help="Monolithic notes object key (default: NOTES_S3_OBJECT_KEY).",
+    )
+    parser.add_argument(
+        "--source-file",
+        type=Path,
+        help="Read notes from a local JSON file instead of S3.",
+    )
+    parser.add_argument(
+        "--prefix",
+        default=os.getenv("NOTES_S3_PREFIX", "notes/"),
+        help="Key prefix for per-claim shards (default: NOTES_S3_PREFIX).",
+    )
+    parser.add_argument(
+        "--region",
+        default=os.getenv("AWS_REGION", "us-east-1"),
+        help="AWS region (default: AWS_REGION).",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Replace shards that already exist.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the shards that would be written without uploading them.",
+    )
+    return parser.parse_args(argv)
+
+
+def _load_source_notes(client: Any, args: argparse.Namespace) -> list[dict[str, Any]]:
+    if args.source_file:
+        with args.source_file.open("r", encoding="utf-8") as file:
+            data = json.load(file)
+    else:
+        response = client.get_object(Bucket=args.bucket, Key=args.source_key)
+        data = json.loads(response["Body"].read().decode("utf-8"))
+
+    if not isinstance(data, list):
+        raise ValueError("Notes source must contain a JSON array")
+    return data
+
+
+def _shard_exists(client: Any, bucket: str, key: str) -> bool:
+    try:
+        client.head_object(Bucket=bucket, Key=key)
+        return True
+    except ClientError as error:
+        if error.response.get("Error", {}).get("Code") in {"404", "NoSuchKey"}:
+            return False
+        raise
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if not args.bucket:
+        print("A notes bucket is required (--bucket or NOTES_S3_BUCKET_NAME).")
+        return 2
+
+    client = boto3.client("s3", region_name=args.region)
+    notes = _load_source_notes(client, args)
+
+    notes_by_claim: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    skipped_notes = 0
+    for note in notes:
+        claim_id = str(note.get("claimId", "")).strip()
+        if not claim_id:
+            skipped_notes += 1
+            continue
+        notes_by_claim[claim_id].append(note)
+
+    written = 0
+    existing = 0
+    for claim_id, claim_notes in sorted(notes_by_claim.items()):
+        key = notes_shard_key(args.prefix, claim_id)
+        if args.dry_run:
+            print(f"would write s3://{args.bucket}/{key} ({len(claim_notes)} notes)")
+            continue
+
+        if not args.overwrite and _shard_exists(client, args.bucket, key):
+            existing += 1
+            continue
+
+        client.put_object(
+            Bucket=args.bucket,
+            Key=key,
+            Body=json.dumps(claim_notes, separators=(",", ":")).encode("utf-8"),
+            ContentType="application/json",
+        )
+        written += 1
+
+    print(
+        f"claims={len(notes_by_claim)} written={written} "
+        f"already_present={existing} notes_without_claim={skipped_notes}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())